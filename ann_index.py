@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Approximate nearest-neighbour (IVF) index for word vectors, in pure NumPy
+
+Words are clustered once with spherical k-means. A query only scans the
+nprobe clusters whose centroids are closest to it, then re-ranks those
+candidates with exact cosine similarity. Build it offline next to the model:
+
+    python ann_index.py models/word2vec-google-news-300.bin
+
+Raising nprobe (ANN_NPROBE, or ?nprobe= on the endpoints) trades latency
+for recall; nprobe == nlist is an exact search.
+
+The index stores row numbers, so it records the vocabulary size and a
+fingerprint of the model it was built from; after the model or its
+artifact is rebuilt, a stale index is ignored until it is rebuilt too.
+"""
+import argparse
+import os
+import time
+import numpy as np
+from vector_store import model_fingerprint
+
+ANN_NPROBE = int(os.environ.get('ANN_NPROBE', 16))
+BLOCK = 65536
+
+def ann_index_path(model_path):
+    """Path of the IVF index file for a model"""
+    return model_path + '.ivf.npz'
+
+def _normalised(model, start, stop):
+    """Unit-length copy of rows [start, stop) of the model's vectors"""
+    rows = np.asarray(model.vectors[start:stop], dtype=np.float32)
+    return rows / np.maximum(np.linalg.norm(rows, axis=1, keepdims=True), 1e-12)
+
+class IVFIndex:
+    """Inverted-file index: cluster centroids plus word indices grouped by cluster"""
+
+    def __init__(self, centroids, order, offsets, vocabulary_size=None, fingerprint=None):
+        self.centroids = centroids
+        self.order = order
+        self.offsets = offsets
+        self.vocabulary_size = vocabulary_size
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def build(cls, model, nlist=None, sample_size=100000, iterations=10, seed=0):
+        """Cluster the vocabulary with spherical k-means"""
+        n = len(model.vectors)
+        nlist = nlist or max(1, int(4 * np.sqrt(n)))
+        rng = np.random.default_rng(seed)
+
+        # Train centroids on a sample of the vocabulary
+        sample_ids = np.sort(rng.choice(n, size=min(n, max(sample_size, nlist)), replace=False))
+        sample = np.asarray(model.vectors[sample_ids], dtype=np.float32)
+        sample /= np.maximum(np.linalg.norm(sample, axis=1, keepdims=True), 1e-12)
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+
+        for _ in range(iterations):
+            labels = np.concatenate([
+                np.argmax(sample[i:i + BLOCK].dot(centroids.T), axis=1)
+                for i in range(0, len(sample), BLOCK)
+            ])
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=nlist)
+
+            # Re-seed empty clusters from random sample points
+            empty = counts == 0
+            sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()))]
+            centroids = sums / np.maximum(np.linalg.norm(sums, axis=1, keepdims=True), 1e-12)
+
+        # Assign every word to its closest centroid
+        labels = np.concatenate([
+            np.argmax(_normalised(model, i, min(i + BLOCK, n)).dot(centroids.T), axis=1)
+            for i in range(0, n, BLOCK)
+        ])
+        order = np.argsort(labels, kind='stable').astype(np.int32)
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(labels, minlength=nlist))]).astype(np.int64)
+        return cls(centroids.astype(np.float32), order, offsets, n, model_fingerprint(model))
+
+    def save(self, path):
+        np.savez(path, centroids=self.centroids, order=self.order, offsets=self.offsets,
+                 vocabulary_size=self.vocabulary_size, fingerprint=self.fingerprint)
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        # Indexes from before fingerprints have neither, so never match
+        vocabulary_size = int(data['vocabulary_size']) if 'vocabulary_size' in data else None
+        fingerprint = int(data['fingerprint']) if 'fingerprint' in data else None
+        return cls(data['centroids'], data['order'], data['offsets'], vocabulary_size, fingerprint)
+
+    def matches(self, model):
+        """Whether this index was built from model"""
+        return (self.vocabulary_size == len(model.index_to_key)
+                and self.fingerprint == model_fingerprint(model))
+
+    def search(self, model, vector, topn=10, nprobe=ANN_NPROBE, exclude=None):
+        """Indices and cosine similarities of the approximate top-n neighbours of vector"""
+        query = np.asarray(vector, dtype=np.float32)
+        query = query / max(np.linalg.norm(query), 1e-12)
+
+        # Pick the clusters closest to the query
+        nprobe = max(1, min(nprobe, len(self.centroids)))
+        centroid_sims = self.centroids.dot(query)
+        probes = np.argpartition(-centroid_sims, nprobe - 1)[:nprobe]
+        candidates = np.concatenate([self.order[self.offsets[c]:self.offsets[c + 1]] for c in probes])
+        if exclude is not None:
+            candidates = candidates[candidates != exclude]
+        if len(candidates) == 0:
+            return [], []
+
+        # Exact re-rank of the candidates
+        candidates = np.sort(candidates)
+        model.fill_norms()
+        sims = np.asarray(model.vectors[candidates], dtype=np.float32).dot(query) / model.norms[candidates]
+        k = min(topn, len(candidates))
+        best = np.argpartition(-sims, k - 1)[:k]
+        best = best[np.argsort(-sims[best], kind='stable')]
+        return candidates[best], sims[best]
+
+    def most_similar(self, model, word, topn=10, nprobe=ANN_NPROBE):
+        """Drop-in for model.most_similar(word, topn): list of (word, similarity)"""
+        index = model.key_to_index[word]
+        ids, sims = self.search(model, model.vectors[index], topn=topn, nprobe=nprobe, exclude=index)
+        return [(model.index_to_key[i], float(s)) for i, s in zip(ids, sims)]
+
+def load_ann_index(model_path, model):
+    """Load the IVF index built for a model, or None if there isn't one or it is stale"""
+    path = ann_index_path(model_path)
+    if not os.path.exists(path):
+        return None
+
+    index = IVFIndex.load(path)
+    if not index.matches(model):
+        print(f"Ignoring ANN index {path}: built from a different model, rebuild it with ann_index.py")
+        return None
+    print(f"Loaded ANN index with {len(index.centroids)} clusters from {path}")
+    return index
+
+if __name__ == '__main__':
+    from vector_store import load_keyed_vectors, resolve_model_path
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('model_path', nargs='?', default='models/word2vec-google-news-300.bin')
+    parser.add_argument('--nlist', type=int, default=None, help='number of clusters (default: 4 * sqrt(vocab))')
+    parser.add_argument('--iterations', type=int, default=10)
+    args = parser.parse_args()
+
+    model_path = resolve_model_path(args.model_path)
+    print(f"Loading model from {model_path}...")
+    model = load_keyed_vectors(model_path)
+
+    started = time.time()
+    index = IVFIndex.build(model, nlist=args.nlist, iterations=args.iterations)
+    index.save(ann_index_path(model_path))
+    print(f"Built {len(index.centroids)} clusters in {time.time() - started:.0f}s, saved to {ann_index_path(model_path)}")
+
+    # Report recall against exact search on a few common words
+    for nprobe in (4, 16, 64):
+        hits = total = 0
+        elapsed = 0
+        for word in model.index_to_key[100:200]:
+            exact = {w for w, _ in model.most_similar(word, topn=10)}
+            started = time.time()
+            approx = {w for w, _ in index.most_similar(model, word, topn=10, nprobe=nprobe)}
+            elapsed += time.time() - started
+            hits += len(exact & approx)
+            total += len(exact)
+        print(f"nprobe={nprobe:3d}: recall@10 = {hits / total:.2f}, {elapsed * 10:.2f}ms per query")
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 from flask import Flask, render_template, request, jsonify, session
-from sentence_transformers import SentenceTransformer
+from embedding_store import EmbeddingStore
+from vocabulary_coverage import CoverageTracker
 import numpy as np
 import secrets
 import os
@@ -8,15 +9,14 @@ import os
 app = Flask(__name__)
 app.secret_key = secrets.token_hex(16)
 
-# Load model once at startup
-print("Loading language model...")
-model = SentenceTransformer('all-MiniLM-L6-v2')
-print("Model loaded!")
+embeddings = EmbeddingStore()
+
+# How much of the vocabulary each game's guesses have eliminated
+coverage = CoverageTracker(embeddings)
 
 def calculate_similarity(word1, word2):
     """Calculate semantic similarity between two words"""
-    embedding1 = model.encode([word1])[0]
-    embedding2 = model.encode([word2])[0]
+    embedding1, embedding2 = embeddings.get_many([word1, word2])
     
     cosine_sim = np.dot(embedding1, embedding2) / (np.linalg.norm(embedding1) * np.linalg.norm(embedding2))
     score = round(max(0, cosine_sim) * 100)
@@ -27,19 +27,45 @@ def calculate_similarity(word1, word2):
     
     return score
 
-def get_elimination_score(secret_word, guesses):
+# Guesses less similar than this to the secret count as eliminated semantic spaces
+ELIMINATION_THRESHOLD = 30
+
+def update_game_stats(secret_word):
+    """Score any guesses the session hasn't scored yet, keeping the running statistics
+
+    Each guess's similarity is computed once and stored, along with the
+    running total and the eliminated guesses (as indices into guesses, so
+    the cookie doesn't hold every word twice), so a guess costs one encode
+    however long the game has been going. Sessions from before the stats
+    existed, or that stored eliminated words, are caught up on their next
+    request.
+    """
+    guesses = session.get('guesses', [])
+    similarities = session.get('similarities', [])
+    if 'similarity_total' not in session or any(isinstance(i, str) for i in session.get('eliminated', [])):
+        similarities = []
+        session['similarity_total'] = 0
+        session['eliminated'] = []
+    
+    for index in range(len(similarities), len(guesses)):
+        similarity = calculate_similarity(secret_word, guesses[index])
+        similarities.append(similarity)
+        session['similarity_total'] += similarity
+        if similarity < ELIMINATION_THRESHOLD:  # Very unrelated
+            session['eliminated'] = session['eliminated'] + [index]
+    session['similarities'] = similarities
+
+def eliminated_words():
+    """The guesses update_game_stats() counted as eliminated, oldest first"""
+    return [session['guesses'][i] for i in session['eliminated']]
+
+def get_elimination_score():
     """Calculate how well the guesses eliminate the secret word"""
-    if not guesses:
+    if not session.get('similarities'):
         return 0
     
-    # Get average similarity of secret word to all guesses
-    similarities = []
-    for guess in guesses:
-        sim = calculate_similarity(secret_word, guess)
-        similarities.append(sim)
-    
     # The lower the average similarity, the better the elimination
-    avg_similarity = np.mean(similarities)
+    avg_similarity = session['similarity_total'] / len(session['similarities'])
     elimination_score = 100 - avg_similarity
     
     return round(elimination_score)
@@ -57,9 +83,13 @@ def set_word():
         return jsonify({'error': 'Please provide a word'}), 400
     
     session['secret_word'] = secret_word
+    session['game_id'] = secrets.token_urlsafe(8)
     session['guesses'] = []
     session['guess_count'] = 0
     session['eliminated_spaces'] = []
+    session['similarities'] = []
+    session['similarity_total'] = 0
+    session['eliminated'] = []
     
     return jsonify({'success': True})
 
@@ -76,20 +106,24 @@ def guess():
     
     secret_word = session['secret_word']
     
-    # Calculate similarity to secret word
-    similarity = calculate_similarity(secret_word, guess_word)
+    session['guess_count'] = session.get('guess_count', 0) + 1
+    session['guesses'] = session.get('guesses', []) + [guess_word]
+    
+    # Calculate similarity to secret word (the only new one)
+    update_game_stats(secret_word)
+    similarity = session['similarities'][-1]
     
     # In Antisemantle, lower similarity is better!
     distance_score = 100 - similarity
     
-    session['guess_count'] = session.get('guess_count', 0) + 1
-    session['guesses'] = session.get('guesses', []) + [guess_word]
-    
     # Check if found (exact match)
     found = guess_word.lower() == secret_word.lower()
     
     # Calculate elimination progress
-    elimination_score = get_elimination_score(secret_word, session['guesses'])
+    elimination_score = get_elimination_score()
+    
+    # Share of the vocabulary within reach of some guess, when the vocabulary is built
+    game_coverage = coverage.update(session.setdefault('game_id', secrets.token_urlsafe(8)), session['guesses'])
     
     # Get feedback based on distance
     if found:
@@ -111,19 +145,15 @@ def guess():
     else:
         feedback = "💥 Way too similar! Try opposite concepts!"
     
-    # Generate hint about eliminated spaces
-    eliminated_concepts = []
-    for g in session['guesses']:
-        if calculate_similarity(secret_word, g) < 30:  # Very unrelated
-            eliminated_concepts.append(g)
+    # Hint about eliminated spaces
+    eliminated_concepts = eliminated_words()
     
     # Get all guesses with their distances for the graph
     all_guesses_data = []
-    for g in session['guesses']:
-        dist = 100 - calculate_similarity(secret_word, g)
+    for g, sim in zip(session['guesses'], session['similarities']):
         all_guesses_data.append({
             'word': g,
-            'distance': dist
+            'distance': 100 - sim
         })
     
     result = {
@@ -133,6 +163,8 @@ def guess():
         'feedback': feedback,
         'guess_count': session['guess_count'],
         'elimination_score': elimination_score,
+        'coverage': round(game_coverage.fraction * 100, 1) if game_coverage else None,
+        'covered_words': game_coverage.covered if game_coverage else None,
         'found': found,
         'eliminated_concepts': eliminated_concepts[-5:],  # Last 5 good eliminations
         'total_guesses': len(session['guesses']),
@@ -153,14 +185,9 @@ def hint():
     if len(guesses) < 5:
         return jsonify({'hint': 'Make at least 5 guesses first!'})
     
-    secret_word = session['secret_word']
-    
-    # Find semantic categories to avoid
-    categories_to_avoid = []
-    for guess in guesses:
-        sim = calculate_similarity(secret_word, guess)
-        if sim < 30:
-            categories_to_avoid.append(guess)
+    # Semantic categories to avoid (kept up to date by /guess)
+    update_game_stats(session['secret_word'])
+    categories_to_avoid = eliminated_words()
     
     hint_text = f"The word is semantically distant from: {', '.join(categories_to_avoid[-3:])}"
     
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 from flask import Flask, render_template, request, jsonify, session
-from sentence_transformers import SentenceTransformer
+from embedding_store import EmbeddingStore
 import numpy as np
 import secrets
 import os
@@ -8,15 +8,11 @@ import os
 app = Flask(__name__)
 app.secret_key = secrets.token_hex(16)
 
-# Load model once at startup
-print("Loading language model...")
-model = SentenceTransformer('all-MiniLM-L6-v2')
-print("Model loaded!")
+embeddings = EmbeddingStore()
 
 def calculate_similarity(word1, word2):
     """Calculate semantic similarity between two words"""
-    embedding1 = model.encode([word1])[0]
-    embedding2 = model.encode([word2])[0]
+    embedding1, embedding2 = embeddings.get_many([word1, word2])
     
     cosine_sim = np.dot(embedding1, embedding2) / (np.linalg.norm(embedding1) * np.linalg.norm(embedding2))
     score = round(max(0, cosine_sim) * 100)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Load models in background threads and report their readiness
+
+Each backend gets its own loader, so slow models load in parallel at boot
+instead of one after the other inside the first request that needs them.
+Request handlers check .ready and answer "warming up" straight away rather
+than tying up a worker thread until the model arrives.
+"""
+import threading
+import time
+
+class BackgroundLoader:
+    """A value produced by load() on a background thread"""
+
+    def __init__(self, name, load):
+        self.name = name
+        self._load = load
+        self._lock = threading.Lock()
+        self._thread = None
+        self.value = None
+        self.state = 'not started'  # -> 'loading' -> 'ready' or 'failed'
+        self.error = None
+        self.load_seconds = None
+
+    def start(self):
+        """Begin loading if nobody has asked for it yet"""
+        with self._lock:
+            if self._thread is None:
+                self.state = 'loading'
+                self._thread = threading.Thread(target=self._run, name=f'load-{self.name}', daemon=True)
+                self._thread.start()
+        return self
+
+    def _run(self):
+        start = time.time()
+        print(f"Loading {self.name}...")
+        try:
+            self.value = self._load()
+        except Exception as e:
+            self.error = str(e)
+            self.state = 'failed'
+            print(f"Failed to load {self.name}: {e}")
+        else:
+            self.state = 'ready'
+            print(f"{self.name} loaded in {time.time() - start:.1f}s")
+        self.load_seconds = round(time.time() - start, 1)
+
+    @property
+    def ready(self):
+        return self.state == 'ready'
+
+    @property
+    def loading(self):
+        """Whether a request should wait for this backend (starting it if needed)"""
+        self.start()
+        return self.state == 'loading'
+
+    def get(self):
+        """The loaded value, or None if it isn't (or couldn't be) loaded"""
+        return self.value if self.ready else None
+
+    def wait(self, timeout=None):
+        """Block until loading finishes (for scripts and tests)"""
+        self.start()._thread.join(timeout)
+        return self.get()
+
+    def status(self):
+        return {'state': self.state, 'error': self.error, 'load_seconds': self.load_seconds}
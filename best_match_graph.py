@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Incrementally maintained best-match edges for the guess graph
+
+Every guessed word connects to the node it is most similar to. Adding a
+node can only change an existing node's edge if the new node beats its
+current best, so each guess needs one row (new node -> every node) and one
+column (every node -> new node) of similarities, not all n^2 pairs.
+
+best_matches is stored alongside the nodes: best_matches[i] is
+[target index, similarity] for node i, [-1, -1] if it has no match yet, or
+None for the secret word, which never connects to anything.
+
+The same property lets /guess send a client only what changed since the
+graph it already has (see graph_patch).
+"""
+import numpy as np
+
+def add_best_match(best_matches, words, is_secret, row, column):
+    """Update best_matches after appending words[-1] to the graph
+
+    row[j] is the similarity from the new node to node j and column[j] the
+    similarity from node j to the new node, for every existing node j.
+    """
+    new_index = len(words) - 1
+    new_word = words[-1]
+
+    # Nodes never connect to another node with the same word
+    same = np.array([word == new_word for word in words[:-1]], dtype=bool)
+    row = np.where(same, -np.inf, np.asarray(row, dtype=float))
+    column = np.where(same, -np.inf, np.asarray(column, dtype=float))
+
+    # Existing nodes switch to the new node only where it beats their best
+    current = np.array([match[1] if match else np.inf for match in best_matches], dtype=float)
+    for i in np.flatnonzero(column > current):
+        best_matches[i] = [new_index, int(column[i])]
+
+    if is_secret:
+        best_matches.append(None)
+    elif len(row) and row.max() > -1:
+        # argmax picks the earliest node on ties, like a left-to-right scan
+        best = int(np.argmax(row))
+        best_matches.append([best, int(row[best])])
+    else:
+        best_matches.append([-1, -1])
+
+    return best_matches
+
+def extend_best_matches(best_matches, nodes, similarity_rows):
+    """Bring best_matches up to date with nodes, one appended node at a time
+
+    similarity_rows(word, others) returns the (row, column) integer scores
+    between word and each of others. Older sessions without stored matches
+    simply replay every node once.
+    """
+    words = [node['word'] for node in nodes]
+    for k in range(len(best_matches), len(nodes)):
+        if k == 0:
+            row = column = np.zeros(0)
+        else:
+            row, column = similarity_rows(words[k], words[:k])
+        add_best_match(best_matches, words[:k + 1], nodes[k]['isSecret'], row, column)
+    return best_matches
+
+def best_match_connections(nodes, best_matches):
+    """Connections list in node order, as returned to the client"""
+    connections = []
+    for node, match in zip(nodes, best_matches):
+        if match and match[0] >= 0:
+            connections.append({
+                'source': node['word'],
+                'target': nodes[match[0]]['word'],
+                'similarity': match[1]
+            })
+    return connections
+
+def graph_patch(nodes, links, since, key='word'):
+    """The nodes and links missing from a client graph holding the first `since` nodes
+
+    Nodes are only ever appended, and an edge only ever switches to a newer
+    node, so everything that changed after the client's version is a node at
+    index >= since or a link from or to one. Each node has one outgoing
+    link, so the client replaces a node's old link with the patched one.
+    That only holds while the similarities between existing nodes never
+    change, so callers must send a full snapshot whenever they can.
+    Returns (nodes, links), or None if the client needs a full snapshot.
+    """
+    if type(since) is not int or not 0 < since <= len(nodes):
+        return None
+    index = {node[key]: i for i, node in enumerate(nodes)}
+    changed = [link for link in links
+               if index[link['source']] >= since or index[link['target']] >= since]
+    return nodes[since:], changed
@@ -3,7 +3,7 @@ from flask import Flask, render_template, request, jsonify, session
 import numpy as np
 import secrets
 import os
-import gensim.downloader as api
+from vector_store import load_pretrained
 
 app = Flask(__name__)
 app.secret_key = secrets.token_hex(16)
@@ -11,8 +11,8 @@ app.secret_key = secrets.token_hex(16)
 # Load better word embeddings
 print("Loading Word2Vec embeddings (this may take a moment)...")
 # Options: 'word2vec-google-news-300', 'glove-wiki-gigaword-100', 'glove-wiki-gigaword-300'
-model = api.load('glove-wiki-gigaword-100')  # Smaller, faster
-# model = api.load('word2vec-google-news-300')  # Larger, better quality
+model = load_pretrained('glove-wiki-gigaword-100')  # Smaller, faster
+# model = load_pretrained('word2vec-google-news-300')  # Larger, better quality
 print("Model loaded!")
 
 def calculate_similarity(word1, word2):
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Thread-safe LRU cache bounded by a memory budget, with optional expiry
+
+Caches are shared by every game in the process, so one player starting a
+new game no longer throws away everyone else's work; least recently used
+entries are evicted once the budget is reached instead.
+"""
+from collections import OrderedDict
+import sys
+import threading
+import time
+
+def approximate_size(obj):
+    """Rough memory footprint of a cache key or value in bytes"""
+    if hasattr(obj, 'nbytes'):
+        return obj.nbytes + 96
+    if isinstance(obj, tuple):
+        return sys.getsizeof(obj) + sum(approximate_size(item) for item in obj)
+    return sys.getsizeof(obj)
+
+class BoundedCache:
+    """Dict-like LRU cache holding at most max_bytes of keys and values"""
+
+    def __init__(self, max_bytes, ttl=None):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (value, size, stored_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.time() - entry[2] > self.ttl:
+                self._remove(key)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return default
+
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key, value):
+        size = approximate_size(key) + approximate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                return
+
+            self._entries[key] = (value, size, time.time())
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Entry count, memory use and hit rate, for logging"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hit_rate': self.hits / lookups if lookups else 0
+            }
+
+_MISSING = object()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Build a compact serving artifact from a gensim word-vector model
+
+Keeps only the most frequent lowercase single words (the Google News model
+is mostly phrases and capitalised variants nobody guesses), normalises the
+vectors once, and writes:
+
+    models/<name>.compact.vectors.npy   float32/float16 unit vectors, frequency order
+                                        (float16 only halves the file; it loads as float32)
+    models/<name>.compact.vocab.txt     one word per line, row i = vector i
+
+The apps load it through vector_store, which prefers it over the full model.
+
+    python build_model_artifact.py word2vec-google-news-300 --top 200000 --dtype float16
+    python build_model_artifact.py glove-wiki-gigaword-100
+"""
+import argparse
+import os
+import re
+import numpy as np
+from vector_store import MODEL_DIR, artifact_prefix
+
+SINGLE_WORD = re.compile(r'^[a-z]+$')
+
+def load_source_model(source, save_full=False):
+    """Load the raw model from a local file or gensim's downloader"""
+    from gensim.models import KeyedVectors
+
+    if os.path.exists(source):
+        print(f"Loading model from {source}...")
+        return KeyedVectors.load(source, mmap='r')
+
+    local_path = os.path.join(MODEL_DIR, source + '.bin')
+    if os.path.exists(local_path):
+        print(f"Loading model from {local_path}...")
+        return KeyedVectors.load(local_path, mmap='r')
+
+    import gensim.downloader as api
+    print(f"Downloading {source} (this only needs to be done once)...")
+    model = api.load(source)
+
+    if save_full:
+        print(f"Saving full model to {local_path}...")
+        os.makedirs(MODEL_DIR, exist_ok=True)
+        model.save(local_path)
+
+    return model
+
+def build_artifact(model, prefix, top=200000, dtype='float32'):
+    """Write the pruned, pre-normalised vectors and vocabulary index"""
+    # index_to_key is in frequency order, so the first matches are the most common
+    indices = []
+    for i, word in enumerate(model.index_to_key):
+        if SINGLE_WORD.match(word):
+            indices.append(i)
+            if len(indices) == top:
+                break
+
+    words = [model.index_to_key[i] for i in indices]
+    vectors = np.asarray(model.vectors[indices], dtype=np.float32)
+    vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+    os.makedirs(os.path.dirname(prefix) or '.', exist_ok=True)
+    np.save(prefix + '.vectors.npy', vectors.astype(dtype))
+    with open(prefix + '.vocab.txt', 'w', encoding='utf-8') as f:
+        f.write('\n'.join(words))
+
+    size_mb = os.path.getsize(prefix + '.vectors.npy') / 1024 / 1024
+    print(f"Kept {len(words)} of {len(model.index_to_key)} words ({size_mb:.0f}MB of {dtype} vectors)")
+    print(f"Saved {prefix}.vectors.npy and {prefix}.vocab.txt")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('source', nargs='?', default='word2vec-google-news-300',
+                        help='gensim downloader name or path to a saved model')
+    parser.add_argument('--top', type=int, default=200000, help='number of words to keep')
+    parser.add_argument('--dtype', choices=['float32', 'float16'], default='float32')
+    parser.add_argument('--save-full', action='store_true',
+                        help='also save the full downloaded model to models/<name>.bin')
+    args = parser.parse_args()
+
+    model = load_source_model(args.source, save_full=args.save_full)
+    prefix = artifact_prefix(args.source)
+    build_artifact(model, prefix, top=args.top, dtype=args.dtype)
+
+    # Test it
+    from vector_store import load_artifact
+    artifact = load_artifact(prefix)
+    print("\nTesting word similarities:")
+    test_pairs = [
+        ("cat", "dog"),
+        ("king", "queen"),
+        ("food", "eating"),
+        ("umami", "taste"),
+        ("umami", "food"),
+        ("computer", "laptop")
+    ]
+
+    for w1, w2 in test_pairs:
+        try:
+            sim = artifact.similarity(w1, w2)
+            print(f"{w1:10} ↔ {w2:10} : {round(sim * 100)}/100")
+        except KeyError:
+            print(f"{w1:10} ↔ {w2:10} : Not in vocabulary")
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Precompute Sentence-BERT embeddings for a guessable vocabulary
+
+Encodes every word in large batches once and writes
+
+    models/<model>.compact.vectors.npy   unit-length embeddings, row i = word i
+    models/<model>.compact.vocab.txt     one word per line
+
+which embedding_store.EmbeddingStore memory-maps at runtime, so known
+guesses never touch the transformer. The vocabulary defaults to the words
+of the compact word2vec artifact (build it first with
+build_model_artifact.py), or pass any one-word-per-line list:
+
+    python build_sbert_vocab.py
+    python build_sbert_vocab.py --words wordlist.txt --top 150000
+"""
+import argparse
+import os
+import numpy as np
+from sentence_encoder import SBERT_MODEL, SBERT_MODES, load_sentence_model
+from vector_store import artifact_prefix
+
+DEFAULT_WORDS = artifact_prefix('word2vec-google-news-300') + '.vocab.txt'
+
+def read_words(path, top=None):
+    """Unique non-empty words from a one-word-per-line file, in file order"""
+    with open(path, encoding='utf-8') as f:
+        words = list(dict.fromkeys(line.strip() for line in f if line.strip()))
+    return words[:top] if top else words
+
+def build_vocab_embeddings(model, words, prefix, batch_size=512, dtype='float32'):
+    """Encode words in batches and write the normalised matrix plus vocabulary"""
+    embeddings = model.encode(words, batch_size=batch_size, normalize_embeddings=True,
+                              convert_to_numpy=True, show_progress_bar=True)
+
+    os.makedirs(os.path.dirname(prefix) or '.', exist_ok=True)
+    np.save(prefix + '.vectors.npy', np.asarray(embeddings, dtype=dtype))
+    with open(prefix + '.vocab.txt', 'w', encoding='utf-8') as f:
+        f.write('\n'.join(words))
+
+    size_mb = os.path.getsize(prefix + '.vectors.npy') / 1024 / 1024
+    print(f"Saved {len(words)} embeddings ({size_mb:.0f}MB of {dtype}) to {prefix}.vectors.npy and {prefix}.vocab.txt")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--words', default=DEFAULT_WORDS, help='one word per line')
+    parser.add_argument('--top', type=int, default=None, help='only the first N words')
+    parser.add_argument('--model', default=SBERT_MODEL, help='sentence-transformers model name')
+    parser.add_argument('--batch-size', type=int, default=512)
+    parser.add_argument('--dtype', choices=['float32', 'float16'], default='float32')
+    parser.add_argument('--mode', choices=SBERT_MODES, default='float32',
+                        help='encoder precision (precompute at full precision even if serving int8)')
+    args = parser.parse_args()
+
+    words = read_words(args.words, args.top)
+    print(f"Encoding {len(words)} words with {args.model}...")
+    build_vocab_embeddings(load_sentence_model(args.model, mode=args.mode), words, artifact_prefix(args.model),
+                           batch_size=args.batch_size, dtype=args.dtype)
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 from flask import Flask, render_template, request, jsonify, session
-from sentence_transformers import SentenceTransformer
+from embedding_store import EmbeddingStore
+from target_scoring import TargetScorer
 import numpy as np
 import secrets
 import os
@@ -8,15 +9,17 @@ import os
 app = Flask(__name__)
 app.secret_key = secrets.token_hex(16)
 
-# Load model once at startup
-print("Loading language model...")
-model = SentenceTransformer('all-MiniLM-L6-v2')
-print("Model loaded!")
+embeddings = EmbeddingStore()
+
+# Every secret word's embedding stacked, so a guess is scored against all of them at once
+scorer = TargetScorer(embeddings)
+
+# Secret words allowed per side
+MAX_TARGETS = 10
 
 def calculate_similarity(word1, word2):
     """Calculate semantic similarity between two words"""
-    embedding1 = model.encode([word1])[0]
-    embedding2 = model.encode([word2])[0]
+    embedding1, embedding2 = embeddings.get_many([word1, word2])
     
     cosine_sim = np.dot(embedding1, embedding2) / (np.linalg.norm(embedding1) * np.linalg.norm(embedding2))
     score = round(max(0, cosine_sim) * 100)
@@ -27,6 +30,23 @@ def calculate_similarity(word1, word2):
     
     return score
 
+def target_words(data, side):
+    """A side's secret words: a '<side>_words' list or a single '<side>_word'"""
+    words = data.get(f'{side}_words') or [data.get(f'{side}_word', '')]
+    if not isinstance(words, list):
+        return []
+    return list(dict.fromkeys(w.strip() for w in words if isinstance(w, str) and w.strip()))
+
+def closest_remaining(words, scores, found):
+    """Best score among the targets not found before this guess"""
+    remaining = [score for word, score in zip(words, scores) if word not in found]
+    return max(remaining or scores)
+
+def found_feedback(side, words, found):
+    if len(words) == 1:
+        return f"Found the {side} word!"
+    return f"Found {len(found)} of {len(words)} {side} words!"
+
 @app.route('/')
 def index():
     return render_template('combined.html')
@@ -34,22 +54,29 @@ def index():
 @app.route('/set_words', methods=['POST'])
 def set_words():
     data = request.json
-    semantle_word = data.get('semantle_word', '').strip()
-    antisemantle_word = data.get('antisemantle_word', '').strip()
+    semantle_words = target_words(data, 'semantle')
+    antisemantle_words = target_words(data, 'antisemantle')
     
-    if not semantle_word or not antisemantle_word:
+    if not semantle_words or not antisemantle_words:
         return jsonify({'error': 'Please provide both words'}), 400
+    if len(semantle_words) > MAX_TARGETS or len(antisemantle_words) > MAX_TARGETS:
+        return jsonify({'error': f'At most {MAX_TARGETS} words per side'}), 400
     
-    session['semantle_word'] = semantle_word
-    session['antisemantle_word'] = antisemantle_word
+    session['semantle_words'] = semantle_words
+    session['antisemantle_words'] = antisemantle_words
+    session['semantle_found'] = []
+    session['antisemantle_found'] = []
     session['guesses'] = []
     session['guess_count'] = 0
     
+    # Stack the targets now so the first guess doesn't pay for it
+    scorer.matrix(semantle_words + antisemantle_words)
+    
     return jsonify({'success': True})
 
 @app.route('/guess', methods=['POST'])
 def guess():
-    if 'semantle_word' not in session or 'antisemantle_word' not in session:
+    if 'semantle_words' not in session or 'antisemantle_words' not in session:
         return jsonify({'error': 'No words set yet'}), 400
     
     data = request.json
@@ -58,12 +85,18 @@ def guess():
     if not guess_word:
         return jsonify({'error': 'Please provide a guess'}), 400
     
-    semantle_word = session['semantle_word']
-    antisemantle_word = session['antisemantle_word']
+    semantle_words = session['semantle_words']
+    antisemantle_words = session['antisemantle_words']
+    semantle_found = session['semantle_found']
+    antisemantle_found = session['antisemantle_found']
     
-    # Calculate similarities
-    semantle_score = calculate_similarity(semantle_word, guess_word)
-    antisemantle_score = calculate_similarity(antisemantle_word, guess_word)
+    # One encode and one matrix product for every target on both sides
+    scores = scorer.scores(semantle_words + antisemantle_words, guess_word)
+    semantle_scores, antisemantle_scores = scores[:len(semantle_words)], scores[len(semantle_words):]
+    
+    # Scored against the closest target still hidden on each side
+    semantle_score = closest_remaining(semantle_words, semantle_scores, semantle_found)
+    antisemantle_score = closest_remaining(antisemantle_words, antisemantle_scores, antisemantle_found)
     antisemantle_distance = 100 - antisemantle_score
     
     session['guess_count'] = session.get('guess_count', 0) + 1
@@ -74,16 +107,20 @@ def guess():
         'antisemantle_distance': antisemantle_distance
     }]
     
-    # Check wins
-    semantle_won = guess_word.lower() == semantle_word.lower()
-    antisemantle_won = guess_word.lower() == antisemantle_word.lower()
+    # Check finds; a side is won once all of its words are found
+    semantle_hits = [w for w in semantle_words if w.lower() == guess_word.lower() and w not in semantle_found]
+    antisemantle_hits = [w for w in antisemantle_words if w.lower() == guess_word.lower() and w not in antisemantle_found]
+    semantle_found = session['semantle_found'] = semantle_found + semantle_hits
+    antisemantle_found = session['antisemantle_found'] = antisemantle_found + antisemantle_hits
+    semantle_won = len(semantle_found) == len(semantle_words)
+    antisemantle_won = len(antisemantle_found) == len(antisemantle_words)
     
     # Get all guesses data for graphs
     all_guesses = session['guesses']
     
     # Feedback for Semantle
-    if semantle_score == 100:
-        semantle_feedback = "🎉 Found the Semantle word!"
+    if semantle_hits:
+        semantle_feedback = "🎉 " + found_feedback('Semantle', semantle_words, semantle_found)
     elif semantle_score >= 80:
         semantle_feedback = "🔥 Very hot!"
     elif semantle_score >= 60:
@@ -96,8 +133,8 @@ def guess():
         semantle_feedback = "🧊 Freezing"
     
     # Feedback for Antisemantle
-    if antisemantle_won:
-        antisemantle_feedback = "🎯 Found the Antisemantle word!"
+    if antisemantle_hits:
+        antisemantle_feedback = "🎯 " + found_feedback('Antisemantle', antisemantle_words, antisemantle_found)
     elif antisemantle_distance >= 80:
         antisemantle_feedback = "🌟 Excellent distance!"
     elif antisemantle_distance >= 60:
@@ -118,13 +155,17 @@ def guess():
         'guess_count': session['guess_count'],
         'semantle_won': semantle_won,
         'antisemantle_won': antisemantle_won,
+        'semantle_found': len(semantle_found),
+        'semantle_targets': len(semantle_words),
+        'antisemantle_found': len(antisemantle_found),
+        'antisemantle_targets': len(antisemantle_words),
         'all_guesses': all_guesses
     }
     
     if semantle_won:
-        result['semantle_word'] = semantle_word
+        result['semantle_word'] = ', '.join(semantle_words)
     if antisemantle_won:
-        result['antisemantle_word'] = antisemantle_word
+        result['antisemantle_word'] = ', '.join(antisemantle_words)
     
     return jsonify(result)
 
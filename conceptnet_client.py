@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Pooled, concurrent client for ConceptNet's /relatedness API
+
+A graph needs relatedness for every pair of words. Fetching them one after
+another on fresh connections makes graph latency the sum of every call;
+fetch_relatedness() instead resolves all missing pairs at once over a
+bounded pool of keep-alive connections, so it is bounded by the slowest
+call (and never exceeds the overall deadline).
+
+Environment variables:
+    CONCEPTNET_API        base URL (point it at a local stub server for tests)
+    CONCEPTNET_POOL_SIZE  concurrent requests / kept-alive connections
+    CONCEPTNET_TIMEOUT    per-request timeout in seconds
+    CONCEPTNET_DEADLINE   overall deadline for one batch of pairs in seconds
+"""
+from concurrent.futures import ThreadPoolExecutor, wait
+import os
+import time
+import requests
+from requests.adapters import HTTPAdapter
+
+CONCEPTNET_API = os.environ.get('CONCEPTNET_API', 'http://api.conceptnet.io')
+CONCEPTNET_POOL_SIZE = int(os.environ.get('CONCEPTNET_POOL_SIZE', 16))
+CONCEPTNET_TIMEOUT = float(os.environ.get('CONCEPTNET_TIMEOUT', 5))
+CONCEPTNET_DEADLINE = float(os.environ.get('CONCEPTNET_DEADLINE', 8))
+
+def conceptnet_term(word):
+    """Normalise a word the way the apps build /c/en/ term URIs"""
+    return word.lower().strip().replace(' ', '_')
+
+class ConceptNetClient:
+    """Relatedness lookups sharing one keep-alive connection pool"""
+
+    def __init__(self, base_url=CONCEPTNET_API, pool_size=CONCEPTNET_POOL_SIZE,
+                 timeout=CONCEPTNET_TIMEOUT, deadline=CONCEPTNET_DEADLINE):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.deadline = deadline
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.executor = ThreadPoolExecutor(max_workers=pool_size)
+
+    def relatedness(self, word1, word2, timeout=None):
+        """Relatedness in [-1, 1], or None if the request failed"""
+        try:
+            response = self.session.get(
+                f"{self.base_url}/relatedness",
+                params={
+                    "node1": f"/c/en/{conceptnet_term(word1)}",
+                    "node2": f"/c/en/{conceptnet_term(word2)}"
+                },
+                timeout=timeout or self.timeout
+            )
+            if response.status_code == 200:
+                return response.json().get('value', 0)
+        except Exception as e:
+            print(f"Error calling ConceptNet API: {e}")
+        return None
+
+    def fetch_relatedness(self, pairs, deadline=None):
+        """Resolve many (word1, word2) pairs concurrently
+
+        Returns {pair: relatedness or None}; pairs still in flight when the
+        deadline passes are left out.
+        """
+        pairs = list(dict.fromkeys(pairs))
+        if not pairs:
+            return {}
+
+        deadline = self.deadline if deadline is None else deadline
+        stop_at = time.time() + deadline
+
+        def fetch(pair):
+            # Don't start requests that can no longer finish in time
+            remaining = stop_at - time.time()
+            if remaining <= 0:
+                return None
+            return self.relatedness(pair[0], pair[1], timeout=min(self.timeout, remaining))
+
+        futures = {self.executor.submit(fetch, pair): pair for pair in pairs}
+        done, not_done = wait(futures, timeout=deadline)
+        for future in not_done:
+            future.cancel()
+
+        return {futures[future]: future.result() for future in done}
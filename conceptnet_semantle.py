@@ -3,6 +3,7 @@ from flask import Flask, render_template, request, jsonify, session
 import requests
 import secrets
 import os
+from numberbatch import load_numberbatch
 import time
 
 app = Flask(__name__)
@@ -11,6 +12,9 @@ app.secret_key = secrets.token_hex(16)
 # ConceptNet API endpoint
 CONCEPTNET_API = "http://api.conceptnet.io"
 
+# Local ConceptNet embeddings, used instead of the API when converted (see numberbatch.py)
+numberbatch = load_numberbatch()
+
 def calculate_similarity(word1, word2):
     """Calculate semantic similarity between two words using ConceptNet API"""
     
@@ -18,6 +22,10 @@ def calculate_similarity(word1, word2):
     if word1.lower() == word2.lower():
         return 100
     
+    if numberbatch is not None:
+        relatedness = numberbatch.relatedness(word1, word2)
+        return round(max(0, (relatedness + 1) * 50))  # Convert -1,1 to 0,100
+    
     try:
         # Make API request to ConceptNet
         response = requests.get(
@@ -1,26 +1,47 @@
 #!/usr/bin/env python3
 from flask import Flask, render_template, request, jsonify, session
-from gensim.models import KeyedVectors
 import numpy as np
 import secrets
 import os
+from best_match_graph import extend_best_matches, best_match_connections, graph_patch
+from game_store import Game, GameStore
+from vector_store import load_keyed_vectors, resolve_model_path
+from rank_table import get_rank_table
+from neighbour_table import load_neighbour_table
+from ann_index import load_ann_index, ANN_NPROBE
+from bounded_cache import BoundedCache
 
 app = Flask(__name__)
 app.secret_key = secrets.token_hex(16)
 
-# Load Word2Vec model from local file
+# Load Word2Vec model from local file (memory-mapped, shared between workers)
 print("Loading Word2Vec model from local file...")
-model_path = "models/word2vec-google-news-300.bin"
-model = KeyedVectors.load(model_path)
+model_path = resolve_model_path("models/word2vec-google-news-300.bin")
+model = load_keyed_vectors(model_path)
 print(f"Model loaded! Vocabulary size: {len(model.key_to_index)} words")
 
-# Cache for closest word scores
-closest_word_cache = {}
+# Precomputed closest-word similarities (build with neighbour_table.py)
+_, closest_scores = load_neighbour_table(model_path, model)
+
+# Approximate nearest-neighbour index (build with ann_index.py)
+ann_index = load_ann_index(model_path, model)
+
+# Game state, keyed by the game id in the session cookie
+games = GameStore(f"dynamic_scaled:{model_path}:{len(model.key_to_index)}")
+
+# Cache for closest word scores, shared by every game (they don't depend on the secret)
+closest_word_cache = BoundedCache(int(os.environ.get('CLOSEST_WORD_CACHE_MB', 16)) * 1024 * 1024)
 
 def get_closest_word_score(word):
     """Get the similarity score of the closest word to the given word"""
-    if word in closest_word_cache:
-        return closest_word_cache[word]
+    if closest_scores is not None:
+        index = model.key_to_index.get(word)
+        if index is not None and index < len(closest_scores):
+            return float(closest_scores[index])
+    
+    closest_score = closest_word_cache.get(word)
+    if closest_score is not None:
+        return closest_score
     
     try:
         # Get the most similar word (excluding itself)
@@ -35,6 +56,12 @@ def get_closest_word_score(word):
     closest_word_cache[word] = closest_score
     return closest_score
 
+def most_similar(word, topn=10, nprobe=ANN_NPROBE):
+    """Top-n most similar words, through the ANN index when one has been built"""
+    if ann_index is not None:
+        return ann_index.most_similar(model, word, topn=topn, nprobe=nprobe)
+    return model.most_similar(word, topn=topn)
+
 def calculate_similarity(word1, word2):
     """Calculate scaled semantic similarity between two words"""
     # Exact match gets 100
@@ -48,26 +75,46 @@ def calculate_similarity(word1, word2):
         # Get the highest possible similarity for word1 (its closest neighbor)
         max_similarity = get_closest_word_score(word1)
         
-        # Scale the similarity relative to the maximum
-        # If raw_similarity = max_similarity, score = 99
-        # If raw_similarity = 0, score = 0
-        # We use 99 as max (not 100) to reserve 100 for exact matches
-        
-        if max_similarity > 0:
-            # Scale from 0 to 99 based on ratio to maximum
-            scaled_score = (raw_similarity / max_similarity) * 99
-            # Ensure minimum score for any match is at least 1
-            scaled_score = max(1, scaled_score)
-        else:
-            # Fallback to direct scaling
-            scaled_score = max(0, raw_similarity) * 99
-        
-        return round(scaled_score)
+        return scale_similarity(raw_similarity, max_similarity)
         
     except KeyError:
         # If word not in vocabulary, return low similarity
         return 5
 
+def scale_similarity(raw_similarity, max_similarity):
+    """Scale a raw similarity relative to the closest neighbor's similarity"""
+    return int(scale_similarities(raw_similarity, max_similarity))
+
+def scale_similarities(raw_similarities, max_similarities):
+    """Vectorised scale_similarity over arrays of raw and maximum similarities"""
+    raw = np.asarray(raw_similarities, dtype=float)
+    maximum = np.asarray(max_similarities, dtype=float)
+    
+    # If raw_similarity = max_similarity, score = 99
+    # If raw_similarity = 0, score = 0
+    # We use 99 as max (not 100) to reserve 100 for exact matches
+    
+    # Scale from 0 to 99 based on ratio to maximum,
+    # ensuring the minimum score for any match is at least 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scaled = np.maximum(1, (raw / maximum) * 99)
+    
+    # Fallback to direct scaling
+    scaled = np.where(maximum > 0, scaled, np.maximum(0, raw) * 99)
+    
+    return np.round(scaled).astype(int)
+
+def score_guess(secret_word, guess_word):
+    """Score a guess against the secret word's precomputed rank table"""
+    table = get_rank_table(model, secret_word)
+    
+    if secret_word.lower() == guess_word.lower():
+        score = 100
+    else:
+        score = scale_similarity(table.similarity(guess_word), table.closest_similarity)
+    
+    return score, table.rank(guess_word)
+
 def find_most_similar_node(new_word, existing_nodes):
     """Find which existing node is most similar to the new word"""
     max_similarity = -1
@@ -81,35 +128,25 @@ def find_most_similar_node(new_word, existing_nodes):
     
     return most_similar, max_similarity
 
-def rebuild_connections(nodes):
-    """Rebuild all connections so each node connects to its most similar neighbor"""
-    connections = []
+def similarity_rows(word, others):
+    """Scaled scores from word to each of others, and from each of others to word"""
+    raw_similarities = model.cosine_similarities(model[word], model[others])
     
-    for node in nodes:
-        if node['isSecret']:
-            continue  # Secret word doesn't connect to others
-        
-        # Find most similar node
-        max_sim = -1
-        best_target = None
-        
-        for other in nodes:
-            if other['word'] == node['word']:
-                continue
-            
-            sim = calculate_similarity(node['word'], other['word'])
-            if sim > max_sim:
-                max_sim = sim
-                best_target = other['word']
-        
-        if best_target:
-            connections.append({
-                'source': node['word'],
-                'target': best_target,
-                'similarity': max_sim
-            })
-    
-    return connections
+    # Scaling is relative to the first word's closest neighbor, so it isn't symmetric
+    row = scale_similarities(raw_similarities, get_closest_word_score(word))
+    column = scale_similarities(raw_similarities, [get_closest_word_score(other) for other in others])
+    
+    # Exact match gets 100
+    exact = np.array([other.lower() == word.lower() for other in others])
+    row[exact] = 100
+    column[exact] = 100
+    
+    return row, column
+
+def update_connections(nodes, best_matches):
+    """Connect the newest node(s), only touching edges they improve, and return all connections"""
+    extend_best_matches(best_matches, nodes, similarity_rows)
+    return best_match_connections(nodes, best_matches)
 
 @app.route('/')
 def index():
@@ -135,18 +172,22 @@ def set_word():
         else:
             secret_word = secret_word.lower()
     
-    # Clear cache for new game
-    closest_word_cache.clear()
+    # Build (or reuse) the full-vocabulary rank table for this secret;
+    # it also gives us the secret's closest-word score for free
+    table = get_rank_table(model, secret_word)
+    closest_word_cache[secret_word] = table.closest_similarity
     
-    session['secret_word'] = secret_word
-    session['nodes'] = [{'word': secret_word, 'isSecret': True, 'score': 100}]
-    session['guess_count'] = 0
+    # Only the game id goes in the cookie; the graph lives in the game store
+    games.delete(session.get('game_id'))
+    session.clear()
+    session['game_id'] = games.new_game_id()
+    games.put(session['game_id'], Game(secret_word, model.key_to_index))
     
     return jsonify({'success': True})
 
 @app.route('/guess', methods=['POST'])
 def guess():
-    if 'secret_word' not in session:
+    if 'game_id' not in session:
         return jsonify({'error': 'No word set yet'}), 400
     
     data = request.json
@@ -167,24 +208,35 @@ def guess():
         else:
             return jsonify({'error': f'"{original_guess}" not in vocabulary. Try a different word.'}), 400
     
-    secret_word = session['secret_word']
-    score = calculate_similarity(secret_word, guess_word)
-    
-    session['guess_count'] = session.get('guess_count', 0) + 1
+    game_id = session['game_id']
     
-    # Add new node
-    new_node = {
-        'word': guess_word,
-        'isSecret': False,
-        'score': score  # Similarity to secret word
-    }
+    def apply_guess(game):
+        secret_word = game.secret_word(model.index_to_key)
+        score, rank = score_guess(secret_word, guess_word)
+        
+        game.guess_count += 1
+        
+        # Add new node (score is the similarity to the secret word)
+        game.add_node(guess_word, score, model.key_to_index, rank)
+        nodes = game.nodes(model.index_to_key)
+        
+        # Connect the new node, only updating edges it improves
+        best_matches = game.best_matches()
+        connections = update_connections(nodes, best_matches)
+        game.set_best_matches(best_matches)
+        return game, secret_word, score, rank, nodes, connections
     
-    nodes = session.get('nodes', [])
-    nodes.append(new_node)
-    session['nodes'] = nodes
+    # Runs again if another worker saves the game first (see game_store.py)
+    applied = games.update(game_id, apply_guess)
+    if applied is None:
+        return jsonify({'error': 'No word set yet'}), 400
+    game, secret_word, score, rank, nodes, connections = applied
     
-    # Rebuild all connections
-    connections = rebuild_connections(nodes)
+    # Only send what's missing from the graph the client already has
+    graph_version = len(nodes)
+    patch = graph_patch(nodes, connections, data.get('version') if data.get('graph') == game_id else None)
+    if patch is not None:
+        nodes, connections = patch
     
     # Check if found
     found = guess_word.lower() == secret_word.lower()
@@ -214,9 +266,14 @@ def guess():
     result = {
         'guess': guess_word,
         'score': score,
+        'rank': rank,
+        'vocab_size': len(model.key_to_index),
         'feedback': feedback,
-        'guess_count': session['guess_count'],
+        'guess_count': game.guess_count,
         'found': found,
+        'graph': game_id,
+        'version': graph_version,
+        'delta': patch is not None,
         'nodes': nodes,
         'connections': connections
     }
@@ -235,7 +292,8 @@ def test_scaling():
         return jsonify({'error': 'Word not found'}), 404
     
     # Get top 10 similar words
-    similar = model.most_similar(word, topn=10)
+    nprobe = request.args.get('nprobe', ANN_NPROBE, type=int)
+    similar = most_similar(word, topn=10, nprobe=nprobe)
     
     # Calculate both raw and scaled scores
     results = []
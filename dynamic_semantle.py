@@ -1,12 +1,24 @@
 #!/usr/bin/env python3
-from flask import Flask, render_template, request, jsonify, session
+from flask import Flask, Response, g, render_template, request, jsonify, session, stream_with_context
 from flask_cors import CORS
+from concurrent.futures import ThreadPoolExecutor, wait
 import numpy as np
-from sentence_transformers import SentenceTransformer
-import requests
-import gensim.downloader as api
+from embedding_store import EmbeddingStore
+from vector_store import load_pretrained
+from bounded_cache import BoundedCache
+from conceptnet_client import ConceptNetClient
+from relatedness_store import RelatednessStore, fetch_relatedness
+from single_flight import SingleFlight
+from background_loader import BackgroundLoader
+from best_match_graph import graph_patch
+from speculation import Speculator
+from numberbatch import load_numberbatch
+import json
 import random
 import os
+import secrets
+import threading
+import time
 from datetime import datetime
 
 app = Flask(__name__)
@@ -15,70 +27,167 @@ app.secret_key = os.environ.get('SECRET_KEY', 'semantle-dynamic-graph-' + str(ra
 # Enable CORS for frontend development
 CORS(app, supports_credentials=True, origins='*', allow_headers='*')
 
-# Initialize models
-print("Loading Sentence-BERT model...")
-sentence_model = SentenceTransformer('all-MiniLM-L6-v2')
-print("Sentence-BERT loaded!")
-
-word2vec_model = None
-glove_model = None
-
-# Cache for embeddings and similarities
-embedding_cache = {}
-similarity_cache = {}
-
-def load_models():
-    """Load Word2Vec and GloVe models on demand"""
-    global word2vec_model, glove_model
-    
-    if word2vec_model is None:
-        try:
-            print("Loading Word2Vec model...")
-            word2vec_model = api.load('word2vec-google-news-300')
-            print("Word2Vec loaded!")
-        except:
-            print("Failed to load Word2Vec model")
-    
-    if glove_model is None:
-        try:
-            print("Loading GloVe model...")
-            glove_model = api.load('glove-wiki-gigaword-100')
-            print("GloVe loaded!")
-        except:
-            print("Failed to load GloVe model")
+def load_sentence_embeddings():
+    """Precomputed Sentence-BERT vocabulary; the model itself only loads for unknown words"""
+    store = EmbeddingStore()
+    if store.vectors is None:
+        # Nothing precomputed, so load the transformer now rather than on the first guess
+        store.encoder
+    return store
+
+# Initialize models: each backend loads in its own background thread, in parallel
+backends = {
+    'sentence-bert': BackgroundLoader('Sentence-BERT', load_sentence_embeddings),
+    'word2vec': BackgroundLoader('Word2Vec', lambda: load_pretrained('word2vec-google-news-300')),
+    'glove': BackgroundLoader('GloVe', lambda: load_pretrained('glove-wiki-gigaword-100')),
+    # Local ConceptNet embeddings, used instead of the API when converted (see numberbatch.py)
+    'conceptnet': BackgroundLoader('ConceptNet Numberbatch', load_numberbatch)
+}
+
+# Backends to start loading at boot; the rest load on first use
+PRELOAD_MODELS = [name.strip() for name in os.environ.get('PRELOAD_MODELS', ','.join(backends)).split(',')]
+for name in PRELOAD_MODELS:
+    if name in backends:
+        backends[name].start()
+
+# Pooled keep-alive connections to the ConceptNet API, used without Numberbatch
+conceptnet = ConceptNetClient()
+
+# Relatedness already paid for by any worker (see relatedness_store.py)
+relatedness_store = RelatednessStore()
+
+# Caches for embeddings and similarities, shared by every game in this process
+CACHE_TTL = float(os.environ.get('CACHE_TTL', 24 * 60 * 60))
+embedding_cache = BoundedCache(int(os.environ.get('EMBEDDING_CACHE_MB', 64)) * 1024 * 1024, ttl=CACHE_TTL)
+similarity_cache = BoundedCache(int(os.environ.get('SIMILARITY_CACHE_MB', 32)) * 1024 * 1024, ttl=CACHE_TTL)
+
+# Concurrent cache misses for the same key share one computation
+in_flight = SingleFlight()
+
+# Each game's similarity matrix per model, so switching back and forth is a cache hit
+game_matrices = BoundedCache(int(os.environ.get('GAME_MEMO_MB', 64)) * 1024 * 1024, ttl=CACHE_TTL)
+
+# Fills game_matrices for the models a player isn't using, on spare CPU only
+speculator = Speculator()
+
+@app.before_request
+def begin_foreground():
+    speculator.begin_foreground()
+    g.foreground = True
+
+@app.teardown_request
+def end_foreground(exception):
+    # Teardown runs even if an earlier before_request hook failed before ours
+    if g.pop('foreground', False):
+        speculator.end_foreground()
+
+# Scoring each guess under every backend at once (/guess with "all_models": true).
+# Whatever isn't back by the deadline is reported as pending for /model_scores
+FANOUT_MODELS = [name.strip() for name in os.environ.get('FANOUT_MODELS', ','.join(backends)).split(',') if name.strip()]
+unknown_models = [name for name in FANOUT_MODELS if name not in backends]
+if unknown_models:
+    # They would otherwise be reported as warming up forever
+    print(f"Ignoring unknown FANOUT_MODELS {unknown_models}; choose from {list(backends)}")
+    FANOUT_MODELS = [name for name in FANOUT_MODELS if name in backends]
+FANOUT_DEADLINE = float(os.environ.get('FANOUT_DEADLINE', 0.5))
+fanout_pool = ThreadPoolExecutor(max_workers=int(os.environ.get('FANOUT_THREADS', 8)), thread_name_prefix='fanout')
+model_scores = BoundedCache(4 * 1024 * 1024, ttl=10 * 60)  # (game id, guess) -> {model: Future}
+model_scores_lock = threading.Lock()  # a guess and its polls may start the same futures at once
+
+# Nodes whose ConceptNet pairs are fetched per streamed batch of graph links
+STREAM_BATCH_SIZE = int(os.environ.get('STREAM_BATCH_SIZE', 8))
+
+# Cancellation event of the latest similarity stream per game, removed when
+# that stream closes. Per worker: a newer stream only stops older ones
+# served by the same process (the client closes its old EventSource anyway)
+live_streams = {}
+live_streams_lock = threading.Lock()
+
+def backend(model):
+    """Loaded backend for a model, starting its loader if needed (None until ready)"""
+    return backends[model].start().get()
+
+def warming_up(model):
+    """Whether requests for model should wait for its backend to finish loading"""
+    # ConceptNet never waits: the API covers for Numberbatch while it loads
+    if model not in backends or model == 'conceptnet':
+        return False
+    return backends[model].loading
+
+def unavailable(model):
+    """Whether model's backend failed to load and has nothing to fall back on
+
+    Word2Vec and GloVe score 0 without their vectors and ConceptNet uses the
+    API, but Sentence-BERT requests would only crash.
+    """
+    return model == 'sentence-bert' and backends[model].state == 'failed'
+
+def warming_up_response(model):
+    """Fast 503 for a backend that is still loading (or failed to), instead of blocking a worker"""
+    if unavailable(model):
+        return jsonify({
+            'error': f'{backends[model].name} failed to load: {backends[model].error}',
+            'warming_up': False,
+            'model': model
+        }), 503
+    
+    response = jsonify({
+        'error': f'{backends[model].name} is still warming up, try again in a few seconds',
+        'warming_up': True,
+        'model': model
+    })
+    response.headers['Retry-After'] = '5'
+    return response, 503
 
 def get_conceptnet_similarity(word1, word2):
-    """Get similarity from ConceptNet API"""
-    try:
-        url = f"http://api.conceptnet.io/relatedness?node1=/c/en/{word1}&node2=/c/en/{word2}"
-        response = requests.get(url, timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            # Convert from [-1, 1] to [0, 100]
-            return (data.get('value', 0) + 1) * 50
-    except:
-        pass
-    return 0
+    """Get similarity from ConceptNet (local Numberbatch if available, else the API)
+
+    Returns None if the API lookup failed, now or recently.
+    """
+    numberbatch = backend('conceptnet')
+    if numberbatch is not None:
+        # Convert from [-1, 1] to [0, 100]
+        return (numberbatch.relatedness(word1, word2) + 1) * 50
+    
+    pair = tuple(sorted((word1, word2)))
+    relatedness = in_flight.do(('relatedness',) + pair, fetch_relatedness,
+                               relatedness_store, conceptnet, [pair])[pair]
+    if relatedness is None:
+        return None
+    # Convert from [-1, 1] to [0, 100]
+    return (relatedness + 1) * 50
+
+def encode_words(words):
+    """Encode words with Sentence-BERT in one batch, skipping any cached meanwhile"""
+    embeddings = {word: embedding_cache.get(word) for word in words}
+    missing = [word for word, embedding in embeddings.items() if embedding is None]
+    if missing:
+        for word, embedding in zip(missing, backend('sentence-bert').get_many(missing)):
+            embeddings[word] = embedding_cache[word] = embedding
+    return embeddings
+
+def get_embeddings(words):
+    """Sentence-BERT embeddings from cache, sharing in-flight encodes of the same words"""
+    embeddings = {word: embedding_cache.get(word) for word in words}
+    missing = tuple(word for word, embedding in embeddings.items() if embedding is None)
+    if missing:
+        embeddings.update(in_flight.do(('encode',) + missing, encode_words, missing))
+    return embeddings
 
 def get_sentence_bert_similarity(word1, word2):
     """Get similarity using Sentence-BERT"""
     # Get embeddings from cache or compute
-    if word1 not in embedding_cache:
-        embedding_cache[word1] = sentence_model.encode([word1])[0]
-    if word2 not in embedding_cache:
-        embedding_cache[word2] = sentence_model.encode([word2])[0]
+    embeddings = get_embeddings([word1, word2])
+    emb1 = embeddings[word1]
+    emb2 = embeddings[word2]
     
     # Calculate cosine similarity
-    emb1 = embedding_cache[word1]
-    emb2 = embedding_cache[word2]
     similarity = np.dot(emb1, emb2) / (np.linalg.norm(emb1) * np.linalg.norm(emb2))
     return similarity * 100
 
 def get_word2vec_similarity(word1, word2):
     """Get similarity using Word2Vec"""
-    if word2vec_model is None:
-        load_models()
-    
+    word2vec_model = backend('word2vec')
     try:
         if word2vec_model and word1 in word2vec_model and word2 in word2vec_model:
             similarity = word2vec_model.similarity(word1, word2)
@@ -90,9 +199,7 @@ def get_word2vec_similarity(word1, word2):
 
 def get_glove_similarity(word1, word2):
     """Get similarity using GloVe"""
-    if glove_model is None:
-        load_models()
-    
+    glove_model = backend('glove')
     try:
         if glove_model and word1 in glove_model and word2 in glove_model:
             similarity = glove_model.similarity(word1, word2)
@@ -104,18 +211,29 @@ def get_glove_similarity(word1, word2):
 
 def calculate_similarity(word1, word2, model='sentence-bert'):
     """Calculate similarity between two words using specified model"""
-    # Check cache first
-    cache_key = f"{model}:{word1}:{word2}"
-    cache_key_reverse = f"{model}:{word2}:{word1}"
+    # Check cache first (every backend is symmetric, so key on the unordered pair)
+    cache_key = (model,) + tuple(sorted((word1, word2)))
     
-    if cache_key in similarity_cache:
-        return similarity_cache[cache_key]
-    if cache_key_reverse in similarity_cache:
-        return similarity_cache[cache_key_reverse]
+    similarity = similarity_cache.get(cache_key)
+    if similarity is not None:
+        return similarity
+    
+    # Concurrent requests for the same pair wait on one computation
+    return in_flight.do(cache_key, compute_similarity, word1, word2, model, cache_key)
+
+def compute_similarity(word1, word2, model, cache_key):
+    """Slow path of calculate_similarity, run once per pair among concurrent requests"""
+    # A computation for this pair may have finished since the caller checked
+    similarity = similarity_cache.get(cache_key)
+    if similarity is not None:
+        return similarity
     
     # Calculate based on model
     if model == 'conceptnet':
         similarity = get_conceptnet_similarity(word1, word2)
+        if similarity is None:
+            # Not cached, so the pair is retried once the store's failure entry expires
+            return 0
     elif model == 'sentence-bert':
         similarity = get_sentence_bert_similarity(word1, word2)
     elif model == 'word2vec':
@@ -129,56 +247,251 @@ def calculate_similarity(word1, word2, model='sentence-bert'):
     similarity_cache[cache_key] = similarity
     return similarity
 
-def calculate_all_similarities(words, target_word, model='sentence-bert'):
-    """Calculate similarities between all words and create graph data"""
-    nodes = []
-    links = []
+def sentence_bert_similarity_matrix(words):
+    """Pairwise Sentence-BERT similarities from one batched encode and one matmul"""
+    embeddings = get_embeddings(words)
+    embeddings = np.array([embeddings[word] for word in words])
+    embeddings = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings.dot(embeddings.T) * 100
+
+def keyed_vectors_similarity_matrix(vectors_model, words):
+    """Pairwise similarities converted from [-1, 1] to [0, 100]; unknown words score 0"""
+    matrix = np.zeros((len(words), len(words)))
+    if vectors_model is None:
+        return matrix
+    
+    known = [i for i, word in enumerate(words) if word in vectors_model]
+    if known:
+        vectors = vectors_model[[words[i] for i in known]]
+        vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        matrix[np.ix_(known, known)] = (vectors.dot(vectors.T) + 1) * 50
+    return matrix
+
+def word2vec_similarity_matrix(words):
+    """Pairwise Word2Vec similarities from one lookup and one matmul"""
+    return keyed_vectors_similarity_matrix(backend('word2vec'), words)
+
+def glove_similarity_matrix(words):
+    """Pairwise GloVe similarities from one lookup and one matmul"""
+    return keyed_vectors_similarity_matrix(backend('glove'), words)
+
+def conceptnet_similarity_matrix(words):
+    """Pairwise ConceptNet relatedness (one matmul locally, else concurrent cached API calls)"""
+    numberbatch = backend('conceptnet')
+    if numberbatch is not None:
+        return (numberbatch.relatedness_matrix(words) + 1) * 50
     
+    return conceptnet_similarity_rows(words, list(range(len(words))))
+
+def conceptnet_similarity_rows(words, rows):
+    """Rows of the ConceptNet API matrix, fetching only the pairs those rows need"""
+    # Fetch every uncached pair at once rather than one round trip at a time
+    pairs = {}
+    for i in rows:
+        for j in range(len(words)):
+            key = ('conceptnet',) + tuple(sorted((words[i], words[j])))
+            if i != j and similarity_cache.get(key) is None:
+                pairs[key[1:]] = key
+    
+    relatedness = fetch_relatedness(relatedness_store, conceptnet, list(pairs))
+    for pair, key in pairs.items():
+        if relatedness[pair] is not None:
+            similarity_cache[key] = (relatedness[pair] + 1) * 50
+    
+    matrix = np.zeros((len(rows), len(words)))
+    for k, i in enumerate(rows):
+        for j in range(len(words)):
+            if i != j:
+                matrix[k, j] = calculate_similarity(words[i], words[j], 'conceptnet')
+    return matrix
+
+SIMILARITY_MATRICES = {
+    'sentence-bert': sentence_bert_similarity_matrix,
+    'word2vec': word2vec_similarity_matrix,
+    'glove': glove_similarity_matrix,
+    'conceptnet': conceptnet_similarity_matrix
+}
+
+def similarity_matrix(words, model='sentence-bert'):
+    """Full word-by-word similarity matrix for the given model"""
+    if model not in SIMILARITY_MATRICES:
+        return np.zeros((len(words), len(words)))
+    return SIMILARITY_MATRICES[model](words)
+
+def graph_nodes(words, target_scores):
+    """Target node then guess nodes, given each word's similarity to the target"""
     # Add target node
-    nodes.append({
-        'id': target_word,
+    nodes = [{
+        'id': words[0],
         'label': '?',
         'score': 100,
         'isTarget': True,
         'group': 'target'
+    }]
+    
+    # Add guess nodes with their similarities to target
+    for i, word in enumerate(words[1:], start=1):
+        nodes.append({
+            'id': word,
+            'label': word,
+            'score': float(target_scores[i]),
+            'isTarget': False,
+            'group': 'guess'
+        })
+    return nodes
+
+def best_match_links(nodes, rows, similarities):
+    """Links from each node in rows to its best match, given those rows of the similarity matrix"""
+    links = []
+    for i, row in zip(rows, similarities):
+        # Row-wise argmax, never itself
+        row = np.array(row, dtype=float)
+        row[i] = -np.inf
+        best = int(np.argmax(row))
+        if row[best] > -1:
+            links.append({
+                'source': nodes[i]['id'],
+                'target': nodes[best]['id'],
+                'value': float(row[best]),
+                'type': 'best-match'
+            })
+    return links
+
+def game_words(guesses, target_word):
+    """Target word, then every guess except the target itself"""
+    return [target_word] + [word for word in guesses if word != target_word]
+
+def game_similarity_matrix(game_id, words, model):
+    """similarity_matrix memoised per game and model until the words change"""
+    # ConceptNet API failures score 0 and should be retried, so that matrix
+    # isn't kept; its pairs are cached individually anyway
+    if model == 'conceptnet' and backend('conceptnet') is None:
+        return similarity_matrix(words, model)
+    
+    key = (game_id, model)
+    memo = game_matrices.get(key)
+    if memo is not None and memo[0] == tuple(words):
+        return memo[1]
+    
+    matrix = similarity_matrix(words, model)
+    game_matrices[key] = (tuple(words), matrix)
+    return matrix
+
+def speculate(game_id, words, current_model):
+    """Precompute the game under every other model, so switching to one is instant"""
+    for model in SIMILARITY_MATRICES:
+        # Only models already loaded, except ConceptNet, which falls back to the API
+        if model != current_model and (model == 'conceptnet' or backends[model].ready):
+            speculator.submit((game_id, model), game_similarity_matrix, game_id, words, model)
+
+def calculate_all_similarities(words, target_word, model='sentence-bert', game_id=None):
+    """Calculate similarities between all words and create graph data"""
+    words = game_words(words, target_word)
+    matrix = game_similarity_matrix(game_id, words, model) if game_id else similarity_matrix(words, model)
+    
+    # Each non-target node links to its best match
+    nodes = graph_nodes(words, matrix[:, 0])
+    rows = list(range(1, len(words)))
+    return {'nodes': nodes, 'links': best_match_links(nodes, rows, matrix[rows])}
+
+def server_sent_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def stream_similarities(guesses, target_word, model, game_id, cancelled):
+    """Server-Sent Events for a model switch: guess scores first, then graph links batch by batch
+
+    Local models compute the whole matrix at once, so their links arrive in
+    one batch; the ConceptNet API fetches a few nodes' pairs per batch.
+    """
+    words = game_words(guesses, target_word)
+    graph = graph_id(model)
+    
+    if model == 'conceptnet' and backend('conceptnet') is None:
+        rows = lambda batch: conceptnet_similarity_rows(words, batch)
+        batches = [list(range(start, min(start + STREAM_BATCH_SIZE, len(words))))
+                   for start in range(1, len(words), STREAM_BATCH_SIZE)]
+    else:
+        matrix = game_similarity_matrix(game_id, words, model)
+        rows = lambda batch: matrix[batch]
+        batches = [list(range(1, len(words)))] if len(words) > 1 else []
+    
+    if cancelled():
+        return
+    nodes = graph_nodes(words, rows([0])[0])
+    scores = {node['id']: node['score'] for node in nodes[1:]}
+    yield server_sent_event('scores', {
+        'model': model,
+        'nodes': nodes,
+        'guess_scores': [{'word': guess, 'score': scores.get(guess, 100), 'correct': guess == target_word}
+                         for guess in guesses]
     })
     
-    # Add guess nodes and calculate their similarities to target
-    for word in words:
-        if word != target_word:
-            score = calculate_similarity(word, target_word, model)
-            nodes.append({
-                'id': word,
-                'label': word,
-                'score': score,
-                'isTarget': False,
-                'group': 'guess'
-            })
+    for batch in batches:
+        if cancelled():
+            return
+        yield server_sent_event('links', {'links': best_match_links(nodes, batch, rows(batch))})
     
-    # For each non-target node, find its best connection
-    for i, node in enumerate(nodes):
-        if not node['isTarget']:
-            best_target = None
-            best_similarity = -1
-            
-            # Check similarity with all other nodes
-            for j, other_node in enumerate(nodes):
-                if i != j:  # Don't connect to self
-                    similarity = calculate_similarity(node['id'], other_node['id'], model)
-                    if similarity > best_similarity:
-                        best_similarity = similarity
-                        best_target = other_node['id']
-            
-            # Create link to best match
-            if best_target:
-                links.append({
-                    'source': node['id'],
-                    'target': best_target,
-                    'value': best_similarity,
-                    'type': 'best-match'
-                })
-    
-    return {'nodes': nodes, 'links': links}
+    yield server_sent_event('done', {'model': model, 'graph': graph, 'version': len(nodes)})
+
+def start_model_scores(game_id, guess_word, target_word):
+    """Score a guess under every fan-out backend in parallel, remembering the futures for polls
+
+    Backends still loading can't answer in time and are reported as warming
+    up; calling this again (as polls do) starts the ones that have loaded since.
+    """
+    key = (game_id, guess_word)
+    with model_scores_lock:
+        futures = dict(model_scores.get(key) or {})
+        for model in FANOUT_MODELS:
+            if model not in futures and not warming_up(model):
+                futures[model] = fanout_pool.submit(calculate_similarity, guess_word, target_word, model)
+        model_scores[key] = futures
+    return futures
+
+def collect_model_scores(futures, deadline):
+    """Each fan-out model's score, or 'pending' if it isn't back by the deadline"""
+    wait(list(futures.values()), timeout=max(0, deadline - time.monotonic()))
+    
+    scores = {}
+    for model in FANOUT_MODELS:
+        future = futures.get(model)
+        if future is None:
+            scores[model] = 'warming_up'
+        elif not future.done():
+            scores[model] = 'pending'
+        elif future.exception() is not None:
+            scores[model] = 'failed'
+        else:
+            scores[model] = float(future.result())
+    return scores
+
+def graph_id(model):
+    """The graph a client holds: one game under one model and similarity source
+
+    ConceptNet switches from the API to Numberbatch when it finishes
+    loading, which changes every edge, so the source is part of the id.
+    """
+    source = model
+    if model == 'conceptnet':
+        source += ':numberbatch' if backend('conceptnet') is not None else ':api'
+    return f"{session.get('game_id', '')}:{source}"
+
+def graph_response(graph_data, graph, client=None):
+    """Graph fields for a response, only patching the graph the client says it has
+
+    graph is graph_id() from before graph_data was computed. Switching
+    models or sources changes every edge, so the client gets a full
+    snapshot then. So does the ConceptNet API: failed pairs score an
+    uncached 0 and are refetched later, so an old node's best match can
+    move to another old node, which graph_patch can't express.
+    """
+    version = len(graph_data['nodes'])
+    patch = None
+    if client and client.get('graph') == graph and not graph.endswith(':conceptnet:api'):
+        patch = graph_patch(graph_data['nodes'], graph_data['links'], client.get('version'), key='id')
+    if patch is not None:
+        graph_data = {'nodes': patch[0], 'links': patch[1]}
+    return {'graph_data': graph_data, 'graph': graph, 'version': version, 'delta': patch is not None}
 
 @app.route('/')
 def index():
@@ -198,22 +511,21 @@ def set_word():
     
     if word:
         # Reset game state
+        session['game_id'] = secrets.token_urlsafe(8)
         session['target_word'] = word
         session['guesses'] = []
         session['guess_count'] = 0
         session['current_model'] = data.get('model', 'sentence-bert')
         
-        # Clear caches for new game
-        global similarity_cache, embedding_cache
-        similarity_cache = {}
-        embedding_cache = {}
-        
         return jsonify({'success': True, 'message': f'Secret word set to "{word}"'})
     
     return jsonify({'success': False, 'error': 'Invalid word'}), 400
 
 @app.route('/guess', methods=['POST'])
 def guess():
+    # Fan-out scores share one budget for the whole request
+    deadline = time.monotonic() + FANOUT_DEADLINE
+    
     if not session.get('target_word'):
         return jsonify({'error': 'No target word set'}), 400
     
@@ -228,6 +540,9 @@ def guess():
     if guess_word in session['guesses']:
         return jsonify({'error': 'Already guessed'}), 400
     
+    if warming_up(model) or unavailable(model):
+        return warming_up_response(model)
+    
     # Update model if changed
     session['current_model'] = model
     
@@ -235,29 +550,39 @@ def guess():
     session['guesses'].append(guess_word)
     session['guess_count'] += 1
     
-    # Check if correct
-    if guess_word == session['target_word']:
-        return jsonify({
-            'correct': True,
-            'word': guess_word,
-            'score': 100,
-            'guess_count': session['guess_count'],
-            'graph_data': calculate_all_similarities(session['guesses'], session['target_word'], model)
-        })
-    
-    # Calculate similarity
-    score = calculate_similarity(guess_word, session['target_word'], model)
+    # Other models' opinions are computed alongside this one's
+    game_id = session.get('game_id')
+    fanout = data.get('all_models') and start_model_scores(game_id or '', guess_word, session['target_word'])
     
     # Get updated graph data
-    graph_data = calculate_all_similarities(session['guesses'], session['target_word'], model)
+    graph = graph_id(model)
+    graph_data = calculate_all_similarities(session['guesses'], session['target_word'], model, game_id)
     
-    return jsonify({
-        'correct': False,
+    # Have the other models ready in case the player switches
+    if game_id:
+        speculate(game_id, game_words(session['guesses'], session['target_word']), model)
+    
+    # Check if correct
+    correct = guess_word == session['target_word']
+    if correct:
+        score = 100
+    else:
+        # Calculate similarity
+        score = calculate_similarity(guess_word, session['target_word'], model)
+    
+    result = {
+        'correct': correct,
         'word': guess_word,
         'score': score,
         'guess_count': session['guess_count'],
-        'graph_data': graph_data
-    })
+        **graph_response(graph_data, graph, data)
+    }
+    
+    if fanout:
+        result['model_scores'] = collect_model_scores(fanout, deadline)
+        result['pending'] = 'pending' in result['model_scores'].values()
+    
+    return jsonify(result)
 
 @app.route('/calculate_similarities', methods=['POST'])
 def calculate_similarities():
@@ -268,28 +593,93 @@ def calculate_similarities():
     data = request.json
     model = data.get('model', 'sentence-bert')
     
+    if warming_up(model) or unavailable(model):
+        return warming_up_response(model)
+    
     # Update current model
     session['current_model'] = model
     
-    # Recalculate all similarities
-    graph_data = calculate_all_similarities(session['guesses'], session['target_word'], model)
+    # Recalculate all similarities (usually already done by speculate())
+    graph = graph_id(model)
+    graph_data = calculate_all_similarities(session['guesses'], session['target_word'], model, session.get('game_id'))
     
-    # Also return updated scores for guess history
+    # Also return updated scores for guess history, straight from the graph
+    scores = {node['id']: node['score'] for node in graph_data['nodes'][1:]}
     guess_scores = []
     for guess in session['guesses']:
-        score = calculate_similarity(guess, session['target_word'], model)
         guess_scores.append({
             'word': guess,
-            'score': score,
+            'score': scores.get(guess, 100),
             'correct': guess == session['target_word']
         })
     
     return jsonify({
-        'graph_data': graph_data,
+        **graph_response(graph_data, graph),
         'guess_scores': guess_scores,
         'model': model
     })
 
+@app.route('/calculate_similarities_stream', methods=['GET'])
+def calculate_similarities_stream():
+    """Recalculate with a new model as Server-Sent Events, so the client can draw as results arrive"""
+    if not session.get('target_word'):
+        return jsonify({'error': 'No game in progress'}), 400
+    
+    model = request.args.get('model', 'sentence-bert')
+    
+    if warming_up(model) or unavailable(model):
+        return warming_up_response(model)
+    
+    # Update current model
+    session['current_model'] = model
+    
+    # Switching again supersedes this stream, even on another connection to this worker
+    game_id = session.get('game_id', '')
+    cancelled = threading.Event()
+    with live_streams_lock:
+        previous = live_streams.get(game_id)
+        if previous is not None:
+            previous.set()
+        live_streams[game_id] = cancelled
+    
+    def end_stream():
+        with live_streams_lock:
+            if live_streams.get(game_id) is cancelled:
+                del live_streams[game_id]
+    
+    events = stream_similarities(list(session['guesses']), session['target_word'], model, game_id, cancelled.is_set)
+    response = Response(stream_with_context(events), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    response.call_on_close(end_stream)
+    return response
+
+@app.route('/model_scores', methods=['GET'])
+def poll_model_scores():
+    """Fan-out scores for an earlier /guess, to fill in the models that were still pending"""
+    if not session.get('target_word'):
+        return jsonify({'error': 'No game in progress'}), 400
+    
+    word = request.args.get('word', '').lower().strip()
+    game_id = session.get('game_id', '')
+    if model_scores.get((game_id, word)) is None:
+        return jsonify({'error': f'No scores for "{word}"'}), 404
+    futures = start_model_scores(game_id, word, session['target_word'])
+    
+    # Optionally wait a little (long poll) rather than have the client poll in a tight loop
+    wait_seconds = min(max(request.args.get('wait', 0, type=float), 0), 5)
+    scores = collect_model_scores(futures, time.monotonic() + wait_seconds)
+    
+    return jsonify({'word': word, 'model_scores': scores, 'pending': 'pending' in scores.values()})
+
+@app.route('/health', methods=['GET'])
+def health():
+    """Readiness of each similarity backend (ready once Sentence-BERT, the default, can answer)"""
+    statuses = {name: loader.status() for name, loader in backends.items()}
+    statuses['conceptnet']['source'] = 'numberbatch' if backends['conceptnet'].get() is not None else 'api'
+    ready = backends['sentence-bert'].ready
+    
+    return jsonify({'ready': ready, 'backends': statuses, 'speculation': speculator.stats()}), 200 if ready else 503
+
 @app.route('/hint', methods=['GET'])
 def hint():
     if not session.get('target_word'):
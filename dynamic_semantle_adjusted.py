@@ -1,18 +1,23 @@
 #!/usr/bin/env python3
 from flask import Flask, render_template, request, jsonify, session
-import gensim.downloader as api
+from vector_store import load_pretrained
 import numpy as np
 import secrets
 import os
+from best_match_graph import extend_best_matches, best_match_connections, graph_patch
+from game_store import Game, GameStore
 
 app = Flask(__name__)
 app.secret_key = secrets.token_hex(16)
 
 # Load Word2Vec model
 print("Loading Word2Vec model...")
-model = api.load('glove-wiki-gigaword-100')
+model = load_pretrained('glove-wiki-gigaword-100')
 print(f"Model loaded! Vocabulary size: {len(model.key_to_index)} words")
 
+# Game state, keyed by the game id in the session cookie
+games = GameStore(f"dynamic_semantle_adjusted:glove-wiki-gigaword-100:{len(model.key_to_index)}")
+
 # Manual adjustments for known issues
 SIMILARITY_ADJUSTMENTS = {
     # Food-related adjustments for umami
@@ -80,35 +85,37 @@ def find_most_similar_node(new_word, existing_nodes):
     
     return most_similar, max_similarity
 
-def rebuild_connections(nodes):
-    """Rebuild all connections so each node connects to its most similar neighbor"""
-    connections = []
+def similarity_rows(word, others):
+    """Adjusted scores between word and each of others, with one vectorised product"""
+    w = word.lower()
+    others_lower = [other.lower() for other in others]
+    scores = np.full(len(others), 10)
     
-    for node in nodes:
-        if node['isSecret']:
-            continue  # Secret word doesn't connect to others
-        
-        # Find most similar node
-        max_sim = -1
-        best_target = None
-        
-        for other in nodes:
-            if other['word'] == node['word']:
-                continue
-            
-            sim = calculate_similarity(node['word'], other['word'])
-            if sim > max_sim:
-                max_sim = sim
-                best_target = other['word']
-        
-        if best_target:
-            connections.append({
-                'source': node['word'],
-                'target': best_target,
-                'similarity': max_sim
-            })
-    
-    return connections
+    # Model similarity for every pair where both words are in vocabulary
+    known = [i for i, o in enumerate(others_lower) if o in model.key_to_index]
+    if w in model.key_to_index and known:
+        similarities = model.cosine_similarities(model[w], model[[others_lower[i] for i in known]])
+        # Boost food-related similarities slightly
+        food = np.array([('food' in w or 'food' in others_lower[i]) for i in known]) & (similarities > 0)
+        similarities = np.where(food, np.minimum(1.0, similarities * 1.5), similarities)
+        scores[known] = np.round(np.maximum(0, similarities) * 100)
+    
+    # Exact matches and manual adjustments take precedence
+    for i, o in enumerate(others_lower):
+        if o == w:
+            scores[i] = 100
+        elif (w, o) in SIMILARITY_ADJUSTMENTS:
+            scores[i] = SIMILARITY_ADJUSTMENTS[(w, o)]
+        elif (o, w) in SIMILARITY_ADJUSTMENTS:
+            scores[i] = SIMILARITY_ADJUSTMENTS[(o, w)]
+    
+    # Similarity is symmetric, so the row and column are the same
+    return scores, scores
+
+def update_connections(nodes, best_matches):
+    """Connect the newest node(s), only touching edges they improve, and return all connections"""
+    extend_best_matches(best_matches, nodes, similarity_rows)
+    return best_match_connections(nodes, best_matches)
 
 @app.route('/')
 def index():
@@ -130,15 +137,17 @@ def set_word():
         if not has_adjustment:
             return jsonify({'error': f'"{secret_word}" not in vocabulary. Try a more common word.'}), 400
     
-    session['secret_word'] = secret_word
-    session['nodes'] = [{'word': secret_word, 'isSecret': True, 'score': 100}]
-    session['guess_count'] = 0
+    # Only the game id goes in the cookie; the graph lives in the game store
+    games.delete(session.get('game_id'))
+    session.clear()
+    session['game_id'] = games.new_game_id()
+    games.put(session['game_id'], Game(secret_word, model.key_to_index))
     
     return jsonify({'success': True})
 
 @app.route('/guess', methods=['POST'])
 def guess():
-    if 'secret_word' not in session:
+    if 'game_id' not in session:
         return jsonify({'error': 'No word set yet'}), 400
     
     data = request.json
@@ -155,24 +164,35 @@ def guess():
         if not has_adjustment:
             return jsonify({'error': f'"{guess_word}" not in vocabulary. Try a more common word.'}), 400
     
-    secret_word = session['secret_word']
-    score = calculate_similarity(secret_word, guess_word)
-    
-    session['guess_count'] = session.get('guess_count', 0) + 1
+    game_id = session['game_id']
     
-    # Add new node
-    new_node = {
-        'word': guess_word,
-        'isSecret': False,
-        'score': score  # Similarity to secret word
-    }
+    def apply_guess(game):
+        secret_word = game.secret_word(model.index_to_key)
+        score = calculate_similarity(secret_word, guess_word)
+        
+        game.guess_count += 1
+        
+        # Add new node (score is the similarity to the secret word)
+        game.add_node(guess_word, score, model.key_to_index)
+        nodes = game.nodes(model.index_to_key)
+        
+        # Connect the new node, only updating edges it improves
+        best_matches = game.best_matches()
+        connections = update_connections(nodes, best_matches)
+        game.set_best_matches(best_matches)
+        return game, secret_word, score, nodes, connections
     
-    nodes = session.get('nodes', [])
-    nodes.append(new_node)
-    session['nodes'] = nodes
+    # Runs again if another worker saves the game first (see game_store.py)
+    applied = games.update(game_id, apply_guess)
+    if applied is None:
+        return jsonify({'error': 'No word set yet'}), 400
+    game, secret_word, score, nodes, connections = applied
     
-    # Rebuild all connections
-    connections = rebuild_connections(nodes)
+    # Only send what's missing from the graph the client already has
+    graph_version = len(nodes)
+    patch = graph_patch(nodes, connections, data.get('version') if data.get('graph') == game_id else None)
+    if patch is not None:
+        nodes, connections = patch
     
     # Check if found
     found = guess_word.lower() == secret_word.lower()
@@ -199,8 +219,11 @@ def guess():
         'guess': guess_word,
         'score': score,
         'feedback': feedback,
-        'guess_count': session['guess_count'],
+        'guess_count': game.guess_count,
         'found': found,
+        'graph': game_id,
+        'version': graph_version,
+        'delta': patch is not None,
         'nodes': nodes,
         'connections': connections
     }
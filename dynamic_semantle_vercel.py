@@ -1,50 +1,98 @@
 from flask import Flask, render_template, request, jsonify, session
-import requests
 import random
 import os
+import zlib
+from itertools import combinations
+from bounded_cache import BoundedCache
+from conceptnet_client import ConceptNetClient
+from relatedness_store import RelatednessStore, fetch_relatedness
+from single_flight import SingleFlight
 
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'semantle-dynamic-graph-' + str(random.randint(1000, 9999)))
 
-# Cache for similarities
-similarity_cache = {}
+# Cache for similarities, shared by every game in this instance
+similarity_cache = BoundedCache(int(os.environ.get('SIMILARITY_CACHE_MB', 16)) * 1024 * 1024,
+                                ttl=float(os.environ.get('CACHE_TTL', 24 * 60 * 60)))
+
+# Pooled keep-alive connections to the ConceptNet API
+conceptnet = ConceptNetClient()
+
+# Relatedness already paid for by any worker (see relatedness_store.py)
+relatedness_store = RelatednessStore()
+
+# Concurrent cache misses for the same pair share one lookup
+in_flight = SingleFlight()
 
 def get_conceptnet_similarity(word1, word2):
-    """Get similarity from ConceptNet API"""
-    try:
-        url = f"http://api.conceptnet.io/relatedness?node1=/c/en/{word1}&node2=/c/en/{word2}"
-        response = requests.get(url, timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            # Convert from [-1, 1] to [0, 100]
-            return (data.get('value', 0) + 1) * 50
-    except:
-        pass
-    return random.randint(10, 30)  # Fallback random similarity
+    """Get similarity from the ConceptNet API
+
+    Always the API here: local Numberbatch vectors (numberbatch.py) are
+    hundreds of MB and .vercelignore keeps models/ out of the deployment.
+    Returns None if the API lookup failed, now or recently.
+    """
+    pair = tuple(sorted((word1, word2)))
+    relatedness = in_flight.do(('relatedness',) + pair, fetch_relatedness,
+                               relatedness_store, conceptnet, [pair])[pair]
+    if relatedness is None:
+        return None
+    return (relatedness + 1) * 50
+
+def fallback_similarity(pair):
+    """Stand-in score (10-30) for a pair the API couldn't answer
+
+    Derived from the pair rather than drawn at random, so every score and
+    link for the pair agrees, within a response and across guesses.
+    """
+    return 10 + zlib.crc32('\0'.join(pair).encode()) % 21
 
 def calculate_similarity(word1, word2):
     """Calculate similarity between two words"""
-    # Check cache first
-    cache_key = f"{word1}:{word2}"
-    cache_key_reverse = f"{word2}:{word1}"
+    # Check cache first (relatedness is symmetric, so key on the unordered pair)
+    cache_key = tuple(sorted((word1, word2)))
     
-    if cache_key in similarity_cache:
-        return similarity_cache[cache_key]
-    if cache_key_reverse in similarity_cache:
-        return similarity_cache[cache_key_reverse]
+    similarity = similarity_cache.get(cache_key)
+    if similarity is not None:
+        return similarity
     
-    # Calculate similarity
+    # Calculate similarity (concurrent requests for the same pair share one lookup)
     similarity = get_conceptnet_similarity(word1, word2)
+    if similarity is None:
+        # Not cached, so the pair is retried once the store's failure entry expires
+        return fallback_similarity(cache_key)
     
     # Cache the result
     similarity_cache[cache_key] = similarity
     return similarity
 
+def prefetch_similarities(words):
+    """Fetch every uncached pair among words concurrently, filling the cache
+
+    The graph below needs all pairs; without this each API miss would be a
+    serial round trip. Pairs that fail or miss the deadline are left to the
+    fallback score.
+    """
+    missing = sorted(pair for pair in {tuple(sorted(pair)) for pair in combinations(set(words), 2)}
+                     if pair not in similarity_cache)
+    if not missing:
+        return
+
+    # Identical batches (the same new guess against the same words) share one fetch
+    results = in_flight.do(('prefetch',) + tuple(missing), fetch_relatedness,
+                           relatedness_store, conceptnet, missing)
+    for pair, relatedness in results.items():
+        if relatedness is not None:
+            # Convert from [-1, 1] to [0, 100]
+            similarity_cache[pair] = (relatedness + 1) * 50
+
 def calculate_all_similarities(words, target_word):
     """Calculate similarities between all words and create graph data"""
     nodes = []
     links = []
     
+    # Resolve all pairs up front so the loops below are cache hits
+    prefetch_similarities([target_word] + list(words))
+    
     # Add target node
     nodes.append({
         'id': target_word,
@@ -112,10 +160,6 @@ def set_word():
         session['guesses'] = []
         session['guess_count'] = 0
         
-        # Clear cache for new game
-        global similarity_cache
-        similarity_cache = {}
-        
         return jsonify({'success': True, 'message': f'Secret word set to "{word}"'})
     
     return jsonify({'success': False, 'error': 'Invalid word'}), 400
@@ -149,12 +193,12 @@ def guess():
             'graph_data': calculate_all_similarities(session['guesses'], session['target_word'])
         })
     
+    # Get updated graph data (fetches the new guess's pairs concurrently)
+    graph_data = calculate_all_similarities(session['guesses'], session['target_word'])
+    
     # Calculate similarity
     score = calculate_similarity(guess_word, session['target_word'])
     
-    # Get updated graph data
-    graph_data = calculate_all_similarities(session['guesses'], session['target_word'])
-    
     return jsonify({
         'correct': False,
         'word': guess_word,
@@ -1,19 +1,29 @@
 #!/usr/bin/env python3
 from flask import Flask, render_template, request, jsonify, session
-from gensim.models import KeyedVectors
 import numpy as np
 import secrets
 import os
+from best_match_graph import extend_best_matches, best_match_connections, graph_patch
+from game_store import Game, GameStore
+from vector_store import load_keyed_vectors, resolve_model_path
+from rank_table import get_rank_table
+from ann_index import load_ann_index, ANN_NPROBE
 
 app = Flask(__name__)
 app.secret_key = secrets.token_hex(16)
 
-# Load Word2Vec model from local file
+# Load Word2Vec model from local file (memory-mapped, shared between workers)
 print("Loading Word2Vec model from local file...")
-model_path = "models/word2vec-google-news-300.bin"
-model = KeyedVectors.load(model_path)
+model_path = resolve_model_path("models/word2vec-google-news-300.bin")
+model = load_keyed_vectors(model_path)
 print(f"Model loaded! Vocabulary size: {len(model.key_to_index)} words")
 
+# Approximate nearest-neighbour index (build with ann_index.py)
+ann_index = load_ann_index(model_path, model)
+
+# Game state, keyed by the game id in the session cookie
+games = GameStore(f"dynamic_word2vec:{model_path}:{len(model.key_to_index)}")
+
 def calculate_similarity(word1, word2):
     """Calculate semantic similarity between two words"""
     try:
@@ -31,6 +41,24 @@ def calculate_similarity(word1, word2):
         # If word not in vocabulary, return low similarity
         return 10
 
+def most_similar(word, topn=10, nprobe=ANN_NPROBE):
+    """Top-n most similar words, through the ANN index when one has been built"""
+    if ann_index is not None:
+        return ann_index.most_similar(model, word, topn=topn, nprobe=nprobe)
+    return model.most_similar(word, topn=topn)
+
+def score_guess(secret_word, guess_word):
+    """Score a guess against the secret word's precomputed rank table"""
+    table = get_rank_table(model, secret_word)
+    similarity = table.similarity(guess_word)
+    score = round(max(0, similarity) * 100)
+    
+    # Exact match gets 100
+    if secret_word.lower() == guess_word.lower():
+        score = 100
+    
+    return score, table.rank(guess_word)
+
 def find_most_similar_node(new_word, existing_nodes):
     """Find which existing node is most similar to the new word"""
     max_similarity = -1
@@ -44,35 +72,21 @@ def find_most_similar_node(new_word, existing_nodes):
     
     return most_similar, max_similarity
 
-def rebuild_connections(nodes):
-    """Rebuild all connections so each node connects to its most similar neighbor"""
-    connections = []
+def similarity_rows(word, others):
+    """Scores between word and each of others, as one vectorised product"""
+    similarities = model.cosine_similarities(model[word], model[others])
+    scores = np.round(np.maximum(0, similarities) * 100).astype(int)
     
-    for node in nodes:
-        if node['isSecret']:
-            continue  # Secret word doesn't connect to others
-        
-        # Find most similar node
-        max_sim = -1
-        best_target = None
-        
-        for other in nodes:
-            if other['word'] == node['word']:
-                continue
-            
-            sim = calculate_similarity(node['word'], other['word'])
-            if sim > max_sim:
-                max_sim = sim
-                best_target = other['word']
-        
-        if best_target:
-            connections.append({
-                'source': node['word'],
-                'target': best_target,
-                'similarity': max_sim
-            })
-    
-    return connections
+    # Exact match gets 100
+    scores[np.array([other.lower() == word.lower() for other in others])] = 100
+    
+    # Similarity is symmetric, so the row and column are the same
+    return scores, scores
+
+def update_connections(nodes, best_matches):
+    """Connect the newest node(s), only touching edges they improve, and return all connections"""
+    extend_best_matches(best_matches, nodes, similarity_rows)
+    return best_match_connections(nodes, best_matches)
 
 @app.route('/')
 def index():
@@ -98,15 +112,20 @@ def set_word():
         else:
             secret_word = secret_word.lower()
     
-    session['secret_word'] = secret_word
-    session['nodes'] = [{'word': secret_word, 'isSecret': True, 'score': 100}]
-    session['guess_count'] = 0
+    # Build (or reuse) the full-vocabulary rank table for this secret
+    get_rank_table(model, secret_word)
+    
+    # Only the game id goes in the cookie; the graph lives in the game store
+    games.delete(session.get('game_id'))
+    session.clear()
+    session['game_id'] = games.new_game_id()
+    games.put(session['game_id'], Game(secret_word, model.key_to_index))
     
     return jsonify({'success': True})
 
 @app.route('/guess', methods=['POST'])
 def guess():
-    if 'secret_word' not in session:
+    if 'game_id' not in session:
         return jsonify({'error': 'No word set yet'}), 400
     
     data = request.json
@@ -127,24 +146,35 @@ def guess():
         else:
             return jsonify({'error': f'"{original_guess}" not in vocabulary. Try a different word.'}), 400
     
-    secret_word = session['secret_word']
-    score = calculate_similarity(secret_word, guess_word)
-    
-    session['guess_count'] = session.get('guess_count', 0) + 1
-    
-    # Add new node
-    new_node = {
-        'word': guess_word,
-        'isSecret': False,
-        'score': score  # Similarity to secret word
-    }
+    game_id = session['game_id']
     
-    nodes = session.get('nodes', [])
-    nodes.append(new_node)
-    session['nodes'] = nodes
+    def apply_guess(game):
+        secret_word = game.secret_word(model.index_to_key)
+        score, rank = score_guess(secret_word, guess_word)
+        
+        game.guess_count += 1
+        
+        # Add new node (score is the similarity to the secret word)
+        game.add_node(guess_word, score, model.key_to_index, rank)
+        nodes = game.nodes(model.index_to_key)
+        
+        # Connect the new node, only updating edges it improves
+        best_matches = game.best_matches()
+        connections = update_connections(nodes, best_matches)
+        game.set_best_matches(best_matches)
+        return game, secret_word, score, rank, nodes, connections
+    
+    # Runs again if another worker saves the game first (see game_store.py)
+    applied = games.update(game_id, apply_guess)
+    if applied is None:
+        return jsonify({'error': 'No word set yet'}), 400
+    game, secret_word, score, rank, nodes, connections = applied
     
-    # Rebuild all connections
-    connections = rebuild_connections(nodes)
+    # Only send what's missing from the graph the client already has
+    graph_version = len(nodes)
+    patch = graph_patch(nodes, connections, data.get('version') if data.get('graph') == game_id else None)
+    if patch is not None:
+        nodes, connections = patch
     
     # Check if found
     found = guess_word.lower() == secret_word.lower()
@@ -170,9 +200,14 @@ def guess():
     result = {
         'guess': guess_word,
         'score': score,
+        'rank': rank,
+        'vocab_size': len(model.key_to_index),
         'feedback': feedback,
-        'guess_count': session['guess_count'],
+        'guess_count': game.guess_count,
         'found': found,
+        'graph': game_id,
+        'version': graph_version,
+        'delta': patch is not None,
         'nodes': nodes,
         'connections': connections
     }
@@ -190,7 +225,8 @@ def find_similar():
         return jsonify({'error': 'Word not found'}), 404
     
     # Get top 10 most similar words
-    similar = model.most_similar(word, topn=10)
+    nprobe = request.args.get('nprobe', ANN_NPROBE, type=int)
+    similar = most_similar(word, topn=10, nprobe=nprobe)
     
     return jsonify({
         'word': word,
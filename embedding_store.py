@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""Sentence-BERT embeddings served from a precomputed vocabulary matrix
+
+build_sbert_vocab.py encodes a large vocabulary once into
+models/<model>.compact.vectors.npy + .vocab.txt (the same layout as the
+word-vector artifacts). EmbeddingStore memory-maps that matrix, so known
+words cost a row lookup and the transformer is only imported and loaded
+the first time a word outside the vocabulary is guessed.
+
+Words encoded at runtime are kept in a bounded in-memory cache. Those
+that look like vocabulary words (lowercase letters, at most
+EXTRA_MAX_LENGTH of them) are also appended to <prefix>.extra.txt, one
+"word<TAB>base64 float32 vector" record per line written in a single
+append, so they survive restarts and several worker processes can add to
+the file safely. Each encoder mode (SBERT_MODE) has its own file, so
+int8 encodings are never served as float32 ones. Typos and junk are still answered but never saved. The
+file holds at most EXTRA_MAX_WORDS records: it is compacted to the newest
+ones when loaded, and a process stops appending once it is full.
+
+Environment variables:
+    SBERT_VOCAB_PATH   artifact prefix (defaults to the one for SBERT_MODEL)
+    EXTRA_CACHE_MB     memory for runtime-encoded embeddings in each process
+    EXTRA_MAX_WORDS    most runtime-encoded words kept in the file
+"""
+import base64
+import os
+import re
+import threading
+import numpy as np
+from bounded_cache import BoundedCache
+from sentence_encoder import SBERT_MODE, SBERT_MODEL, load_sentence_model, BatchEncoder
+from vector_store import artifact_prefix, artifact_exists
+
+SBERT_VOCAB_PATH = os.environ.get('SBERT_VOCAB_PATH', artifact_prefix(SBERT_MODEL))
+EXTRA_CACHE_MB = int(os.environ.get('EXTRA_CACHE_MB', 32))
+EXTRA_MAX_WORDS = int(os.environ.get('EXTRA_MAX_WORDS', 100000))
+
+# Words worth keeping across restarts, as build_model_artifact.py's vocabulary
+PERSISTED_WORD = re.compile(r'^[a-z]+$')
+EXTRA_MAX_LENGTH = 30
+
+def extra_path(prefix, mode=SBERT_MODE):
+    """File of runtime encodings for an artifact, per encoder mode"""
+    return prefix + ('.extra.txt' if mode == 'float32' else f'.{mode}.extra.txt')
+
+def persistable(word):
+    return len(word) <= EXTRA_MAX_LENGTH and PERSISTED_WORD.match(word) is not None
+
+def normalise(vectors):
+    """Scale rows to unit length"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=-1, keepdims=True), 1e-12)
+
+class EmbeddingStore:
+    """Unit-length Sentence-BERT embeddings: vocabulary matrix first, lazy encoder otherwise"""
+
+    def __init__(self, prefix=SBERT_VOCAB_PATH, load_model=load_sentence_model,
+                 max_bytes=EXTRA_CACHE_MB * 1024 * 1024, max_words=EXTRA_MAX_WORDS, mode=SBERT_MODE):
+        self.prefix = prefix
+        # load_model must encode in this mode (load_sentence_model reads SBERT_MODE too)
+        self.extra_path = extra_path(prefix, mode)
+        self._load_model = load_model
+        self._encoder = None
+        self._lock = threading.Lock()
+
+        self.vectors = None
+        self.key_to_index = {}
+        if artifact_exists(prefix):
+            self.vectors = np.load(prefix + '.vectors.npy', mmap_mode='r')
+            with open(prefix + '.vocab.txt', encoding='utf-8') as f:
+                self.key_to_index = {word: i for i, word in enumerate(f.read().splitlines())}
+            print(f"Loaded {len(self.key_to_index)} precomputed Sentence-BERT embeddings from {prefix}")
+
+        self.max_words = max_words
+        self.extra = BoundedCache(max_bytes)
+        self._persisted = 0
+        self._read_extra()
+
+    def _read_extra(self):
+        """Load words encoded at runtime by this or earlier processes, compacting the file"""
+        if not os.path.exists(self.extra_path):
+            return
+
+        records = {}  # word -> line, newest last
+        lines = 0
+        dimensions = self.vectors.shape[1] if self.vectors is not None else None
+        with open(self.extra_path, encoding='utf-8') as f:
+            for line in f:
+                lines += 1
+                word, _, encoded = line.rstrip('\n').partition('\t')
+                if not persistable(word):
+                    continue
+                try:
+                    vector = np.frombuffer(base64.b64decode(encoded, validate=True), dtype=np.float32)
+                except ValueError:
+                    continue  # Torn write from a crashed process
+                dimensions = dimensions or len(vector)
+                if len(vector) == dimensions:
+                    records.pop(word, None)
+                    records[word] = (line if line.endswith('\n') else line + '\n', vector)
+
+        kept = list(records.items())[-self.max_words:] if self.max_words else []
+        for word, (_, vector) in kept:
+            self.extra[word] = vector
+        self._persisted = len(kept)
+
+        # Drop junk, duplicates and the oldest records beyond the cap
+        if len(kept) < lines:
+            self._rewrite_extra(line for _, (line, _) in kept)
+
+    def _rewrite_extra(self, lines):
+        try:
+            tmp_path = f"{self.extra_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.writelines(lines)
+            os.replace(tmp_path, self.extra_path)
+        except OSError as e:
+            print(f"Could not compact {self.extra_path}: {e}")
+
+    @property
+    def encoder(self):
+        """Batch encoder, loading the transformer on first use"""
+        if self._encoder is None:
+            with self._lock:
+                if self._encoder is None:
+                    print("Loading language model for words outside the vocabulary...")
+                    self._encoder = BatchEncoder(self._load_model())
+                    print("Model loaded!")
+        return self._encoder
+
+    def __contains__(self, word):
+        return word in self.key_to_index or word in self.extra
+
+    def get(self, word):
+        """Unit-length embedding of one word"""
+        return self.get_many([word])[0]
+
+    def get_many(self, words):
+        """Unit-length embeddings of words as rows of an array"""
+        found = {}
+        for word in words:
+            if word in self.key_to_index:
+                found[word] = np.asarray(self.vectors[self.key_to_index[word]], dtype=np.float32)
+            else:
+                vector = self.extra.get(word)
+                if vector is not None:
+                    found[word] = vector
+
+        missing = [word for word in dict.fromkeys(words) if word not in found]
+        if missing:
+            for word, vector in zip(missing, normalise(self.encoder.encode_many(missing))):
+                found[word] = self.extra[word] = vector
+            self._append_extra([(word, found[word]) for word in missing if persistable(word)])
+
+        return np.array([found[word] for word in words])
+
+    def similarity(self, word1, word2):
+        """Cosine similarity of two words in [-1, 1]"""
+        embedding1, embedding2 = self.get_many([word1, word2])
+        return float(np.dot(embedding1, embedding2))
+
+    def _append_extra(self, records):
+        """Persist newly encoded (word, vector) records, one whole record per write"""
+        records = records[:max(0, self.max_words - self._persisted)]
+        if not records:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.extra_path) or '.', exist_ok=True)
+            with open(self.extra_path, 'a', encoding='utf-8') as f:
+                for word, vector in records:
+                    encoded = base64.b64encode(vector.astype(np.float32).tobytes()).decode('ascii')
+                    f.write(f"{word}\t{encoded}\n")
+                    f.flush()
+                    self._persisted += 1
+        except OSError as e:
+            print(f"Could not save new embeddings to {self.extra_path}: {e}")
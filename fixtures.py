@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Small random models shared by the test_*.py scripts
+
+Real word vectors and the Sentence-BERT vocabulary are gigabytes and
+aren't available to the tests, so the tests run on random stand-ins that
+have the same interfaces.
+"""
+import numpy as np
+from embedding_store import normalise
+
+def random_keyed_vectors(words=None, size=500, dimensions=16, seed=0):
+    """gensim KeyedVectors of random vectors for words (default word0, word1, ...)"""
+    from gensim.models import KeyedVectors
+
+    words = words or [f"word{i}" for i in range(size)]
+    rng = np.random.default_rng(seed)
+    model = KeyedVectors(dimensions)
+    model.add_vectors(words, rng.normal(size=(len(words), dimensions)).astype(np.float32))
+    return model
+
+class FakeEmbeddingStore:
+    """EmbeddingStore with a random unit-length vocabulary matrix of word0, word1, ...
+
+    Words outside it get a random vector of their own, like the encoder's
+    runtime embeddings. Every get_many() call is recorded in looked_up.
+    """
+
+    def __init__(self, size=1000, dimensions=16, seed=0, dtype=np.float32):
+        self.rng = np.random.default_rng(seed)
+        self.vectors = normalise(self.rng.normal(size=(size, dimensions))).astype(dtype)
+        self.words = [f"word{i}" for i in range(size)]
+        self.key_to_index = {word: i for i, word in enumerate(self.words)}
+        self.extra = {}
+        self.looked_up = []
+
+    def vector(self, word):
+        """Unit-length embedding of word, without recording a lookup"""
+        word = word.lower()
+        index = self.key_to_index.get(word)
+        if index is not None:
+            return np.asarray(self.vectors[index], dtype=np.float32)
+        if word not in self.extra:
+            self.extra[word] = normalise(self.rng.normal(size=self.vectors.shape[1]))
+        return self.extra[word]
+
+    def get_many(self, words):
+        self.looked_up.append(list(words))
+        return np.array([self.vector(word) for word in words])
+
+    def get(self, word):
+        return self.get_many([word])[0]
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""Server-side game state for the word-vector graph games
+
+The games used to keep every node dict and best-match edge in the signed
+cookie session, re-serialising and re-signing the whole graph on every
+guess until it outgrew the 4KB cookie limit. Now the cookie only holds a
+game id, and each game is a handful of small arrays: vocabulary indices
+(words outside the vocabulary go in a short side list), scores, ranks and
+best-match edges.
+
+GameStore keeps recently used games in memory within a byte budget and
+writes every update through to SQLite. Any worker may serve a game's next
+guess, so SQLite is the only copy every worker can see: spilling to it
+only on eviction would let workers play on stale copies. Memory saves
+the reads instead. get() is a single SELECT that only returns the game's
+state when the copy in memory is out of date.
+
+Updates are optimistic: update() writes only if the stored version is
+still the one it read, and otherwise reloads the game and applies the
+guess again, so two workers guessing at once can't lose a guess. Games
+idle for longer than GAME_IDLE_TTL are deleted.
+
+Environment variables:
+    GAME_DB         database path (defaults to /tmp on Vercel, where only /tmp is writable)
+    GAME_STORE_MB   in-memory budget per process
+    GAME_IDLE_TTL   seconds before an idle game is deleted
+"""
+from collections import OrderedDict
+import io
+import os
+import random
+import secrets
+import sqlite3
+import threading
+import time
+import numpy as np
+
+GAME_DB = os.environ.get(
+    'GAME_DB',
+    '/tmp/games.sqlite3' if os.environ.get('VERCEL') else 'models/games.sqlite3'
+)
+GAME_STORE_MB = int(os.environ.get('GAME_STORE_MB', 64))
+GAME_IDLE_TTL = float(os.environ.get('GAME_IDLE_TTL', 6 * 60 * 60))
+
+# match_targets values that aren't node indices
+NO_MATCH = -1
+SECRET = -2
+
+class Game:
+    """One game's nodes and best-match edges as compact arrays
+
+    Node 0 is the secret word. words[i] is a vocabulary index, or -(k + 1)
+    for extra_words[k] when the word isn't in the vocabulary.
+    """
+
+    def __init__(self, secret_word, key_to_index):
+        self.extra_words = []
+        self.words = np.zeros(0, dtype=np.int32)
+        self.scores = np.zeros(0, dtype=np.int16)
+        self.ranks = np.zeros(0, dtype=np.int32)
+        self.match_targets = np.zeros(0, dtype=np.int32)
+        self.match_scores = np.zeros(0, dtype=np.int16)
+        self.guess_count = 0
+        self.version = 0
+        self.add_node(secret_word, 100, key_to_index)
+        self.set_best_matches([None])
+
+    def _word_id(self, word, key_to_index):
+        index = key_to_index.get(word)
+        if index is not None:
+            return index
+        if word not in self.extra_words:
+            self.extra_words.append(word)
+        return -(self.extra_words.index(word) + 1)
+
+    def word(self, i, index_to_key):
+        word_id = int(self.words[i])
+        return index_to_key[word_id] if word_id >= 0 else self.extra_words[-word_id - 1]
+
+    def secret_word(self, index_to_key):
+        return self.word(0, index_to_key)
+
+    def add_node(self, word, score, key_to_index, rank=-1):
+        """Append a node; its best match is filled in by set_best_matches()"""
+        self.words = np.append(self.words, np.int32(self._word_id(word, key_to_index)))
+        self.scores = np.append(self.scores, np.int16(score))
+        self.ranks = np.append(self.ranks, np.int32(rank))
+
+    def nodes(self, index_to_key):
+        """Node dicts as returned to the client"""
+        nodes = []
+        for i in range(len(self.words)):
+            node = {'word': self.word(i, index_to_key), 'isSecret': i == 0, 'score': int(self.scores[i])}
+            if i > 0 and self.ranks[i] >= 0:
+                node['rank'] = int(self.ranks[i])
+            nodes.append(node)
+        return nodes
+
+    def best_matches(self):
+        """Edges in best_match_graph's list form"""
+        return [None if target == SECRET else [int(target), int(score)]
+                for target, score in zip(self.match_targets, self.match_scores)]
+
+    def set_best_matches(self, best_matches):
+        self.match_targets = np.array([SECRET if match is None else match[0] for match in best_matches],
+                                      dtype=np.int32)
+        self.match_scores = np.array([0 if match is None else match[1] for match in best_matches],
+                                     dtype=np.int16)
+
+    @property
+    def nbytes(self):
+        arrays = (self.words, self.scores, self.ranks, self.match_targets, self.match_scores)
+        return sum(array.nbytes for array in arrays) + sum(len(word) + 50 for word in self.extra_words) + 500
+
+    def to_bytes(self):
+        buffer = io.BytesIO()
+        np.savez(buffer, words=self.words, scores=self.scores, ranks=self.ranks,
+                 match_targets=self.match_targets, match_scores=self.match_scores,
+                 counters=np.array([self.guess_count, self.version], dtype=np.int64),
+                 extra_words=np.array(self.extra_words, dtype=str))
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data):
+        game = cls.__new__(cls)
+        with np.load(io.BytesIO(data)) as arrays:
+            game.words = arrays['words']
+            game.scores = arrays['scores']
+            game.ranks = arrays['ranks']
+            game.match_targets = arrays['match_targets']
+            game.match_scores = arrays['match_scores']
+            game.guess_count, game.version = (int(n) for n in arrays['counters'])
+            game.extra_words = [str(word) for word in arrays['extra_words']]
+        return game
+
+class GameStore:
+    """Games by id: an LRU in memory, written through to SQLite"""
+
+    def __init__(self, namespace, path=GAME_DB, max_bytes=GAME_STORE_MB * 1024 * 1024,
+                 idle_ttl=GAME_IDLE_TTL):
+        # Separates apps (and model versions) sharing one database, since
+        # vocabulary indices mean nothing under a different model
+        self.namespace = namespace
+        self.path = path
+        self.max_bytes = max_bytes
+        self.idle_ttl = idle_ttl
+
+        self._games = OrderedDict()  # game_id -> (game, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._game_locks = [threading.Lock() for _ in range(64)]
+        self._local = threading.local()
+        self._puts = 0
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        connection = self._connection()
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS games (
+                namespace TEXT NOT NULL,
+                game_id TEXT NOT NULL,
+                version INTEGER NOT NULL,
+                state BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (namespace, game_id)
+            ) WITHOUT ROWID
+        """)
+        connection.commit()
+
+    def _connection(self):
+        """One connection per thread (sqlite3 connections can't be shared)"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def new_game_id():
+        return secrets.token_urlsafe(16)
+
+    def lock(self, game_id):
+        """Lock serialising updates to one game within this process (e.g. a double-submitted guess)"""
+        return self._game_locks[hash(game_id) % len(self._game_locks)]
+
+    def get(self, game_id):
+        """The game, or None if it doesn't exist or has expired"""
+        if not game_id:
+            return None
+
+        with self._lock:
+            entry = self._games.get(game_id)
+        cached = entry[0] if entry is not None else None
+
+        # The state only comes back if the copy in memory is missing or stale
+        row = self._connection().execute(
+            "SELECT last_used, CASE WHEN version = ? THEN NULL ELSE state END FROM games "
+            "WHERE namespace = ? AND game_id = ?",
+            (cached.version if cached is not None else -1, self.namespace, game_id)
+        ).fetchone()
+        if row is None or time.time() - row[0] > self.idle_ttl:
+            self.delete(game_id)
+            return None
+
+        if row[1] is None:
+            with self._lock:
+                if game_id in self._games:
+                    self._games.move_to_end(game_id)
+            return cached
+
+        # Evicted from memory, or last updated by another worker
+        game = Game.from_bytes(row[1])
+        self._remember(game_id, game)
+        return game
+
+    def update(self, game_id, apply, attempts=10):
+        """Run apply(game) on a stored game and save it, returning apply's result
+
+        The save only succeeds if no other worker saved the game since it
+        was read; otherwise the game is reloaded and apply runs again, so
+        apply must only change the game it is given. Returns None if the
+        game doesn't exist.
+        """
+        with self.lock(game_id):
+            for attempt in range(attempts):
+                game = self.get(game_id)
+                if game is None:
+                    return None
+                result = apply(game)
+                if self._save_if_unchanged(game_id, game):
+                    return result
+                # Another worker got there first; drop the copy apply changed
+                # and back off a little so the two stop colliding
+                with self._lock:
+                    self._forget(game_id)
+                time.sleep(random.uniform(0, 0.002 * (attempt + 1)))
+        raise RuntimeError(f"Game {game_id} kept changing during {attempts} attempts to update it")
+
+    def _save_if_unchanged(self, game_id, game):
+        read_version = game.version
+        game.version += 1
+        connection = self._connection()
+        with connection:
+            cursor = connection.execute(
+                "UPDATE games SET version = ?, state = ?, last_used = ? "
+                "WHERE namespace = ? AND game_id = ? AND version = ?",
+                (game.version, game.to_bytes(), time.time(), self.namespace, game_id, read_version)
+            )
+        if cursor.rowcount == 0:
+            game.version = read_version
+            return False
+        self._remember(game_id, game)
+        self._count_put()
+        return True
+
+    def put(self, game_id, game):
+        """Save a new game, replacing any with the same id (use update() for existing games)"""
+        game.version += 1
+        connection = self._connection()
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO games (namespace, game_id, version, state, last_used) VALUES (?, ?, ?, ?, ?)",
+                (self.namespace, game_id, game.version, game.to_bytes(), time.time())
+            )
+        self._remember(game_id, game)
+        self._count_put()
+
+    def _count_put(self):
+        self._puts += 1
+        if self._puts % 256 == 0:
+            self.expire()
+
+    def delete(self, game_id):
+        if not game_id:
+            return
+        with self._lock:
+            self._forget(game_id)
+        connection = self._connection()
+        with connection:
+            connection.execute("DELETE FROM games WHERE namespace = ? AND game_id = ?", (self.namespace, game_id))
+
+    def expire(self):
+        """Delete games nobody has played for idle_ttl seconds"""
+        connection = self._connection()
+        with connection:
+            connection.execute("DELETE FROM games WHERE namespace = ? AND last_used < ?",
+                               (self.namespace, time.time() - self.idle_ttl))
+
+        # Whatever is left in memory but gone from the database has expired too
+        with self._lock:
+            game_ids = list(self._games)
+        live = set()
+        for start in range(0, len(game_ids), 400):
+            chunk = game_ids[start:start + 400]
+            rows = connection.execute(
+                f"SELECT game_id FROM games WHERE namespace = ? AND game_id IN ({','.join('?' * len(chunk))})",
+                [self.namespace] + chunk
+            )
+            live.update(row[0] for row in rows)
+        with self._lock:
+            for game_id in set(game_ids) - live:
+                self._forget(game_id)
+
+    def _remember(self, game_id, game):
+        size = game.nbytes
+        with self._lock:
+            self._forget(game_id)
+            self._games[game_id] = (game, size)
+            self._bytes += size
+            # Evicted games are still in SQLite and reload on their next guess
+            while self._bytes > self.max_bytes and len(self._games) > 1:
+                self._forget(next(iter(self._games)))
+
+    def _forget(self, game_id):
+        entry = self._games.pop(game_id, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+    def stats(self):
+        with self._lock:
+            return {'games_in_memory': len(self._games), 'bytes': self._bytes}
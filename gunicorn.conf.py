@@ -0,0 +1,43 @@
+"""Gunicorn settings for serving the word-vector apps with shared-memory models
+
+The master loads every model named in SHARED_MODELS once, copies it into
+shared memory before forking, and workers attach to it zero-copy through
+vector_store (see shared_vectors.py), so adding workers doesn't multiply
+RAM:
+
+    SHARED_MODELS=word2vec-google-news-300 gunicorn -c gunicorn.conf.py dynamic_word2vec:app
+    SHARED_MODELS=word2vec-google-news-300,glove-wiki-gigaword-100 gunicorn -c gunicorn.conf.py dynamic_semantle:app
+
+Sentence-BERT's precomputed vocabulary (embedding_store.py) and the other
+.npy tables are memory-mapped, so workers already share them through the
+page cache.
+"""
+import os
+
+workers = int(os.environ.get('WEB_CONCURRENCY', 4))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+
+SHARED_MODELS = [name.strip() for name in os.environ.get('SHARED_MODELS', '').split(',') if name.strip()]
+
+# Segments owned by the master for its whole lifetime
+shared_segments = []
+
+def on_starting(server):
+    """Publish models before any worker is forked"""
+    from shared_vectors import publish, shared_name
+    from vector_store import load_pretrained
+
+    published = []
+    for name in SHARED_MODELS:
+        server.log.info(f"Loading {name} for shared memory...")
+        shared_segments.extend(publish(name, load_pretrained(name)))
+        published.append(shared_name(name))
+
+    # Inherited by every worker
+    os.environ['SHARED_VECTORS'] = ','.join(published)
+
+def on_exit(server):
+    for segment in shared_segments:
+        segment.close()
+        segment.unlink()
@@ -3,6 +3,7 @@ import requests
 import secrets
 import time
 import os
+from numberbatch import load_numberbatch
 
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', secrets.token_hex(16))
@@ -10,6 +11,9 @@ app.secret_key = os.environ.get('SECRET_KEY', secrets.token_hex(16))
 # ConceptNet API endpoint
 CONCEPTNET_API = "http://api.conceptnet.io"
 
+# Local ConceptNet embeddings, used instead of the API when converted (see numberbatch.py)
+numberbatch = load_numberbatch()
+
 def calculate_similarity(word1, word2):
     """Calculate semantic similarity between two words using ConceptNet API"""
     
@@ -17,6 +21,10 @@ def calculate_similarity(word1, word2):
     if word1.lower() == word2.lower():
         return 100
     
+    if numberbatch is not None:
+        relatedness = numberbatch.relatedness(word1, word2)
+        return round(max(0, (relatedness + 1) * 50))  # Convert -1,1 to 0,100
+    
     try:
         # Make API request to ConceptNet
         response = requests.get(
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Build and load an all-vocabulary nearest-neighbour table for a word2vec model
+
+Run offline once per model:
+
+    python neighbour_table.py models/word2vec-google-news-300.bin --topn 10
+
+It writes two arrays next to the model, aligned to the model's key_to_index:
+
+    <model>.neighbours.npy  int32 (vocab, topn)  indices of the closest words
+    <model>.closest.npy     float32 (vocab,)     similarity of the closest word
+    <model>.neighbours.json                      the model's size and fingerprint
+
+The apps memory-map them, so a word's closest-word similarity costs an
+array lookup instead of a most_similar() scan over the whole vocabulary.
+With --limit N only the first (most frequent) N words get rows, but each
+is still searched against the whole vocabulary, so every row is exactly
+what most_similar() would return. A table built for a different model is
+ignored when loaded.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import json
+import os
+import time
+import numpy as np
+from vector_store import model_fingerprint
+
+ROW_BLOCK = 256
+COLUMN_BLOCK = 65536
+
+def neighbour_table_paths(model_path):
+    """Paths of the neighbour and closest-similarity arrays for a model"""
+    return model_path + '.neighbours.npy', model_path + '.closest.npy'
+
+def neighbour_table_info_path(model_path):
+    return model_path + '.neighbours.json'
+
+def load_neighbour_table(model_path, model):
+    """Memory-map a prebuilt neighbour table, or return (None, None) if missing or stale"""
+    neighbours_path, closest_path = neighbour_table_paths(model_path)
+    if not os.path.exists(neighbours_path) or not os.path.exists(closest_path):
+        return None, None
+
+    try:
+        with open(neighbour_table_info_path(model_path), encoding='utf-8') as f:
+            info = json.load(f)
+    except (OSError, ValueError):
+        info = {}  # Tables from before the info file existed
+    if (info.get('vocabulary_size') != len(model.index_to_key)
+            or info.get('fingerprint') != model_fingerprint(model)):
+        print(f"Ignoring neighbour table {closest_path}: built from a different model, "
+              f"rebuild it with neighbour_table.py")
+        return None, None
+
+    neighbours = np.load(neighbours_path, mmap_mode='r')
+    closest = np.load(closest_path, mmap_mode='r')
+    print(f"Loaded neighbour table for {len(closest)} words from {closest_path}")
+    return neighbours, closest
+
+def _top_neighbours(vectors, inverse_norms, start, stop, topn):
+    """Exact top-n neighbours for rows [start, stop), scanning all columns (every word) in blocks"""
+    rows = vectors[start:stop] * inverse_norms[start:stop, None]
+    n_rows = stop - start
+    best_index = np.full((n_rows, topn), -1, dtype=np.int64)
+    best_sim = np.full((n_rows, topn), -np.inf, dtype=np.float32)
+    row_ids = np.arange(n_rows)
+
+    for column_start in range(0, len(vectors), COLUMN_BLOCK):
+        column_stop = min(column_start + COLUMN_BLOCK, len(vectors))
+        sims = rows.dot(vectors[column_start:column_stop].T)
+        sims *= inverse_norms[column_start:column_stop]
+
+        # A word is not its own neighbour
+        own = row_ids + start
+        inside = (own >= column_start) & (own < column_stop)
+        sims[row_ids[inside], own[inside] - column_start] = -np.inf
+
+        # Merge this block's candidates with the running top-n
+        k = min(topn, sims.shape[1])
+        candidates = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        merged_sim = np.concatenate([best_sim, np.take_along_axis(sims, candidates, axis=1)], axis=1)
+        merged_index = np.concatenate([best_index, candidates + column_start], axis=1)
+        keep = np.argsort(-merged_sim, axis=1, kind='stable')[:, :topn]
+        best_sim = np.take_along_axis(merged_sim, keep, axis=1)
+        best_index = np.take_along_axis(merged_index, keep, axis=1)
+
+    return best_index.astype(np.int32), best_sim[:, 0]
+
+def build_neighbour_table(model, model_path, topn=10, limit=None, workers=None):
+    """Compute every word's top-n neighbours (the first `limit` words' if given) with blocked matrix multiplies"""
+    vectors = model.vectors
+    n = len(vectors) if limit is None else min(limit, len(vectors))
+    model.fill_norms()
+    inverse_norms = (1.0 / np.maximum(model.norms, 1e-12)).astype(np.float32)
+
+    neighbours_path, closest_path = neighbour_table_paths(model_path)
+    # The old table's info must not vouch for a half-written new one
+    if os.path.exists(neighbour_table_info_path(model_path)):
+        os.remove(neighbour_table_info_path(model_path))
+    neighbours = np.lib.format.open_memmap(neighbours_path, mode='w+', dtype=np.int32, shape=(n, topn))
+    closest = np.lib.format.open_memmap(closest_path, mode='w+', dtype=np.float32, shape=(n,))
+
+    def run_block(start):
+        stop = min(start + ROW_BLOCK, n)
+        neighbours[start:stop], closest[start:stop] = _top_neighbours(vectors, inverse_norms, start, stop, topn)
+        return stop - start
+
+    # numpy releases the GIL inside dot/argpartition, so threads use every core
+    workers = workers or os.cpu_count()
+    started = time.time()
+    done = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for count in pool.map(run_block, range(0, n, ROW_BLOCK)):
+            done += count
+            if done % (ROW_BLOCK * 100) < ROW_BLOCK or done == n:
+                print(f"  {done}/{n} words ({time.time() - started:.0f}s)")
+
+    neighbours.flush()
+    closest.flush()
+    with open(neighbour_table_info_path(model_path), 'w', encoding='utf-8') as f:
+        json.dump({'vocabulary_size': len(model.index_to_key), 'fingerprint': model_fingerprint(model),
+                   'rows': n, 'topn': topn}, f)
+    print(f"Saved {neighbours_path} and {closest_path}")
+
+if __name__ == '__main__':
+    from vector_store import load_keyed_vectors
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('model_path', nargs='?', default='models/word2vec-google-news-300.bin')
+    parser.add_argument('--topn', type=int, default=10, help='neighbours to keep per word')
+    parser.add_argument('--limit', type=int, default=None, help='only build rows for the first N (most frequent) words')
+    parser.add_argument('--workers', type=int, default=None, help='threads to use (default: all cores)')
+    args = parser.parse_args()
+
+    print(f"Loading model from {args.model_path}...")
+    model = load_keyed_vectors(args.model_path)
+    print(f"Model loaded! Vocabulary size: {len(model.key_to_index)} words")
+
+    build_neighbour_table(model, args.model_path, topn=args.topn, limit=args.limit, workers=args.workers)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Local ConceptNet relatedness from a Numberbatch embedding file
+
+ConceptNet's /relatedness endpoint is the cosine similarity of Numberbatch
+vectors, so with the embeddings on disk every pair is a local dot product
+instead of a blocking HTTP call. Convert the downloaded file once:
+
+    python numberbatch.py numberbatch-en-19.08.txt.gz
+
+This keeps only English terms (/c/en/... in the multilingual release),
+normalises the vectors and writes models/numberbatch-en.compact.vectors.npy
+plus a .vocab.txt index, the same layout as build_model_artifact.py. The
+apps memory-map it when present (or from NUMBERBATCH_PATH) and fall back
+to api.conceptnet.io otherwise.
+"""
+import gzip
+import os
+import sys
+import numpy as np
+from conceptnet_client import conceptnet_term
+
+NUMBERBATCH_PATH = os.environ.get('NUMBERBATCH_PATH', 'models/numberbatch-en.compact')
+
+def convert_numberbatch(text_path, prefix=NUMBERBATCH_PATH, dtype='float32'):
+    """Convert a Numberbatch text file to normalised .npy vectors plus vocabulary"""
+    opener = gzip.open if text_path.endswith('.gz') else open
+    words = []
+    rows = []
+
+    with opener(text_path, 'rt', encoding='utf-8') as f:
+        header = f.readline().split()
+        dimensions = int(header[1])
+
+        for line in f:
+            term, _, values = line.rstrip('\n').partition(' ')
+
+            # The multilingual release uses full URIs; the English one plain terms
+            if term.startswith('/c/'):
+                if not term.startswith('/c/en/'):
+                    continue
+                term = term[len('/c/en/'):]
+
+            vector = np.array(values.split(), dtype=np.float32)
+            if len(vector) != dimensions:
+                continue
+            words.append(term)
+            rows.append(vector)
+
+    vectors = np.array(rows, dtype=np.float32).reshape(-1, dimensions)
+    vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+    os.makedirs(os.path.dirname(prefix) or '.', exist_ok=True)
+    np.save(prefix + '.vectors.npy', vectors.astype(dtype))
+    with open(prefix + '.vocab.txt', 'w', encoding='utf-8') as f:
+        f.write('\n'.join(words))
+
+    print(f"Saved {len(words)} English terms to {prefix}.vectors.npy and {prefix}.vocab.txt")
+
+class Numberbatch:
+    """Memory-mapped Numberbatch vectors with ConceptNet-style relatedness"""
+
+    def __init__(self, prefix):
+        self.vectors = np.load(prefix + '.vectors.npy', mmap_mode='r')
+        with open(prefix + '.vocab.txt', encoding='utf-8') as f:
+            self.key_to_index = {word: i for i, word in enumerate(f.read().splitlines())}
+
+    def __contains__(self, word):
+        return conceptnet_term(word) in self.key_to_index
+
+    def relatedness(self, word1, word2):
+        """Relatedness in [-1, 1], or 0 when either term is unknown (like the API)"""
+        i = self.key_to_index.get(conceptnet_term(word1))
+        j = self.key_to_index.get(conceptnet_term(word2))
+        if i is None or j is None:
+            return 0.0
+        return float(np.dot(self.vectors[i], self.vectors[j]))
+
+    def relatedness_matrix(self, words):
+        """Pairwise relatedness of words from one gather and one matmul"""
+        matrix = np.zeros((len(words), len(words)))
+        indices = [self.key_to_index.get(conceptnet_term(word)) for word in words]
+        known = [i for i, index in enumerate(indices) if index is not None]
+        if known:
+            vectors = np.asarray(self.vectors[[indices[i] for i in known]], dtype=np.float32)
+            matrix[np.ix_(known, known)] = vectors.dot(vectors.T)
+        return matrix
+
+def load_numberbatch(prefix=NUMBERBATCH_PATH):
+    """Load the local Numberbatch backend, or None if it hasn't been converted"""
+    if not os.path.exists(prefix + '.vectors.npy') or not os.path.exists(prefix + '.vocab.txt'):
+        return None
+
+    print(f"Loading ConceptNet Numberbatch from {prefix}...")
+    numberbatch = Numberbatch(prefix)
+    print(f"Numberbatch loaded! {len(numberbatch.key_to_index)} English terms")
+    return numberbatch
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print(f"Usage: {sys.argv[0]} numberbatch.txt[.gz] [output prefix]")
+        sys.exit(1)
+
+    convert_numberbatch(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else NUMBERBATCH_PATH)
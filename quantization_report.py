@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Compare the int8-quantised Sentence-BERT encoder with the float32 model
+
+Scores the project's example pairs with both modes (0-100, as the games
+show them), reports how far the int8 scores drift and whether the pairs
+keep their order, then times encoding at batch size 1 and in batches.
+
+    python quantization_report.py
+    TORCH_THREADS=2 python quantization_report.py --words 2000
+"""
+import argparse
+import time
+import numpy as np
+from sentence_encoder import SBERT_MODEL, inference_mode, load_sentence_model
+
+# The examples shown by app.py /examples and semantle_semantic.py, plus pairs from the tests
+EXAMPLE_PAIRS = [
+    ("cat", "dog"),
+    ("happy", "joyful"),
+    ("car", "automobile"),
+    ("hot", "cold"),
+    ("king", "queen"),
+    ("computer", "banana"),
+    ("food", "eating"),
+    ("umami", "taste"),
+    ("umami", "food"),
+    ("computer", "laptop"),
+    ("ocean", "sea"),
+    ("music", "guitar")
+]
+
+def game_score(embedding1, embedding2):
+    """Similarity as the games show it"""
+    cosine_sim = np.dot(embedding1, embedding2) / (np.linalg.norm(embedding1) * np.linalg.norm(embedding2))
+    return max(0, cosine_sim) * 100
+
+def pair_scores(model, pairs):
+    words = sorted({word for pair in pairs for word in pair})
+    with inference_mode():
+        embeddings = dict(zip(words, model.encode(words)))
+    return np.array([game_score(embeddings[w1], embeddings[w2]) for w1, w2 in pairs])
+
+def rank_correlation(a, b):
+    """Spearman correlation (no ties expected between real-valued scores)"""
+    ranks_a = np.argsort(np.argsort(a))
+    ranks_b = np.argsort(np.argsort(b))
+    return float(np.corrcoef(ranks_a, ranks_b)[0, 1])
+
+def words_per_second(model, words, batch_size):
+    with inference_mode():
+        model.encode(words[:batch_size])  # Warm up
+        start = time.perf_counter()
+        for i in range(0, len(words), batch_size):
+            model.encode(words[i:i + batch_size])
+    return len(words) / (time.perf_counter() - start)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--model', default=SBERT_MODEL)
+    parser.add_argument('--words', type=int, default=500, help='words to encode for the throughput test')
+    args = parser.parse_args()
+
+    models = {mode: load_sentence_model(args.model, mode=mode) for mode in ('float32', 'int8')}
+
+    scores = {mode: pair_scores(model, EXAMPLE_PAIRS) for mode, model in models.items()}
+    drift = np.abs(scores['int8'] - scores['float32'])
+
+    print(f"\n=== Example pairs: float32 vs int8 ({args.model}) ===")
+    for (w1, w2), full, quantised in zip(EXAMPLE_PAIRS, scores['float32'], scores['int8']):
+        print(f"{w1:10} ↔ {w2:10} : {round(full):3}/100 vs {round(quantised):3}/100  ({quantised - full:+.2f})")
+
+    print(f"\nMean score drift:  {drift.mean():.2f} points")
+    print(f"Max score drift:   {drift.max():.2f} points")
+    print(f"Displayed scores changed for {int(np.sum(np.round(scores['int8']) != np.round(scores['float32'])))} of {len(EXAMPLE_PAIRS)} pairs")
+    print(f"Rank correlation:  {rank_correlation(scores['float32'], scores['int8']):.3f}")
+
+    vocabulary = [word for pair in EXAMPLE_PAIRS for word in pair]
+    words = (vocabulary * (args.words // len(vocabulary) + 1))[:args.words]
+    print(f"\n=== Throughput ({args.words} words) ===")
+    for batch_size in (1, 32):
+        rates = {mode: words_per_second(model, words, batch_size) for mode, model in models.items()}
+        print(f"batch {batch_size:3}: float32 {rates['float32']:8.0f} words/s   "
+              f"int8 {rates['int8']:8.0f} words/s   ({rates['int8'] / rates['float32']:.2f}x)")
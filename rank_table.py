@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Precomputed full-vocabulary similarity and rank tables for secret words
+
+A table holds a float32 similarity and an int32 rank per vocabulary word,
+about 24MB for the full 3M-word Word2Vec model, so the cache of recent
+tables is bounded by memory rather than by count.
+
+Environment variables:
+    RANK_TABLE_CACHE_MB   memory for (model, secret word) tables in each process
+"""
+import os
+import numpy as np
+from bounded_cache import BoundedCache
+
+RANK_TABLE_CACHE_MB = int(os.environ.get('RANK_TABLE_CACHE_MB', 256))
+
+_tables = BoundedCache(RANK_TABLE_CACHE_MB * 1024 * 1024)
+
+class RankTable:
+    """Cosine similarity of every vocabulary word to one secret word, and its rank"""
+
+    def __init__(self, model, word):
+        self.word = word
+        self.key_to_index = model.key_to_index
+        self.vocab_size = len(model.key_to_index)
+
+        # One matrix-vector product against the whole vocabulary
+        model.fill_norms()
+        index = model.key_to_index[word]
+        secret_vector = model.vectors[index] / model.norms[index]
+        self.similarities = model.vectors.dot(secret_vector) / model.norms
+
+        # ranks[i] is the position of word i when sorted by similarity. The
+        # secret goes first even if a tie or rounding sorted another word
+        # ahead of it, and the words it passes move down one
+        order = np.argsort(-self.similarities, kind='stable')
+        order = np.concatenate([[index], order[order != index]])
+        self.ranks = np.empty(len(order), dtype=np.int32)
+        self.ranks[order] = np.arange(len(order), dtype=np.int32)
+
+        # Similarity of the closest word that isn't the secret itself
+        self.closest_similarity = float(self.similarities[order[1]]) if len(order) > 1 else 0.0
+
+    @property
+    def nbytes(self):
+        return self.similarities.nbytes + self.ranks.nbytes
+
+    def similarity(self, word):
+        """Raw cosine similarity of word to the secret word"""
+        return self.similarities[self.key_to_index[word]]
+
+    def rank(self, word):
+        """Rank of word among the whole vocabulary (the closest other word is #1)"""
+        return int(self.ranks[self.key_to_index[word]])
+
+def get_rank_table(model, word):
+    """Get the rank table for a secret word, computing it at most once per model"""
+    key = (id(model), word)
+    table = _tables.get(key)
+    if table is None:
+        table = _tables[key] = RankTable(model, word)
+    return table
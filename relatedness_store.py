@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""Persistent ConceptNet relatedness shared by every worker process
+
+In-process caches die with the worker, so each process (and each cold
+start) paid for the same pairs over the network again. This keeps raw
+relatedness values in a SQLite database in WAL mode, so many readers and
+one writer at a time work across processes, keyed by the canonical
+unordered pair.
+
+Failed or timed-out lookups are stored as negative entries (value NULL)
+with a short TTL: callers fall back immediately instead of waiting on the
+API again, and the pair is retried once the entry expires. Writes are
+buffered and committed in batches.
+
+Environment variables:
+    RELATEDNESS_DB         database path (defaults to /tmp on Vercel, where only /tmp is writable)
+    RELATEDNESS_TTL        lifetime of real values in seconds
+    RELATEDNESS_RETRY_TTL  lifetime of failed lookups in seconds
+"""
+import atexit
+import os
+import sqlite3
+import threading
+import time
+from conceptnet_client import conceptnet_term
+
+RELATEDNESS_DB = os.environ.get(
+    'RELATEDNESS_DB',
+    '/tmp/relatedness.sqlite3' if os.environ.get('VERCEL') else 'models/relatedness.sqlite3'
+)
+RELATEDNESS_TTL = float(os.environ.get('RELATEDNESS_TTL', 30 * 24 * 60 * 60))
+RELATEDNESS_RETRY_TTL = float(os.environ.get('RELATEDNESS_RETRY_TTL', 10 * 60))
+
+def canonical_pair(word1, word2):
+    """Order-independent key for a pair of words"""
+    return tuple(sorted((conceptnet_term(word1), conceptnet_term(word2))))
+
+class RelatednessStore:
+    """SQLite-backed relatedness values with TTLs, negative entries and batched writes"""
+
+    def __init__(self, path=RELATEDNESS_DB, ttl=RELATEDNESS_TTL, retry_ttl=RELATEDNESS_RETRY_TTL,
+                 flush_size=64, flush_interval=1.0):
+        self.path = path
+        self.ttl = ttl
+        self.retry_ttl = retry_ttl
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+
+        self._local = threading.local()
+        self._pending = {}  # canonical pair -> (value, stored_at)
+        self._last_flush = time.time()
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        connection = self._connection()
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS relatedness (
+                word1 TEXT NOT NULL,
+                word2 TEXT NOT NULL,
+                value REAL,
+                stored_at REAL NOT NULL,
+                PRIMARY KEY (word1, word2)
+            ) WITHOUT ROWID
+        """)
+        connection.commit()
+        atexit.register(self.flush)
+
+    def _connection(self):
+        """One connection per thread (sqlite3 connections can't be shared)"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _fresh(self, value, stored_at, now):
+        return now - stored_at <= (self.ttl if value is not None else self.retry_ttl)
+
+    def get_many(self, pairs):
+        """Stored relatedness for the given (word1, word2) pairs
+
+        Returns {pair: value} for fresh entries only, where value is None for
+        a recent failure; unknown and expired pairs are left out.
+        """
+        now = time.time()
+        keys = {pair: canonical_pair(*pair) for pair in pairs}
+        found = {}
+
+        with self._lock:
+            for key in set(keys.values()):
+                if key in self._pending:
+                    found[key] = self._pending[key]
+
+        remaining = [key for key in set(keys.values()) if key not in found]
+        connection = self._connection()
+        # Stay well below SQLite's limit on bound parameters
+        for start in range(0, len(remaining), 400):
+            chunk = remaining[start:start + 400]
+            clause = " OR ".join(["(word1 = ? AND word2 = ?)"] * len(chunk))
+            rows = connection.execute(
+                f"SELECT word1, word2, value, stored_at FROM relatedness WHERE {clause}",
+                [word for key in chunk for word in key]
+            )
+            for word1, word2, value, stored_at in rows:
+                found[(word1, word2)] = (value, stored_at)
+
+        return {pair: found[key][0] for pair, key in keys.items()
+                if key in found and self._fresh(*found[key], now)}
+
+    def get(self, word1, word2):
+        """(found, value) for one pair; value is None for a recent failure"""
+        result = self.get_many([(word1, word2)])
+        if (word1, word2) in result:
+            return True, result[(word1, word2)]
+        return False, None
+
+    def put(self, word1, word2, value):
+        """Record relatedness for a pair, or None if the lookup failed"""
+        with self._lock:
+            self._pending[canonical_pair(word1, word2)] = (value, time.time())
+            due = (len(self._pending) >= self.flush_size
+                   or time.time() - self._last_flush >= self.flush_interval)
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Write buffered entries in one transaction"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.time()
+        if not pending:
+            return
+
+        connection = self._connection()
+        try:
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO relatedness (word1, word2, value, stored_at) VALUES (?, ?, ?, ?)",
+                    [(key[0], key[1], value, stored_at) for key, (value, stored_at) in pending.items()]
+                )
+        except sqlite3.Error as e:
+            print(f"Error writing relatedness store: {e}")
+
+def fetch_relatedness(store, client, pairs):
+    """Relatedness for pairs, fetching only unknown or expired ones from the API
+
+    Values are in [-1, 1], or None where the lookup failed (now or recently).
+    """
+    results = store.get_many(pairs)
+    missing = [pair for pair in dict.fromkeys(pairs) if pair not in results]
+    if missing:
+        fetched = client.fetch_relatedness(missing)
+        for pair in missing:
+            # Pairs dropped at the deadline are recorded as failures too
+            results[pair] = fetched.get(pair)
+            store.put(pair[0], pair[1], results[pair])
+        store.flush()
+    return results
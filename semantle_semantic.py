@@ -1,19 +1,19 @@
 #!/usr/bin/env python3
 import sys
 try:
-    from sentence_transformers import SentenceTransformer
+    import sentence_transformers
     import numpy as np
 except ImportError:
     print("Installing required packages...")
     import subprocess
     subprocess.check_call([sys.executable, "-m", "pip", "install", "sentence-transformers"])
-    from sentence_transformers import SentenceTransformer
     import numpy as np
+from sentence_encoder import load_sentence_model
 
 class SemanticSemantleGame:
     def __init__(self):
         print("Loading language model (this may take a moment on first run)...")
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
+        self.model = load_sentence_model()  # SBERT_MODE=int8 for the quantised model
         self.secret_word = None
         self.secret_embedding = None
         self.guesses = []
@@ -22,8 +22,7 @@ class SemanticSemantleGame:
     def calculate_similarity(self, word1, word2):
         """Calculate semantic similarity between two words (0-100)"""
         # Get embeddings
-        embedding1 = self.model.encode([word1])[0]
-        embedding2 = self.model.encode([word2])[0]
+        embedding1, embedding2 = self.model.encode([word1, word2])
         
         # Calculate cosine similarity
         cosine_sim = np.dot(embedding1, embedding2) / (np.linalg.norm(embedding1) * np.linalg.norm(embedding2))
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Dynamic micro-batching for Sentence-BERT encoding
+
+Each request thread used to run its own model.encode([word]), a full
+transformer forward pass at batch size 1. BatchEncoder instead queues
+words from every thread; a single worker collects whatever arrives within
+a few milliseconds (up to a maximum batch size), encodes it in one forward
+pass and hands each caller its row through a Future.
+
+The model can run in int8 mode: its Linear layers are dynamically
+quantised for CPU, which should roughly double encode throughput for a
+small loss of precision. Neither has been measured for this project yet:
+run python quantization_report.py before enabling int8 in production.
+
+Environment variables:
+    SBERT_MODEL          sentence-transformers model name
+    SBERT_MODE           'float32' (default) or 'int8'
+    TORCH_THREADS        intra-op threads per process (default: CPUs / WEB_CONCURRENCY workers)
+    ENCODE_MAX_BATCH     most words encoded in one forward pass
+    ENCODE_MAX_WAIT_MS   how long to wait for more words before encoding
+"""
+from concurrent.futures import Future
+from contextlib import nullcontext
+import os
+import queue
+import sys
+import threading
+import time
+import numpy as np
+
+SBERT_MODEL = os.environ.get('SBERT_MODEL', 'all-MiniLM-L6-v2')
+SBERT_MODE = os.environ.get('SBERT_MODE', 'float32')
+ENCODE_MAX_BATCH = int(os.environ.get('ENCODE_MAX_BATCH', 64))
+ENCODE_MAX_WAIT_MS = float(os.environ.get('ENCODE_MAX_WAIT_MS', 5))
+
+# Split the cores between worker processes instead of every worker using all of them
+TORCH_THREADS = int(os.environ.get('TORCH_THREADS', 0)) or max(
+    1, (os.cpu_count() or 1) // int(os.environ.get('WEB_CONCURRENCY', 1)))
+
+SBERT_MODES = ('float32', 'int8')
+
+def load_sentence_model(name=SBERT_MODEL, mode=SBERT_MODE, threads=TORCH_THREADS):
+    """Load the Sentence-BERT model used by the games, in float32 or int8 mode"""
+    if mode not in SBERT_MODES:
+        raise ValueError(f"Unknown SBERT_MODE {mode!r}, expected one of {SBERT_MODES}")
+
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    torch.set_num_threads(threads)
+    if mode == 'int8':
+        # Quantised kernels are CPU-only
+        model = SentenceTransformer(name, device='cpu')
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    else:
+        model = SentenceTransformer(name)
+    model.eval()
+    return model
+
+def inference_mode():
+    """torch.inference_mode() when torch is in use, skipping autograd bookkeeping"""
+    torch = sys.modules.get('torch')
+    return torch.inference_mode() if torch is not None else nullcontext()
+
+class BatchEncoder:
+    """Encode words from many threads in shared batches"""
+
+    def __init__(self, model, max_batch_size=ENCODE_MAX_BATCH, max_wait=ENCODE_MAX_WAIT_MS / 1000):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.batches = 0
+        self.encoded = 0
+
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name='batch-encoder', daemon=True)
+        self._worker.start()
+
+    def submit(self, text):
+        """Queue text for encoding and return a Future of its embedding"""
+        future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def encode(self, text):
+        """Embedding of one word or phrase"""
+        return self.submit(text).result()
+
+    def encode_many(self, texts):
+        """Embeddings of several words as rows of an array"""
+        futures = [self.submit(text) for text in texts]
+        return np.array([future.result() for future in futures])
+
+    def _collect(self):
+        """Block for one request, then gather more until the batch is full or the wait is over"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            # Popular words often arrive several times in one batch
+            texts = list(dict.fromkeys(text for text, _ in batch))
+            try:
+                with inference_mode():
+                    embeddings = dict(zip(texts, self.model.encode(texts)))
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.encoded += len(texts)
+            for text, future in batch:
+                future.set_result(embeddings[text])
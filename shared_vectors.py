@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""Host word vectors in shared memory for pre-forked workers
+
+The gunicorn master (see gunicorn.conf.py) loads each model once and
+copies it into multiprocessing.shared_memory segments; workers attach to
+them by name and wrap the buffers zero-copy, so N workers cost one copy
+of the vectors instead of N.
+
+key_to_index would otherwise be a multi-million entry dict rebuilt in
+every worker, so it is shared too, in a compact form: all words as one
+UTF-8 blob with row offsets, plus an open-addressing hash table (crc32,
+linear probing) of row numbers. SharedKeyIndex and SharedWordList put a
+dict / list face on those arrays for gensim.
+"""
+import json
+import sys
+import zlib
+from collections.abc import Sequence
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+
+def shared_name(name):
+    """Canonical model name for a gensim name, .bin path or compact artifact prefix"""
+    name = name.replace('\\', '/').rsplit('/', 1)[-1]
+    for suffix in ('.bin', '.compact'):
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    return name
+
+def segment_name(name, part):
+    """Short segment name (macOS limits POSIX shared memory names to 31 characters)"""
+    return f"sv{zlib.crc32(name.encode('utf-8')):08x}_{part}"
+
+def word_hash(word_bytes):
+    return zlib.crc32(word_bytes)
+
+def build_key_index(words):
+    """Word blob, row offsets and hash table for a list of unique words"""
+    encoded = [word.encode('utf-8') for word in words]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(word) for word in encoded])
+    blob = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+
+    # At most half full keeps probe chains short
+    size = 1 << max(4, (2 * len(encoded)).bit_length())
+    mask = size - 1
+    table = [-1] * size
+    for i, word in enumerate(encoded):
+        slot = word_hash(word) & mask
+        while table[slot] != -1:
+            slot = (slot + 1) & mask
+        table[slot] = i
+    return offsets, blob, np.array(table, dtype=np.int32)
+
+class SharedKeyIndex:
+    """Read-only word -> row mapping over shared arrays, standing in for key_to_index"""
+
+    def __init__(self, offsets, blob, table):
+        self.offsets = offsets
+        self.blob = blob
+        self.table = table
+        self.mask = len(table) - 1
+
+    def _word_bytes(self, i):
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes()
+
+    def word(self, i):
+        return self._word_bytes(i).decode('utf-8')
+
+    def get(self, word, default=None):
+        if not isinstance(word, str):
+            return default
+        encoded = word.encode('utf-8')
+        slot = word_hash(encoded) & self.mask
+        while True:
+            i = int(self.table[slot])
+            if i == -1:
+                return default
+            if self._word_bytes(i) == encoded:
+                return i
+            slot = (slot + 1) & self.mask
+
+    def __getitem__(self, word):
+        i = self.get(word)
+        if i is None:
+            raise KeyError(word)
+        return i
+
+    def __contains__(self, word):
+        return self.get(word) is not None
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __iter__(self):
+        return (self.word(i) for i in range(len(self)))
+
+    def keys(self):
+        return iter(self)
+
+    def items(self):
+        return ((self.word(i), i) for i in range(len(self)))
+
+class SharedWordList(Sequence):
+    """Read-only row -> word list over a SharedKeyIndex, standing in for index_to_key"""
+
+    def __init__(self, key_index):
+        self.key_index = key_index
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.key_index.word(j) for j in range(*i.indices(len(self)))]
+        i = int(i)
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self.key_index.word(i)
+
+    def __len__(self):
+        return len(self.key_index)
+
+def _create(name, size):
+    """Create a segment, replacing one left behind by a master that crashed"""
+    try:
+        return shared_memory.SharedMemory(name=name, create=True, size=max(1, size))
+    except FileExistsError:
+        stale = shared_memory.SharedMemory(name=name)
+        stale.close()
+        stale.unlink()
+        return shared_memory.SharedMemory(name=name, create=True, size=max(1, size))
+
+def _open(name):
+    """Attach to an existing segment without letting this process's exit unlink it"""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+
+    # Forked workers share the master's resource tracker, where registering
+    # again is harmless; a tracker started just for this process would
+    # unlink the segment when the process exits
+    own_tracker = getattr(resource_tracker._resource_tracker, '_fd', None) is None
+    segment = shared_memory.SharedMemory(name=name)
+    if own_tracker:
+        resource_tracker.unregister(segment._name, 'shared_memory')
+    return segment
+
+def publish(name, model):
+    """Copy a loaded KeyedVectors model into shared memory
+
+    Returns the segments, which the publisher must keep open and unlink()
+    when it shuts down.
+    """
+    name = shared_name(name)
+    if model.norms is None:
+        model.fill_norms()
+
+    offsets, blob, table = build_key_index(model.index_to_key)
+    arrays = {
+        'vectors': np.asarray(model.vectors),
+        'norms': np.asarray(model.norms),
+        'offsets': offsets,
+        'blob': blob,
+        'table': table
+    }
+
+    segments = []
+    layout = {}
+    for part, array in arrays.items():
+        segment = _create(segment_name(name, part), array.nbytes)
+        np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)[...] = array
+        segments.append(segment)
+        layout[part] = [list(array.shape), array.dtype.str]
+
+    # Written last: workers treat the model as published once this exists
+    meta = json.dumps(layout).encode('utf-8')
+    segment = _create(segment_name(name, 'meta'), len(meta))
+    segment.buf[:len(meta)] = meta
+    segments.append(segment)
+
+    size_mb = sum(array.nbytes for array in arrays.values()) / 1024 / 1024
+    print(f"Published {name} to shared memory ({len(model.index_to_key)} words, {size_mb:.0f}MB)")
+    return segments
+
+def attach(name):
+    """KeyedVectors over a model published in shared memory, or None if it isn't"""
+    from gensim.models import KeyedVectors
+
+    name = shared_name(name)
+    try:
+        meta_segment = _open(segment_name(name, 'meta'))
+    except FileNotFoundError:
+        return None
+
+    # Segments may be rounded up to a whole page
+    layout = json.loads(bytes(meta_segment.buf).rstrip(b'\0').decode('utf-8'))
+    segments = [meta_segment]
+    arrays = {}
+    for part, (shape, dtype) in layout.items():
+        segment = _open(segment_name(name, part))
+        array = np.ndarray(tuple(shape), dtype=np.dtype(dtype), buffer=segment.buf)
+        array.flags.writeable = False
+        segments.append(segment)
+        arrays[part] = array
+
+    key_index = SharedKeyIndex(arrays['offsets'], arrays['blob'], arrays['table'])
+    model = KeyedVectors(arrays['vectors'].shape[1], dtype=arrays['vectors'].dtype)
+    model.key_to_index = key_index
+    model.index_to_key = SharedWordList(key_index)
+    model.vectors = arrays['vectors']
+    model.norms = arrays['norms']
+    # Keep the mappings alive as long as the model
+    model.shared_segments = segments
+    return model
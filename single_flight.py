@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""Collapse concurrent identical computations into one
+
+When several requests miss the cache for the same key at once (two
+players guessing the daily word together), only the first runs the slow
+path; the rest wait on its result instead of repeating the HTTP call or
+encode. Keys are spread over striped locks so unrelated keys never
+contend, and the lock is only held to register or look up the call.
+"""
+from concurrent.futures import Future
+import threading
+
+class SingleFlight:
+    """Run fn once per key among concurrent callers"""
+
+    def __init__(self, stripes=64):
+        self._stripes = [(threading.Lock(), {}) for _ in range(stripes)]
+        self.deduplicated = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        """Return fn(*args, **kwargs), sharing the call with anyone already computing key"""
+        lock, calls = self._stripes[hash(key) % len(self._stripes)]
+        with lock:
+            future = calls.get(key)
+            leader = future is None
+            if leader:
+                future = calls[key] = Future()
+            else:
+                self.deduplicated += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            # Later callers start a fresh computation (normally hitting the cache)
+            with lock:
+                del calls[key]
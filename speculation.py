@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Run optional background work on spare CPU only
+
+dynamic_semantle precomputes each game under the models the player isn't
+using, so switching models is a cache hit instead of a full recompute.
+That work is a guess at the future and must never slow down a real
+request, so it only starts while no foreground request is running, and
+it stops taking new tasks once it has used SPECULATION_CPU_SHARE of one
+core over the last SPECULATION_WINDOW seconds.
+
+Tasks are keyed (by game and model): a newer submission for a key
+replaces one still queued, so a burst of guesses costs one run per key,
+not one per guess. Every request counts as foreground, long polls and
+similarity streams included, so under steady traffic speculation can wait
+a long time: the queue holds at most SPECULATION_MAX_QUEUED keys (the
+oldest is dropped for a new one), and a task still waiting
+SPECULATION_TTL seconds after its latest submission is dropped rather
+than run for a game that has likely moved on.
+
+The budget is measured with time.thread_time(), the CPU time of the
+speculating thread only. Work a task hands to other threads isn't
+counted: BLAS may multiply matrices on its own threads, and ConceptNet API
+lookups run on the client's pool threads, so speculation can use more CPU
+than SPECULATION_CPU_SHARE (set OPENBLAS_NUM_THREADS/OMP_NUM_THREADS=1 to
+keep BLAS on the calling thread).
+
+Environment variables:
+    SPECULATION_THREADS     background threads (0 disables speculation)
+    SPECULATION_CPU_SHARE   fraction of one core speculation may use
+    SPECULATION_WINDOW      seconds the CPU share is measured over
+    SPECULATION_MAX_QUEUED  most keys waiting to run
+    SPECULATION_TTL         seconds a queued task stays worth running
+"""
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+import time
+
+SPECULATION_THREADS = int(os.environ.get('SPECULATION_THREADS', 1))
+SPECULATION_CPU_SHARE = float(os.environ.get('SPECULATION_CPU_SHARE', 0.25))
+SPECULATION_WINDOW = float(os.environ.get('SPECULATION_WINDOW', 10))
+SPECULATION_MAX_QUEUED = int(os.environ.get('SPECULATION_MAX_QUEUED', 256))
+SPECULATION_TTL = float(os.environ.get('SPECULATION_TTL', 60))
+
+class Speculator:
+    """Background task runner that yields to foreground requests and stays within a CPU budget"""
+
+    def __init__(self, threads=SPECULATION_THREADS, cpu_share=SPECULATION_CPU_SHARE,
+                 window=SPECULATION_WINDOW, max_queued=SPECULATION_MAX_QUEUED, ttl=SPECULATION_TTL):
+        self.threads = threads
+        self.cpu_budget = cpu_share * window
+        self.window = window
+        self.max_queued = max_queued
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='speculate') if threads else None
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._foreground = 0
+        self._queued = {}  # key -> (submitted_at, fn, args, kwargs), latest submission only, oldest key first
+        self._spent = deque()  # (finished_at, cpu seconds)
+        self.completed = 0
+        self.replaced = 0
+        self.failed = 0
+        self.dropped = 0
+        self.expired = 0
+
+    def begin_foreground(self):
+        with self._lock:
+            self._foreground += 1
+
+    def end_foreground(self):
+        with self._lock:
+            self._foreground -= 1
+            if self._foreground == 0:
+                self._idle.notify_all()
+
+    def submit(self, key, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) in the background, replacing any queued task for key"""
+        if self._executor is None:
+            return
+        with self._lock:
+            if key in self._queued:
+                self._queued[key] = (time.monotonic(), fn, args, kwargs)
+                self.replaced += 1
+                return
+            if len(self._queued) >= self.max_queued:
+                # The oldest key's pending run takes the new one instead
+                del self._queued[next(iter(self._queued))]
+                self.dropped += 1
+                self._queued[key] = (time.monotonic(), fn, args, kwargs)
+                return
+            self._queued[key] = (time.monotonic(), fn, args, kwargs)
+        # One pending run per queued key
+        self._executor.submit(self._run)
+
+    def cpu_spent(self):
+        """CPU seconds speculation has used within the window"""
+        with self._lock:
+            return self._cpu_spent()
+
+    def _cpu_spent(self):
+        cutoff = time.monotonic() - self.window
+        while self._spent and self._spent[0][0] < cutoff:
+            self._spent.popleft()
+        return sum(seconds for _, seconds in self._spent)
+
+    def _run(self):
+        with self._lock:
+            # Foreground requests go first
+            self._idle.wait_for(lambda: self._foreground == 0)
+
+            # Over budget: wait for older work to leave the window
+            while self._spent and self._cpu_spent() >= self.cpu_budget:
+                self._idle.wait(timeout=self._spent[0][0] + self.window - time.monotonic())
+                self._idle.wait_for(lambda: self._foreground == 0)
+
+            # Take the oldest key's latest submission; newer ones queue a fresh run
+            while True:
+                if not self._queued:
+                    return
+                key = next(iter(self._queued))
+                submitted_at, fn, args, kwargs = self._queued.pop(key)
+                if time.monotonic() - submitted_at <= self.ttl:
+                    break
+                self.expired += 1
+
+        # Thread CPU time, so foreground work on other threads isn't counted
+        # (nor BLAS or pool threads this task uses, see the module docstring)
+        start = time.thread_time()
+        failed = False
+        try:
+            fn(*args, **kwargs)
+        except Exception as e:
+            failed = True
+            print(f"Speculative task {key} failed: {e}")
+        finally:
+            with self._lock:
+                self._spent.append((time.monotonic(), time.thread_time() - start))
+                if failed:
+                    self.failed += 1
+                else:
+                    self.completed += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'queued': len(self._queued),
+                'completed': self.completed,
+                'replaced': self.replaced,
+                'failed': self.failed,
+                'dropped': self.dropped,
+                'expired': self.expired,
+                'cpu_seconds_in_window': round(self._cpu_spent(), 3),
+                'cpu_budget_seconds': self.cpu_budget
+            }
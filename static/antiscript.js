@@ -73,10 +73,16 @@ async function makeGuess() {
             document.getElementById('feedback-message').textContent = result.feedback;
             document.getElementById('guess-word').textContent = result.guess;
             
-            // Update elimination progress
-            eliminationProgress = result.elimination_score;
+            // Update elimination progress: vocabulary coverage when the server has a vocabulary
+            const hasCoverage = result.coverage !== null && result.coverage !== undefined;
+            eliminationProgress = hasCoverage ? result.coverage : result.elimination_score;
             document.getElementById('elimination-fill').style.width = eliminationProgress + '%';
-            document.getElementById('elimination-percent').textContent = eliminationProgress + '%';
+            document.getElementById('elimination-percent').textContent = hasCoverage
+                ? `${eliminationProgress}% (${result.covered_words.toLocaleString()} words)`
+                : eliminationProgress + '%';
+            document.getElementById('elimination-label').textContent = hasCoverage
+                ? 'Vocabulary Eliminated'
+                : 'Elimination Progress';
             
             // Show eliminated concepts if any
             if (result.eliminated_concepts && result.eliminated_concepts.length > 0) {
@@ -341,6 +347,8 @@ function resetGame() {
     guessHistory = [];
     bestDistance = 0;
     eliminationProgress = 0;
+    document.getElementById('elimination-fill').style.width = '0%';
+    document.getElementById('elimination-percent').textContent = '0%';
     document.getElementById('current-result').classList.add('hidden');
     document.getElementById('eliminated-spaces').classList.add('hidden');
     updateDisplay();
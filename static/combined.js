@@ -2,11 +2,19 @@ let guessHistory = [];
 let semantleSimulation = null;
 let antisemantleSimulation = null;
 
+// Each side takes one word or several, comma-separated
+function targetWords(inputId) {
+    return document.getElementById(inputId).value
+        .split(',')
+        .map(word => word.trim())
+        .filter(word => word);
+}
+
 async function setWords() {
-    const semantleWord = document.getElementById('semantle-word').value.trim();
-    const antisemantleWord = document.getElementById('antisemantle-word').value.trim();
+    const semantleWords = targetWords('semantle-word');
+    const antisemantleWords = targetWords('antisemantle-word');
     
-    if (!semantleWord || !antisemantleWord) {
+    if (!semantleWords.length || !antisemantleWords.length) {
         alert('Please enter both words!');
         return;
     }
@@ -18,8 +26,8 @@ async function setWords() {
                 'Content-Type': 'application/json',
             },
             body: JSON.stringify({ 
-                semantle_word: semantleWord,
-                antisemantle_word: antisemantleWord
+                semantle_words: semantleWords,
+                antisemantle_words: antisemantleWords
             })
         });
         
@@ -90,7 +98,7 @@ async function makeGuess() {
                 
                 if (result.semantle_won && result.antisemantle_won) {
                     title = '🎉 Double Victory! 🎉';
-                    message = `Found both words in ${result.guess_count} guesses!`;
+                    message = `Found every word in ${result.guess_count} guesses!`;
                 } else if (result.semantle_won) {
                     title = '🎯 Semantle Victory!';
                     message = `Found "${result.semantle_word}" in ${result.guess_count} guesses!`;
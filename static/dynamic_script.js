@@ -1,6 +1,10 @@
 let simulation = null;
 let svg = null;
 let g = null;
+let graphNodes = [];        // Every node of the game, as sent by the server
+let graphConnections = [];  // Current best-match connections
+let graphId = null;         // Which game graphNodes belongs to
+let graphVersion = 0;       // How many of the server's nodes we have
 const MIN_NODE_SIZE = 8;
 const MAX_NODE_SIZE = 30;
 
@@ -27,6 +31,11 @@ async function setWord() {
             document.getElementById('game-phase').classList.remove('hidden');
             document.getElementById('guess-input').focus();
             
+            graphNodes = [];
+            graphConnections = [];
+            graphId = null;
+            graphVersion = 0;
+            
             initGraph();
             updateGraph([{word: 'SECRET', isSecret: true, score: 100}], []);
         } else {
@@ -52,7 +61,8 @@ async function makeGuess() {
             headers: {
                 'Content-Type': 'application/json',
             },
-            body: JSON.stringify({ guess: guess })
+            // The graph we have, so the server only sends what changed
+            body: JSON.stringify({ guess: guess, graph: graphId, version: graphVersion })
         });
         
         const result = await response.json();
@@ -60,14 +70,33 @@ async function makeGuess() {
         if (response.ok) {
             // Update displays
             document.getElementById('current-score').textContent = result.score;
-            document.getElementById('feedback').textContent = result.feedback;
+            let feedback = result.feedback;
+            if (result.rank !== undefined && !result.found) {
+                feedback += ` (#${result.rank} of ${result.vocab_size.toLocaleString()})`;
+            }
+            document.getElementById('feedback').textContent = feedback;
             document.getElementById('guess-count').textContent = result.guess_count;
             
+            // Apply a patch to the graph we have, or take the full snapshot
+            if (result.delta) {
+                // Every node has one best-match connection, so a patched one replaces its source's old one
+                const sources = new Set(result.connections.map(c => c.source));
+                graphNodes = graphNodes.concat(result.nodes);
+                graphConnections = graphConnections
+                    .filter(c => !sources.has(c.source))
+                    .concat(result.connections);
+            } else {
+                graphNodes = result.nodes;
+                graphConnections = result.connections;
+            }
+            graphId = result.graph || null;
+            graphVersion = result.version || 0;
+            
             // Update history
-            updateHistory(result.nodes.filter(n => !n.isSecret));
+            updateHistory(graphNodes.filter(n => !n.isSecret));
             
             // Update graph with animation
-            updateGraph(result.nodes, result.connections);
+            updateGraph(graphNodes, graphConnections);
             
             // Clear input
             guessInput.value = '';
@@ -115,7 +144,17 @@ function getNodeSize(score) {
     return MIN_NODE_SIZE + (score / 100) * (MAX_NODE_SIZE - MIN_NODE_SIZE);
 }
 
+// Word at one end of a link (the link force replaces words with node objects)
+function endpointWord(end) {
+    return typeof end === 'object' ? end.word : end;
+}
+
 function initGraph() {
+    if (simulation) {
+        simulation.stop();
+        simulation = null;
+    }
+    
     svg = d3.select('#word-graph');
     const width = svg.node().getBoundingClientRect().width;
     const height = svg.node().getBoundingClientRect().height;
@@ -140,33 +179,36 @@ function updateGraph(nodes, connections) {
     const width = svg.node().getBoundingClientRect().width;
     const height = svg.node().getBoundingClientRect().height;
     
-    // Update nodes data - ensure SECRET word displays properly
-    const nodeData = nodes.map(n => ({
-        ...n,
+    // Update nodes data - ensure SECRET word displays properly. Nodes already
+    // in the simulation keep their objects, and so their positions
+    const previous = new Map(simulation ? simulation.nodes().map(d => [d.word, d]) : []);
+    const nodeData = nodes.map(n => Object.assign(previous.get(n.word) || {}, n, {
         id: n.word,
         displayWord: n.isSecret ? 'SECRET' : n.word
     }));
-    
-    // Update force simulation
-    if (simulation) {
-        simulation.stop();
+    // Fresh link objects, since the link force swaps their words for node objects
+    const linkData = connections.map(c => ({ ...c }));
+    
+    // Update force simulation, creating it for the first graph
+    if (!simulation) {
+        simulation = d3.forceSimulation()
+            .force('link', d3.forceLink()
+                .id(d => d.word)
+                .distance(60)  // Reduced from 100 - keeps nodes closer
+                .strength(1))
+            .force('charge', d3.forceManyBody().strength(-200))  // Reduced from -400 - less repulsion
+            .force('center', d3.forceCenter(width / 2, height / 2))
+            .force('collision', d3.forceCollide().radius(d => getNodeSize(d.score) + 5))  // Tighter collision
+            .force('x', d3.forceX(width / 2).strength(0.1))  // Pull nodes toward center
+            .force('y', d3.forceY(height / 2).strength(0.1));
     }
-    
-    simulation = d3.forceSimulation(nodeData)
-        .force('link', d3.forceLink(connections)
-            .id(d => d.word)
-            .distance(60)  // Reduced from 100 - keeps nodes closer
-            .strength(1))
-        .force('charge', d3.forceManyBody().strength(-200))  // Reduced from -400 - less repulsion
-        .force('center', d3.forceCenter(width / 2, height / 2))
-        .force('collision', d3.forceCollide().radius(d => getNodeSize(d.score) + 5))  // Tighter collision
-        .force('x', d3.forceX(width / 2).strength(0.1))  // Pull nodes toward center
-        .force('y', d3.forceY(height / 2).strength(0.1));
+    simulation.nodes(nodeData);
+    simulation.force('link').links(linkData);
     
     // Update links
     const link = g.select('.links')
         .selectAll('line')
-        .data(connections, d => `${d.source}-${d.target}`);
+        .data(linkData, d => `${endpointWord(d.source)}-${endpointWord(d.target)}`);
     
     // Remove old links
     link.exit()
@@ -185,7 +227,7 @@ function updateGraph(nodes, connections) {
     const linkUpdate = linkEnter.merge(link);
     
     linkUpdate
-        .classed('new', d => d.target === nodeData[nodeData.length - 1].word)
+        .classed('new', d => endpointWord(d.target) === nodeData[nodeData.length - 1].word)
         .transition()
         .duration(500)
         .style('stroke-opacity', 0.6)
@@ -253,8 +295,8 @@ function updateGraph(nodes, connections) {
             .attr('transform', d => `translate(${d.x},${d.y})`);
     });
     
-    // Restart simulation with some energy
-    simulation.alpha(1).restart();
+    // Restart simulation with some energy (less once the graph has settled)
+    simulation.alpha(previous.size ? 0.5 : 1).restart();
     
     // Highlight new connections briefly
     setTimeout(() => {
@@ -295,6 +337,10 @@ function resetGame() {
     
     // Clear history
     document.getElementById('history-list').innerHTML = '';
+    graphNodes = [];
+    graphConnections = [];
+    graphId = null;
+    graphVersion = 0;
 }
 
 // Allow Enter key for inputs
@@ -1,5 +1,7 @@
 // Game state
 let graphData = { nodes: [], links: [] };
+let graphId = null;      // Which game and model graphData shows
+let graphVersion = 0;    // How many of the server's nodes graphData has
 let simulation = null;
 let svg = null;
 let g = null;
@@ -40,8 +42,10 @@ function initializeGraph() {
 
     svg.call(zoom);
 
-    // Create main group
+    // Create main group, with links drawn beneath nodes
     g = svg.append('g');
+    g.append('g').attr('class', 'links');
+    g.append('g').attr('class', 'nodes');
 
     // Create arrow markers for directed edges
     svg.append('defs').selectAll('marker')
@@ -66,20 +70,48 @@ function initializeGraph() {
         .force('collision', d3.forceCollide().radius(d => getNodeRadius(d.score) + 10));
 }
 
-// Update the graph with new data
+// Id of a link end (the link force replaces ids with the node objects)
+function endpointId(end) {
+    return typeof end === 'object' ? end.id : end;
+}
+
+// Replace the graph with a full snapshot
 function updateGraph(data) {
     if (!data || !data.nodes) return;
-    
+
+    // Nodes already on screen stay where they are
+    const existing = new Map(graphData.nodes.map(n => [n.id, n]));
+    data.nodes.forEach(n => {
+        const old = existing.get(n.id);
+        if (old) {
+            Object.assign(n, { x: old.x, y: old.y, vx: old.vx, vy: old.vy });
+        }
+    });
+
     graphData = data;
+    renderGraph(0.6);
+}
+
+// Apply a patch from /guess: the new nodes and the links that changed since our version
+function patchGraph(patch) {
+    graphData.nodes.push(...patch.nodes);
+
+    // Every node has one best-match link, so a patched link replaces its source's old one
+    const sources = new Set(patch.links.map(l => l.source));
+    graphData.links = graphData.links
+        .filter(l => !sources.has(endpointId(l.source)))
+        .concat(patch.links);
 
-    // Clear existing elements
-    g.selectAll('.link').remove();
-    g.selectAll('.node-group').remove();
+    renderGraph(0.3);
+}
 
+// Draw graphData, keeping the elements and positions of nodes already shown
+function renderGraph(alpha) {
     // Create links
-    const link = g.selectAll('.link')
-        .data(graphData.links)
-        .enter().append('line')
+    const link = g.select('.links')
+        .selectAll('.link')
+        .data(graphData.links, d => `${endpointId(d.source)}->${endpointId(d.target)}`)
+        .join('line')
         .attr('class', 'link')
         .attr('stroke', d => getColor(d.value))
         .attr('stroke-width', d => 1 + (d.value / 100) * 9)
@@ -87,64 +119,72 @@ function updateGraph(data) {
         .attr('marker-end', 'url(#arrow)');
 
     // Create node groups
-    const nodeGroup = g.selectAll('.node-group')
-        .data(graphData.nodes)
-        .enter().append('g')
-        .attr('class', 'node-group');
-
-    // Add circles
-    const node = nodeGroup.append('circle')
-        .attr('class', 'node')
+    const nodeGroup = g.select('.nodes')
+        .selectAll('.node-group')
+        .data(graphData.nodes, d => d.id)
+        .join(enter => {
+            const group = enter.append('g')
+                .attr('class', 'node-group');
+
+            group.append('circle')
+                .attr('class', 'node');
+
+            group.append('text')
+                .attr('class', 'node-label')
+                .attr('text-anchor', 'middle')
+                .attr('dy', '.35em')
+                .attr('fill', 'white');
+
+            // Add drag behavior
+            group.call(d3.drag()
+                .on('start', dragStarted)
+                .on('drag', dragged)
+                .on('end', dragEnded));
+
+            // Add hover effects
+            group
+                .on('mouseenter', function(event, d) {
+                    // Highlight node
+                    d3.select(this).select('circle')
+                        .attr('stroke-width', 3);
+
+                    // Show tooltip
+                    const tooltip = document.getElementById('tooltip');
+                    tooltip.style.opacity = 1;
+                    tooltip.style.left = `${event.pageX + 10}px`;
+                    tooltip.style.top = `${event.pageY - 10}px`;
+                    tooltip.innerHTML = `
+                        <strong>${d.label}</strong><br>
+                        Similarity: ${d.score.toFixed(1)}%
+                    `;
+                })
+                .on('mouseleave', function(event, d) {
+                    // Reset highlight
+                    d3.select(this).select('circle')
+                        .attr('stroke-width', d.isNew ? 3 : 1.5);
+
+                    // Hide tooltip
+                    document.getElementById('tooltip').style.opacity = 0;
+                });
+
+            return group;
+        });
+
+    // Style circles and labels (select() passes each group's data down)
+    const node = nodeGroup.select('circle')
         .attr('r', d => getNodeRadius(d.score, d.isTarget))
         .attr('fill', d => d.isTarget ? '#a855f7' : getColor(d.score))
         .attr('stroke', d => d.isTarget ? '#a855f7' : getColor(d.score))
         .attr('stroke-width', d => d.isNew ? 3 : 1.5)
         .attr('stroke-opacity', d => d.isNew ? 1 : 0.8);
 
-    // Add labels
-    const label = nodeGroup.append('text')
-        .attr('class', 'node-label')
-        .attr('text-anchor', 'middle')
-        .attr('dy', '.35em')
-        .attr('fill', 'white')
+    nodeGroup.select('text')
         .text(d => d.label);
 
-    // Add drag behavior
-    nodeGroup.call(d3.drag()
-        .on('start', dragStarted)
-        .on('drag', dragged)
-        .on('end', dragEnded));
-
-    // Add hover effects
-    nodeGroup
-        .on('mouseenter', function(event, d) {
-            // Highlight node
-            d3.select(this).select('circle')
-                .attr('stroke-width', 3);
-
-            // Show tooltip
-            const tooltip = document.getElementById('tooltip');
-            tooltip.style.opacity = 1;
-            tooltip.style.left = `${event.pageX + 10}px`;
-            tooltip.style.top = `${event.pageY - 10}px`;
-            tooltip.innerHTML = `
-                <strong>${d.label}</strong><br>
-                Similarity: ${d.score.toFixed(1)}%
-            `;
-        })
-        .on('mouseleave', function(event, d) {
-            // Reset highlight
-            d3.select(this).select('circle')
-                .attr('stroke-width', d.isNew ? 3 : 1.5);
-
-            // Hide tooltip
-            document.getElementById('tooltip').style.opacity = 0;
-        });
-
     // Update simulation
     simulation.nodes(graphData.nodes);
     simulation.force('link').links(graphData.links);
-    simulation.alpha(0.6).restart();
+    simulation.alpha(alpha).restart();
 
     // Update positions on tick
     simulation.on('tick', () => {
@@ -210,6 +250,8 @@ async function setWord() {
             
             // Reset guess history
             guessHistory = [];
+            graphId = null;
+            graphVersion = 0;
             document.getElementById('guess-history').innerHTML = '';
             
             // Initialize graph with just the secret node
@@ -241,7 +283,8 @@ async function makeGuess() {
         const response = await fetch('/guess', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ word: guess, model: currentModel })
+            // The graph we have, so the server only sends what changed
+            body: JSON.stringify({ word: guess, model: currentModel, graph: graphId, version: graphVersion })
         });
 
         const data = await response.json();
@@ -265,8 +308,14 @@ async function makeGuess() {
                 });
             }
             
-            // Update graph
-            updateGraph(data.graph_data);
+            // Update graph: a patch if the server had our version, otherwise a full snapshot
+            if (data.delta) {
+                patchGraph(data.graph_data);
+            } else {
+                updateGraph(data.graph_data);
+            }
+            graphId = data.graph || null;
+            graphVersion = data.version || 0;
             
             // Show success message if correct
             if (data.correct) {
@@ -369,8 +418,10 @@ async function switchModel() {
         const data = await response.json();
         
         if (response.ok) {
-            // Update graph
+            // Update graph (always a full snapshot: every edge can change between models)
             updateGraph(data.graph_data);
+            graphId = data.graph || null;
+            graphVersion = data.version || 0;
             
             // Update history scores
             if (data.guess_scores) {
@@ -388,6 +439,9 @@ async function switchModel() {
                 // Rebuild display
                 rebuildHistoryDisplay();
             }
+        } else {
+            // e.g. the chosen model is still warming up on the server
+            alert(data.error || 'Failed to switch models');
         }
     } catch (error) {
         alert('Error switching models: ' + error.message);
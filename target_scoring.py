@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Score a guess against every secret word of a game at once
+
+combined_game can have many secret words in play. Their unit-length
+Sentence-BERT embeddings are stacked into one matrix when the words are
+set, so a guess costs one embedding lookup (or encode, see
+embedding_store.py) and one matrix-vector product however many targets
+there are.
+
+The matrices depend only on the target words, so they live in a bounded
+in-process cache keyed by those words. The session keeps just the words:
+a matrix evicted from the cache, or a game continued on another worker,
+is rebuilt with one batched lookup.
+
+Environment variables:
+    TARGET_CACHE_MB   memory for the target matrices in each process
+"""
+import os
+import numpy as np
+from bounded_cache import BoundedCache
+
+TARGET_CACHE_MB = int(os.environ.get('TARGET_CACHE_MB', 16))
+
+def similarity_scores(similarities, targets, guess):
+    """Cosine similarities as the games' 0-100 scores; an exact match always scores 100"""
+    scores = np.rint(np.clip(similarities, 0, 1) * 100).astype(int).tolist()
+    return [100 if target.lower() == guess.lower() else score for target, score in zip(targets, scores)]
+
+class TargetScorer:
+    """Stacked target embeddings over an EmbeddingStore"""
+
+    def __init__(self, embeddings, max_bytes=TARGET_CACHE_MB * 1024 * 1024):
+        self.embeddings = embeddings
+        self.matrices = BoundedCache(max_bytes)
+
+    def matrix(self, targets):
+        """(len(targets), dimensions) matrix of the targets' unit-length embeddings"""
+        key = tuple(targets)
+        matrix = self.matrices.get(key)
+        if matrix is None:
+            matrix = np.ascontiguousarray(self.embeddings.get_many(targets), dtype=np.float32)
+            self.matrices[key] = matrix
+        return matrix
+
+    def scores(self, targets, guess):
+        """Score of guess against each target, in order"""
+        similarities = self.matrix(targets) @ self.embeddings.get(guess)
+        return similarity_scores(similarities, targets, guess)
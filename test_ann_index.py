@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+import os
+import tempfile
+import numpy as np
+from ann_index import IVFIndex, ann_index_path, load_ann_index
+from fixtures import random_keyed_vectors
+
+def make_model(size=2000, seed=0):
+    """Bigger than the default, so there are enough rows per cluster"""
+    return random_keyed_vectors(size=size, seed=seed)
+
+def test_full_probe_is_exact():
+    """Probing every cluster finds exactly what most_similar does, without the query word"""
+    print("Testing exact recall at nprobe == nlist...")
+    model = make_model()
+    index = IVFIndex.build(model, nlist=16, iterations=5)
+
+    for word in ["word0", "word17", "word1999"]:
+        exact = model.most_similar(word, topn=10)
+        approx = index.most_similar(model, word, topn=10, nprobe=16)
+        assert [w for w, _ in approx] == [w for w, _ in exact]
+        assert np.allclose([s for _, s in approx], [s for _, s in exact], atol=1e-5)
+        assert word not in [w for w, _ in approx]
+
+    # Searching by vector can exclude any row
+    ids, _ = index.search(model, model.vectors[5], topn=3, nprobe=16, exclude=5)
+    assert 5 not in ids
+    ids, _ = index.search(model, model.vectors[5], topn=3, nprobe=16)
+    assert ids[0] == 5
+
+def test_stale_index_is_ignored():
+    """An index built from another model (or a pruned one) isn't loaded"""
+    print("Testing stale index detection...")
+    model = make_model()
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = os.path.join(tmp, "model.bin")
+        IVFIndex.build(model, nlist=8, iterations=2).save(ann_index_path(model_path))
+
+        assert load_ann_index(model_path, model) is not None
+        assert load_ann_index(model_path, make_model(size=1500)) is None
+        assert load_ann_index(model_path, make_model(seed=1)) is None
+        assert load_ann_index(os.path.join(tmp, "missing.bin"), model) is None
+
+        # Indexes saved before fingerprints existed are stale too
+        index = IVFIndex.build(model, nlist=8, iterations=2)
+        np.savez(ann_index_path(model_path), centroids=index.centroids, order=index.order, offsets=index.offsets)
+        assert load_ann_index(model_path, model) is None
+
+if __name__ == "__main__":
+    test_full_probe_is_exact()
+    test_stale_index_is_ignored()
+    print("\n✅ All tests passed!")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+import os
+import tempfile
+import numpy as np
+import antisemantle
+from embedding_store import EmbeddingStore
+from fixtures import FakeEmbeddingStore
+from vocabulary_coverage import CoverageTracker
+
+def play(guesses, secret="word0"):
+    """Play a game against a fake embedding store, returning the store and every /guess response"""
+    store = FakeEmbeddingStore()
+    antisemantle.embeddings = store
+    # No vocabulary, so coverage makes no lookups of its own
+    antisemantle.coverage = CoverageTracker(EmbeddingStore(os.path.join(tempfile.mkdtemp(), "missing")))
+
+    client = antisemantle.app.test_client()
+    client.post('/set_word', json={'word': secret})
+    responses = []
+    for guess in guesses:
+        store.looked_up.clear()
+        responses.append(client.post('/guess', json={'guess': guess}).get_json())
+        assert len(store.looked_up) == 1, f"{len(store.looked_up)} encodes for guess {len(responses)}"
+    return store, client, responses
+
+def recomputed(secret, guesses):
+    """What /guess used to compute by scoring every guess again"""
+    similarities = [antisemantle.calculate_similarity(secret, guess) for guess in guesses]
+    score = round(100 - np.mean(similarities))
+    eliminated = [guess for guess, similarity in zip(guesses, similarities)
+                  if similarity < antisemantle.ELIMINATION_THRESHOLD]
+    return score, eliminated
+
+def test_one_encode_per_guess():
+    """Each guess is encoded once, and the stats match a full recomputation"""
+    print("Testing incremental game stats...")
+    guesses = [f"word{i}" for i in range(1, 41)]
+    _, client, responses = play(guesses)
+
+    for count, response in enumerate(responses, start=1):
+        score, eliminated = recomputed("word0", guesses[:count])
+        assert response['elimination_score'] == score
+        assert response['eliminated_concepts'] == eliminated[-5:]
+        assert [g['word'] for g in response['all_guesses']] == guesses[:count]
+
+    # Both kinds of guess were made, so the comparison means something
+    _, eliminated = recomputed("word0", guesses)
+    assert 0 < len(eliminated) < len(guesses)
+
+    with client.session_transaction() as session:
+        assert session['eliminated'] == [guesses.index(word) for word in eliminated]
+    assert client.get('/hint').get_json()['hint'].endswith(', '.join(eliminated[-3:]))
+
+def test_old_sessions_caught_up():
+    """Sessions that stored eliminated words are rebuilt as indices"""
+    print("Testing sessions from before indices...")
+    guesses = [f"word{i}" for i in range(1, 11)]
+    _, client, _ = play(guesses)
+    _, eliminated = recomputed("word0", guesses)
+
+    with client.session_transaction() as session:
+        session['eliminated'] = list(eliminated)
+    assert client.get('/hint').get_json()['hint'].endswith(', '.join(eliminated[-3:]))
+    with client.session_transaction() as session:
+        assert session['eliminated'] == [guesses.index(word) for word in eliminated]
+
+if __name__ == "__main__":
+    test_one_encode_per_guess()
+    test_old_sessions_caught_up()
+    print("\n✅ All tests passed!")
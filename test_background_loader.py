@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+import threading
+import time
+from background_loader import BackgroundLoader
+
+def test_backends_load_in_parallel():
+    """Slow loaders run side by side and report loading until they finish"""
+    print("Testing parallel background loading...")
+    release = threading.Event()
+
+    def slow_model():
+        release.wait(5)
+        return "vectors"
+
+    loaders = [BackgroundLoader(name, slow_model) for name in ["Word2Vec", "GloVe"]]
+    start = time.time()
+    for loader in loaders:
+        loader.start()
+
+    assert all(loader.loading and loader.get() is None for loader in loaders)
+    assert time.time() - start < 0.5
+
+    release.set()
+    assert [loader.wait(5) for loader in loaders] == ["vectors", "vectors"]
+    assert all(loader.status()['state'] == 'ready' for loader in loaders)
+
+def test_lazy_start_and_failure():
+    """Unstarted loaders begin on first use, and failures are reported rather than raised"""
+    print("Testing lazy start and failures...")
+
+    def broken():
+        raise OSError("models/glove.bin not found")
+
+    loader = BackgroundLoader("GloVe", broken)
+    assert loader.status()['state'] == 'not started'
+    assert loader.wait(5) is None
+    assert not loader.loading
+    assert loader.status()['state'] == 'failed'
+    assert "not found" in loader.status()['error']
+
+if __name__ == "__main__":
+    test_backends_load_in_parallel()
+    test_lazy_start_and_failure()
+    print("\n✅ All tests passed!")
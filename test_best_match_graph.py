@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+import numpy as np
+from best_match_graph import extend_best_matches, best_match_connections, graph_patch
+
+WORDS = ["secret", "cat", "dog", "kitten", "car", "puppy", "truck", "lion"]
+
+def make_similarity_rows(seed):
+    """Random but fixed integer similarities, like one model would give"""
+    rng = np.random.default_rng(seed)
+    scores = rng.integers(0, 100, size=(len(WORDS), len(WORDS)))
+    index = {word: i for i, word in enumerate(WORDS)}
+
+    def similarity_rows(word, others):
+        row = [scores[index[word], index[other]] for other in others]
+        column = [scores[index[other], index[word]] for other in others]
+        return row, column
+    return similarity_rows
+
+def apply_patch(connections, patch_connections):
+    """What the clients do: a patched connection replaces its source's old one"""
+    sources = {c['source'] for c in patch_connections}
+    return [c for c in connections if c['source'] not in sources] + patch_connections
+
+def test_patches_rebuild_the_graph():
+    """Applying each guess's patch to the client graph gives the full graph"""
+    print("Testing graph patches...")
+    for seed in range(20):
+        similarity_rows = make_similarity_rows(seed)
+        nodes = [{'word': "secret", 'isSecret': True, 'score': 100}]
+        best_matches = []
+        extend_best_matches(best_matches, nodes, similarity_rows)
+        client_nodes, client_connections = list(nodes), []
+
+        for word in WORDS[1:]:
+            nodes.append({'word': word, 'isSecret': False, 'score': 50})
+            extend_best_matches(best_matches, nodes, similarity_rows)
+            connections = best_match_connections(nodes, best_matches)
+
+            new_nodes, changed = graph_patch(nodes, connections, len(client_nodes))
+            client_nodes += new_nodes
+            client_connections = apply_patch(client_connections, changed)
+
+            assert client_nodes == nodes
+            assert sorted(client_connections, key=lambda c: c['source']) == \
+                sorted(connections, key=lambda c: c['source'])
+
+def test_stale_or_unknown_versions():
+    """Clients that are behind get every change; unusable versions get a snapshot"""
+    print("Testing stale client versions...")
+    nodes = [{'word': word} for word in WORDS[:4]]
+    connections = [
+        {'source': "cat", 'target': "kitten", 'similarity': 80},
+        {'source': "dog", 'target': "cat", 'similarity': 76},
+        {'source': "kitten", 'target': "cat", 'similarity': 80}
+    ]
+
+    # Two guesses behind: both new nodes, and every connection touching them
+    new_nodes, changed = graph_patch(nodes, connections, 2)
+    assert [node['word'] for node in new_nodes] == ["dog", "kitten"]
+    assert changed == connections
+
+    assert graph_patch(nodes, connections, 4) == ([], [])
+    for version in (None, 0, 5, -1, "2", 2.0, True):
+        assert graph_patch(nodes, connections, version) is None
+
+    # Other node keys, as in dynamic_semantle's graph_data
+    id_nodes = [{'id': node['word']} for node in nodes]
+    assert graph_patch(id_nodes, connections, 3, key='id') == (id_nodes[3:], [connections[0], connections[2]])
+
+if __name__ == "__main__":
+    test_patches_rebuild_the_graph()
+    test_stale_or_unknown_versions()
+    print("\n✅ All tests passed!")
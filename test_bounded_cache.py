@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+import threading
+import time
+import numpy as np
+from bounded_cache import BoundedCache
+
+def test_lru_eviction():
+    """Least recently used entries are evicted once the memory budget is full"""
+    print("Testing LRU eviction...")
+    cache = BoundedCache(max_bytes=3 * (4000 + 200))
+    for word in ["ocean", "sea", "wave"]:
+        cache[word] = np.zeros(1000, dtype=np.float32)
+
+    # Touch 'ocean' so 'sea' becomes the least recently used
+    assert cache.get("ocean") is not None
+    cache["beach"] = np.zeros(1000, dtype=np.float32)
+
+    assert "sea" not in cache
+    assert "ocean" in cache and "wave" in cache and "beach" in cache
+    print(f"   {cache.stats()}")
+
+def test_ttl_expiry():
+    """Entries older than the TTL are treated as misses"""
+    print("Testing TTL expiry...")
+    cache = BoundedCache(max_bytes=1024 * 1024, ttl=0.05)
+    cache[("sentence-bert", "cat", "dog")] = 62.5
+    assert cache.get(("sentence-bert", "cat", "dog")) == 62.5
+    time.sleep(0.1)
+    assert cache.get(("sentence-bert", "cat", "dog")) is None
+
+def test_threaded_access():
+    """Concurrent readers and writers never push the cache over budget"""
+    print("Testing threaded access...")
+    cache = BoundedCache(max_bytes=64 * 1024)
+
+    def worker(n):
+        for i in range(2000):
+            cache[(n, i % 300)] = float(i)
+            cache.get((n, (i * 7) % 300))
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert cache.stats()['bytes'] <= 64 * 1024
+    print(f"   {cache.stats()}")
+
+if __name__ == "__main__":
+    test_lru_eviction()
+    test_ttl_expiry()
+    test_threaded_access()
+    print("\n✅ All tests passed!")
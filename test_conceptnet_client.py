@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from conceptnet_client import ConceptNetClient
+
+DELAY = 0.2
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers /relatedness slowly; 'slow' terms take far longer, 'broken' ones fail"""
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        terms = {query['node1'][0], query['node2'][0]}
+        if '/c/en/broken' in terms:
+            self.send_response(500)
+            self.end_headers()
+            return
+
+        time.sleep(10 if '/c/en/slow' in terms else DELAY)
+        body = json.dumps({'value': 0.5 if terms == {'/c/en/cat', '/c/en/dog'} else 0.1}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def start_stub_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def test_concurrent_fetch():
+    """Many pairs take about one round trip, not one per pair"""
+    print("Testing concurrent ConceptNet fetching...")
+    server = start_stub_server()
+    try:
+        client = ConceptNetClient(f"http://127.0.0.1:{server.server_port}", pool_size=16)
+        words = ["cat", "dog", "mouse", "bird", "fish", "horse"]
+        pairs = [(a, b) for i, a in enumerate(words) for b in words[i + 1:]]
+
+        start = time.time()
+        results = client.fetch_relatedness(pairs)
+        elapsed = time.time() - start
+
+        assert set(results) == set(pairs)
+        assert results[("cat", "dog")] == 0.5
+        assert elapsed < DELAY * len(pairs) / 3
+        print(f"   {len(pairs)} pairs in {elapsed:.2f}s (serial would take {DELAY * len(pairs):.1f}s)")
+    finally:
+        server.shutdown()
+
+def test_deadline_and_failures():
+    """Slow pairs are dropped at the deadline and failed ones come back as None"""
+    print("Testing deadline and failures...")
+    server = start_stub_server()
+    try:
+        client = ConceptNetClient(f"http://127.0.0.1:{server.server_port}", timeout=5, deadline=1)
+        start = time.time()
+        results = client.fetch_relatedness([("cat", "dog"), ("cat", "slow"), ("cat", "broken")])
+        elapsed = time.time() - start
+
+        assert elapsed < 2
+        assert results[("cat", "dog")] == 0.5
+        assert results.get(("cat", "slow")) is None
+        assert results[("cat", "broken")] is None
+        print(f"   returned after {elapsed:.2f}s")
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    test_concurrent_fetch()
+    test_deadline_and_failures()
+    print("\n✅ All tests passed!")
@@ -8,11 +8,13 @@ BASE_URL = "http://localhost:5000"
 def test_game_flow():
     """Test the basic game flow"""
     print("Testing Dynamic Semantle Game...")
+    # The game lives in the session cookie, so every request must send it back
+    http = requests.Session()
     
     # Test 1: Set secret word
     print("\n1. Setting secret word 'ocean'...")
-    response = requests.post(f"{BASE_URL}/set_word", 
-                           json={"word": "ocean", "model": "sentence-bert"})
+    response = http.post(f"{BASE_URL}/set_word", 
+                       json={"word": "ocean", "model": "sentence-bert"})
     print(f"Response: {response.json()}")
     assert response.status_code == 200
     assert response.json()["success"] == True
@@ -22,30 +24,52 @@ def test_game_flow():
     
     for word in test_words:
         print(f"\n2. Guessing '{word}'...")
-        response = requests.post(f"{BASE_URL}/guess", 
-                               json={"word": word, "model": "sentence-bert"})
+        response = http.post(f"{BASE_URL}/guess", 
+                           json={"word": word, "model": "sentence-bert"})
         data = response.json()
         print(f"   Score: {data.get('score', 'N/A')}%")
         print(f"   Nodes in graph: {len(data.get('graph_data', {}).get('nodes', []))}")
         print(f"   Links in graph: {len(data.get('graph_data', {}).get('links', []))}")
         time.sleep(0.5)  # Small delay between guesses
     
+    # Test 2b: Score a guess under every model at once
+    print("\n2b. Guessing 'coral' under all models...")
+    response = http.post(f"{BASE_URL}/guess",
+                       json={"word": "coral", "model": "sentence-bert", "all_models": True})
+    data = response.json()
+    print(f"   Model scores: {data.get('model_scores')}")
+    assert "sentence-bert" in data["model_scores"]
+    if data["pending"]:
+        response = http.get(f"{BASE_URL}/model_scores", params={"word": "coral", "wait": 5})
+        print(f"   After polling: {response.json()['model_scores']}")
+        assert response.status_code == 200
+
     # Test 3: Test model switching
     print("\n3. Testing model switching to ConceptNet...")
-    response = requests.post(f"{BASE_URL}/calculate_similarities", 
-                           json={"model": "conceptnet"})
+    response = http.post(f"{BASE_URL}/calculate_similarities", 
+                       json={"model": "conceptnet"})
     data = response.json()
     print(f"   Recalculated with {len(data.get('guess_scores', []))} scores")
-    
+
+    # Test 3b: Streamed model switching
+    print("\n3b. Streaming model switch back to Sentence-BERT...")
+    response = http.get(f"{BASE_URL}/calculate_similarities_stream",
+                        params={"model": "sentence-bert"}, stream=True)
+    assert response.headers["Content-Type"].startswith("text/event-stream")
+    events = [line[len("event: "):] for line in response.iter_lines(decode_unicode=True)
+              if line.startswith("event: ")]
+    print(f"   Events: {events}")
+    assert events[0] == "scores" and events[-1] == "done"
+
     # Test 4: Get a hint
     print("\n4. Getting a hint...")
-    response = requests.get(f"{BASE_URL}/hint")
+    response = http.get(f"{BASE_URL}/hint")
     print(f"   Hint: {response.json().get('hint', 'N/A')}")
     
     # Test 5: Make the correct guess
     print("\n5. Making correct guess 'ocean'...")
-    response = requests.post(f"{BASE_URL}/guess", 
-                           json={"word": "ocean", "model": "conceptnet"})
+    response = http.post(f"{BASE_URL}/guess", 
+                       json={"word": "ocean", "model": "conceptnet"})
     data = response.json()
     print(f"   Correct: {data.get('correct', False)}")
     print(f"   Total guesses: {data.get('guess_count', 'N/A')}")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+import os
+import tempfile
+import numpy as np
+from build_sbert_vocab import build_vocab_embeddings
+from embedding_store import EmbeddingStore
+
+class FakeModel:
+    """Stands in for SentenceTransformer with deterministic 8-dimensional embeddings"""
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, words, normalize_embeddings=False, **kwargs):
+        self.encoded.extend(words)
+        vectors = np.array([[ord(c) for c in (word * 8)[:8]] for word in words], dtype=np.float32)
+        if normalize_embeddings:
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors
+
+def test_vocabulary_words_skip_the_model():
+    """Known words come from the matrix without ever loading the transformer"""
+    print("Testing precomputed vocabulary...")
+    with tempfile.TemporaryDirectory() as tmp:
+        prefix = os.path.join(tmp, "sbert.compact")
+        build_vocab_embeddings(FakeModel(), ["ocean", "sea", "wave"], prefix)
+
+        def load_model():
+            raise AssertionError("model loaded for a vocabulary word")
+
+        store = EmbeddingStore(prefix, load_model=load_model)
+        embeddings = store.get_many(["sea", "ocean", "sea"])
+        assert embeddings.shape == (3, 8)
+        assert np.allclose(np.linalg.norm(embeddings, axis=1), 1)
+        assert np.allclose(embeddings[0], embeddings[2])
+
+def test_unknown_words_are_encoded_once_and_persisted():
+    """Out-of-vocabulary words load the model lazily and survive a restart"""
+    print("Testing lazy encoding of unknown words...")
+    with tempfile.TemporaryDirectory() as tmp:
+        prefix = os.path.join(tmp, "sbert.compact")
+        build_vocab_embeddings(FakeModel(), ["ocean", "sea"], prefix)
+
+        model = FakeModel()
+        store = EmbeddingStore(prefix, load_model=lambda: model)
+        assert store._encoder is None
+        seaweed = store.get("seaweed")
+        store.get("seaweed")
+        assert model.encoded == ["seaweed"]
+        assert abs(np.linalg.norm(seaweed) - 1) < 1e-6
+
+        restarted = EmbeddingStore(prefix, load_model=lambda: FakeModel())
+        assert "seaweed" in restarted
+        assert np.allclose(restarted.get("seaweed"), seaweed)
+        assert restarted._encoder is None
+        print(f"   seaweed ↔ sea : {restarted.similarity('seaweed', 'sea'):.3f}")
+
+def test_only_word_like_strings_are_persisted():
+    """Typos and junk are answered but not saved, and the file is capped"""
+    print("Testing the runtime cache limits...")
+    with tempfile.TemporaryDirectory() as tmp:
+        prefix = os.path.join(tmp, "sbert.compact")
+        build_vocab_embeddings(FakeModel(), ["ocean"], prefix)
+
+        store = EmbeddingStore(prefix, load_model=FakeModel, max_words=3)
+        junk = ["Seaweed", "sea weed", "x" * 500, "tab\there"]
+        store.get_many(junk + ["kelp", "coral", "reef", "lagoon"])
+        with open(store.extra_path, encoding='utf-8') as f:
+            assert [line.split('\t')[0] for line in f] == ["kelp", "coral", "reef"]
+
+        # A smaller cap on restart keeps the newest records and compacts the file
+        restarted = EmbeddingStore(prefix, load_model=FakeModel, max_words=2)
+        assert "coral" in restarted and "reef" in restarted and "kelp" not in restarted
+        with open(store.extra_path, encoding='utf-8') as f:
+            assert len(f.readlines()) == 2
+
+        # The in-memory cache is bounded too
+        small = EmbeddingStore(prefix, load_model=FakeModel, max_bytes=1000)
+        small.get_many([f"word{i}" for i in range(50)])
+        assert len(small.extra) < 50
+
+def test_encoder_modes_keep_separate_files():
+    """int8 encodings are never loaded by a float32 store"""
+    print("Testing per-mode runtime files...")
+    with tempfile.TemporaryDirectory() as tmp:
+        prefix = os.path.join(tmp, "sbert.compact")
+        build_vocab_embeddings(FakeModel(), ["ocean"], prefix)
+
+        EmbeddingStore(prefix, load_model=FakeModel, mode='int8').get("seaweed")
+        assert "seaweed" in EmbeddingStore(prefix, load_model=FakeModel, mode='int8')
+        assert "seaweed" not in EmbeddingStore(prefix, load_model=FakeModel, mode='float32')
+
+if __name__ == "__main__":
+    test_vocabulary_words_skip_the_model()
+    test_unknown_words_are_encoded_once_and_persisted()
+    test_only_word_like_strings_are_persisted()
+    test_encoder_modes_keep_separate_files()
+    print("\n✅ All tests passed!")
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+import os
+import tempfile
+import threading
+import time
+from game_store import Game, GameStore
+
+INDEX_TO_KEY = ["cat", "dog", "kitten", "puppy", "car"]
+KEY_TO_INDEX = {word: i for i, word in enumerate(INDEX_TO_KEY)}
+
+def play(game):
+    """A few guesses, as the apps make them"""
+    game.add_node("kitten", 76, KEY_TO_INDEX, rank=3)
+    game.add_node("car", 12, KEY_TO_INDEX)
+    game.add_node("Kitty", 70, KEY_TO_INDEX)  # Not in the vocabulary
+    game.guess_count = 3
+    game.set_best_matches([None, [0, 76], [-1, -1], [1, 81]])
+    return game
+
+def test_nodes_and_matches():
+    """The compact game gives back the node dicts and edges the apps used to keep in the session"""
+    print("Testing compact game state...")
+    game = play(Game("cat", KEY_TO_INDEX))
+
+    assert game.secret_word(INDEX_TO_KEY) == "cat"
+    assert game.nodes(INDEX_TO_KEY) == [
+        {'word': "cat", 'isSecret': True, 'score': 100},
+        {'word': "kitten", 'isSecret': False, 'score': 76, 'rank': 3},
+        {'word': "car", 'isSecret': False, 'score': 12},
+        {'word': "Kitty", 'isSecret': False, 'score': 70}
+    ]
+    assert game.best_matches() == [None, [0, 76], [-1, -1], [1, 81]]
+    assert game.extra_words == ["Kitty"]
+
+def test_round_trip_between_workers():
+    """A game saved by one store (worker) loads in another, and after memory eviction"""
+    print("Testing game store persistence...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "games.sqlite3")
+        first = GameStore("test", path, max_bytes=1)
+        game_id = first.new_game_id()
+        first.put(game_id, play(Game("cat", KEY_TO_INDEX)))
+
+        other_id = first.new_game_id()
+        first.put(other_id, Game("dog", KEY_TO_INDEX))
+        assert first.stats()['games_in_memory'] == 1  # The first game was evicted
+
+        second = GameStore("test", path)
+        loaded = second.get(game_id)
+        assert loaded.nodes(INDEX_TO_KEY) == play(Game("cat", KEY_TO_INDEX)).nodes(INDEX_TO_KEY)
+        assert loaded.best_matches() == [None, [0, 76], [-1, -1], [1, 81]]
+        assert loaded.guess_count == 3
+
+        # A guess handled by the second worker is seen by the first
+        loaded.add_node("puppy", 40, KEY_TO_INDEX)
+        loaded.set_best_matches(loaded.best_matches() + [[-1, -1]])
+        second.put(game_id, loaded)
+        assert first.get(game_id).word(4, INDEX_TO_KEY) == "puppy"
+
+        # Other namespaces (apps or models) don't see the game
+        assert GameStore("other", path).get(game_id) is None
+
+def test_idle_games_expire():
+    """Games nobody plays are deleted"""
+    print("Testing idle expiry...")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = GameStore("test", os.path.join(tmp, "games.sqlite3"), idle_ttl=0.1)
+        game_id = store.new_game_id()
+        store.put(game_id, Game("cat", KEY_TO_INDEX))
+        assert store.get(game_id) is not None
+
+        time.sleep(0.2)
+        store.expire()
+        assert store.get(game_id) is None
+        assert store.stats()['games_in_memory'] == 0
+
+def test_concurrent_workers_keep_every_guess():
+    """Two workers guessing in the same game at once both land"""
+    print("Testing concurrent updates from two workers...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "games.sqlite3")
+        workers = [GameStore("test", path), GameStore("test", path)]
+        game_id = workers[0].new_game_id()
+        workers[0].put(game_id, Game("cat", KEY_TO_INDEX))
+
+        def guess(game):
+            game.add_node("dog", 50, KEY_TO_INDEX)
+            game.guess_count += 1
+            time.sleep(0.001)  # Let the other worker read the same version
+            return game.guess_count
+
+        def play_guesses(store):
+            for _ in range(20):
+                store.update(game_id, guess)
+
+        threads = [threading.Thread(target=play_guesses, args=(store,)) for store in workers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for store in workers:
+            game = store.get(game_id)
+            assert game.guess_count == 40
+            assert len(game.words) == 41
+
+        assert workers[1].update("missing", guess) is None
+
+if __name__ == "__main__":
+    test_nodes_and_matches()
+    test_round_trip_between_workers()
+    test_idle_games_expire()
+    test_concurrent_workers_keep_every_guess()
+    print("\n✅ All tests passed!")
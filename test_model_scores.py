@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+
+# Import the app without loading any model or starting speculation
+os.environ['PRELOAD_MODELS'] = ''
+os.environ['SPECULATION_THREADS'] = '0'
+os.environ['FANOUT_MODELS'] = 'sentence-bert,word2vec,glove,conceptnet'
+os.environ.setdefault('RELATEDNESS_DB', os.path.join(tempfile.mkdtemp(), 'relatedness.sqlite3'))
+import dynamic_semantle
+from dynamic_semantle import collect_model_scores, start_model_scores
+
+def resolved(value):
+    future = Future()
+    future.set_result(value)
+    return future
+
+def failed(error):
+    future = Future()
+    future.set_exception(error)
+    return future
+
+def test_collect_reports_each_state():
+    """Finished, failed, unfinished and never-started models are told apart"""
+    print("Testing collected scores...")
+    models = dynamic_semantle.FANOUT_MODELS
+    futures = {models[0]: resolved(42), models[1]: failed(RuntimeError("down")), models[2]: Future()}
+
+    started = time.monotonic()
+    scores = collect_model_scores(futures, time.monotonic() - 1)  # deadline already past
+    assert time.monotonic() - started < 0.1
+    assert scores == {models[0]: 42.0, models[1]: 'failed', models[2]: 'pending', models[3]: 'warming_up'}
+
+def test_collect_waits_until_deadline():
+    """A future deadline waits for late scores, but no longer than the deadline"""
+    print("Testing the collection deadline...")
+    model = dynamic_semantle.FANOUT_MODELS[0]
+    late = Future()
+    threading.Timer(0.1, late.set_result, [7]).start()
+    assert collect_model_scores({model: late}, time.monotonic() + 5)[model] == 7.0
+
+    started = time.monotonic()
+    assert collect_model_scores({model: Future()}, time.monotonic() + 0.2)[model] == 'pending'
+    assert 0.15 <= time.monotonic() - started < 1
+
+class CountingPool:
+    """Stands in for the fan-out pool, counting submissions per model"""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, guess_word, target_word, model):
+        time.sleep(0.001)  # widen the window a racing caller could slip into
+        self.submitted.append(model)
+        return resolved(50)
+
+def test_concurrent_starts_submit_once():
+    """A guess and its polls racing to start scores submit each model once"""
+    print("Testing concurrent starts...")
+    pool = CountingPool()
+    original = dynamic_semantle.fanout_pool, dynamic_semantle.warming_up
+    dynamic_semantle.fanout_pool, dynamic_semantle.warming_up = pool, lambda model: False
+    try:
+        threads = [threading.Thread(target=start_model_scores, args=("game", "sea", "ocean")) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        dynamic_semantle.fanout_pool, dynamic_semantle.warming_up = original
+
+    assert sorted(pool.submitted) == sorted(dynamic_semantle.FANOUT_MODELS)
+    assert set(dynamic_semantle.model_scores.get(("game", "sea"))) == set(dynamic_semantle.FANOUT_MODELS)
+
+if __name__ == "__main__":
+    test_collect_reports_each_state()
+    test_collect_waits_until_deadline()
+    test_concurrent_starts_submit_once()
+    print("\n✅ All tests passed!")
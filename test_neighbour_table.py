@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+import json
+import os
+import tempfile
+import numpy as np
+import neighbour_table
+from fixtures import random_keyed_vectors as make_model
+from neighbour_table import (build_neighbour_table, load_neighbour_table,
+                             neighbour_table_info_path, _top_neighbours)
+
+def inverse_norms(model):
+    model.fill_norms()
+    return (1.0 / np.maximum(model.norms, 1e-12)).astype(np.float32)
+
+def test_top_neighbours_match_most_similar():
+    """Blocked top-n equals most_similar, across column block boundaries"""
+    print("Testing top neighbours against most_similar...")
+    model = make_model()
+    neighbour_table.COLUMN_BLOCK = 64  # several blocks, the last one partial
+    try:
+        indices, closest = _top_neighbours(model.vectors, inverse_norms(model), 100, 140, 5)
+    finally:
+        neighbour_table.COLUMN_BLOCK = 65536
+
+    for row, word in enumerate(model.index_to_key[100:140]):
+        expected = model.most_similar(word, topn=5)
+        assert [model.index_to_key[i] for i in indices[row]] == [w for w, _ in expected]
+        assert np.isclose(closest[row], expected[0][1], atol=1e-5)
+
+def test_limit_scans_every_word():
+    """With --limit the rows are fewer, but neighbours come from the whole vocabulary"""
+    print("Testing limited tables...")
+    model = make_model()
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = os.path.join(tmp, "model.bin")
+        build_neighbour_table(model, model_path, topn=3, limit=50, workers=2)
+        neighbours, closest = load_neighbour_table(model_path, model)
+        assert neighbours.shape == (50, 3) and closest.shape == (50,)
+
+        for row, word in enumerate(model.index_to_key[:50]):
+            expected = model.most_similar(word, topn=3)
+            assert [model.index_to_key[i] for i in neighbours[row]] == [w for w, _ in expected]
+            assert np.isclose(closest[row], expected[0][1], atol=1e-5)
+        assert neighbours.max() >= 50  # rows beyond the limit are still candidates
+
+        with open(neighbour_table_info_path(model_path), encoding='utf-8') as f:
+            info = json.load(f)
+        assert info['rows'] == 50 and info['vocabulary_size'] == 500 and info['topn'] == 3
+
+def test_stale_table_is_ignored():
+    """A table built from another model (or before the info file existed) isn't loaded"""
+    print("Testing stale table detection...")
+    model = make_model()
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = os.path.join(tmp, "model.bin")
+        build_neighbour_table(model, model_path, topn=2, workers=1)
+
+        assert load_neighbour_table(model_path, model)[0] is not None
+        assert load_neighbour_table(model_path, make_model(size=400)) == (None, None)
+        assert load_neighbour_table(model_path, make_model(seed=1)) == (None, None)
+        assert load_neighbour_table(os.path.join(tmp, "missing.bin"), model) == (None, None)
+
+        os.remove(neighbour_table_info_path(model_path))
+        assert load_neighbour_table(model_path, model) == (None, None)
+
+if __name__ == "__main__":
+    test_top_neighbours_match_most_similar()
+    test_limit_scans_every_word()
+    test_stale_table_is_ignored()
+    print("\n✅ All tests passed!")
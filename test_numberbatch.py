@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+import gzip
+import os
+import tempfile
+import numpy as np
+from numberbatch import convert_numberbatch, load_numberbatch
+
+VECTORS = {
+    "/c/en/cat": [1.0, 0.2, 0.0],
+    "/c/en/dog": [0.9, 0.4, 0.1],
+    "/c/en/ice_cream": [0.0, 0.1, 1.0],
+    "/c/fr/chat": [1.0, 0.0, 0.0],
+}
+
+def write_synthetic_file(path):
+    """Write a tiny multilingual Numberbatch file"""
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        f.write(f"{len(VECTORS)} 3\n")
+        for term, vector in VECTORS.items():
+            f.write(term + " " + " ".join(str(v) for v in vector) + "\n")
+
+def cosine(a, b):
+    a, b = np.array(a), np.array(b)
+    return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
+
+def test_relatedness():
+    """English terms are kept, normalised, and compared by cosine similarity"""
+    print("Testing Numberbatch relatedness...")
+    with tempfile.TemporaryDirectory() as tmp:
+        text_path = os.path.join(tmp, "numberbatch.txt.gz")
+        prefix = os.path.join(tmp, "numberbatch-en.compact")
+        write_synthetic_file(text_path)
+        convert_numberbatch(text_path, prefix)
+
+        numberbatch = load_numberbatch(prefix)
+        assert sorted(numberbatch.key_to_index) == ["cat", "dog", "ice_cream"]
+        assert "Ice Cream" in numberbatch
+        assert "chat" not in numberbatch
+
+        expected = cosine(VECTORS["/c/en/cat"], VECTORS["/c/en/dog"])
+        assert abs(numberbatch.relatedness("cat", "dog") - expected) < 1e-6
+        assert abs(numberbatch.relatedness("Ice Cream", "cat") - cosine(VECTORS["/c/en/ice_cream"], VECTORS["/c/en/cat"])) < 1e-6
+        assert numberbatch.relatedness("cat", "unicorn") == 0.0
+        print(f"   cat ↔ dog : {numberbatch.relatedness('cat', 'dog'):.3f}")
+
+def test_relatedness_matrix():
+    """The batched matrix agrees with pairwise relatedness"""
+    print("Testing Numberbatch relatedness matrix...")
+    with tempfile.TemporaryDirectory() as tmp:
+        text_path = os.path.join(tmp, "numberbatch.txt.gz")
+        prefix = os.path.join(tmp, "numberbatch-en.compact")
+        write_synthetic_file(text_path)
+        convert_numberbatch(text_path, prefix)
+
+        numberbatch = load_numberbatch(prefix)
+        words = ["cat", "dog", "unicorn", "ice cream"]
+        matrix = numberbatch.relatedness_matrix(words)
+        for i, word1 in enumerate(words):
+            for j, word2 in enumerate(words):
+                if i != j:
+                    assert abs(matrix[i, j] - numberbatch.relatedness(word1, word2)) < 1e-6
+
+def test_missing_file():
+    """Without a converted file the apps fall back to the HTTP API"""
+    assert load_numberbatch(os.path.join(tempfile.gettempdir(), "does-not-exist")) is None
+
+if __name__ == "__main__":
+    test_relatedness()
+    test_relatedness_matrix()
+    test_missing_file()
+    print("\n✅ All tests passed!")
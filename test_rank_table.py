@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+import numpy as np
+import rank_table
+from fixtures import random_keyed_vectors as make_model
+from rank_table import RankTable, get_rank_table
+
+def test_ranks_match_most_similar():
+    """The closest words by most_similar are ranks 1, 2, 3, ... and the secret is 0"""
+    print("Testing ranks against most_similar...")
+    model = make_model()
+    for secret in ["word0", "word42", "word499"]:
+        table = RankTable(model, secret)
+        assert table.rank(secret) == 0
+        neighbours = model.most_similar(secret, topn=20)
+        for rank, (word, similarity) in enumerate(neighbours, start=1):
+            assert table.rank(word) == rank
+            assert np.isclose(table.similarity(word), similarity, atol=1e-5)
+        assert np.isclose(table.closest_similarity, neighbours[0][1], atol=1e-5)
+        assert sorted(table.ranks) == list(range(len(model)))
+
+def test_secret_ranks_first_when_tied():
+    """A word with the secret's exact direction, sorting ahead of it, doesn't share rank 0"""
+    print("Testing ties with the secret word...")
+    model = make_model()
+    # word3 points the same way as word7 and, with a lower index, sorts first
+    model.vectors[3] = model.vectors[7] * 2
+    model.fill_norms(force=True)
+
+    table = RankTable(model, "word7")
+    assert table.rank("word7") == 0
+    assert table.rank("word3") == 1
+    assert sorted(table.ranks) == list(range(len(model)))
+
+def test_cache_bounded_by_bytes():
+    """Tables are reused, and evicted once they outgrow the byte budget"""
+    print("Testing the table cache...")
+    model = make_model()
+    original = rank_table._tables
+    table_bytes = RankTable(model, "word0").nbytes
+    rank_table._tables = rank_table.BoundedCache(3 * (table_bytes + 200))
+    try:
+        first = get_rank_table(model, "word0")
+        assert get_rank_table(model, "word0") is first
+        for i in range(1, 10):
+            get_rank_table(model, f"word{i}")
+        assert len(rank_table._tables) <= 3
+        assert get_rank_table(model, "word0") is not first
+    finally:
+        rank_table._tables = original
+
+if __name__ == "__main__":
+    test_ranks_match_most_similar()
+    test_secret_ranks_first_when_tied()
+    test_cache_bounded_by_bytes()
+    print("\n✅ All tests passed!")
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+import os
+import tempfile
+import time
+from relatedness_store import RelatednessStore, fetch_relatedness
+
+class CountingClient:
+    """Stands in for ConceptNetClient, counting how many pairs hit the network"""
+
+    def __init__(self, values):
+        self.values = values
+        self.requested = []
+
+    def fetch_relatedness(self, pairs):
+        self.requested.extend(pairs)
+        return {pair: self.values.get(pair) for pair in pairs}
+
+def test_shared_between_stores():
+    """A pair fetched through one store (worker) is a hit for every other"""
+    print("Testing shared relatedness store...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "relatedness.sqlite3")
+        client = CountingClient({("cat", "dog"): 0.5})
+
+        first = RelatednessStore(path)
+        assert fetch_relatedness(first, client, [("cat", "dog")]) == {("cat", "dog"): 0.5}
+
+        second = RelatednessStore(path)
+        assert second.get("dog", "cat") == (True, 0.5)
+        assert fetch_relatedness(second, client, [("dog", "cat")]) == {("dog", "cat"): 0.5}
+        assert client.requested == [("cat", "dog")]
+
+def test_failures_retry_after_expiry():
+    """Failed lookups are remembered briefly, then retried"""
+    print("Testing negative entries...")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = RelatednessStore(os.path.join(tmp, "relatedness.sqlite3"), retry_ttl=0.1)
+        client = CountingClient({})
+
+        assert fetch_relatedness(store, client, [("cat", "unicorn")]) == {("cat", "unicorn"): None}
+        assert fetch_relatedness(store, client, [("cat", "unicorn")]) == {("cat", "unicorn"): None}
+        assert len(client.requested) == 1
+
+        time.sleep(0.2)
+        fetch_relatedness(store, client, [("cat", "unicorn")])
+        assert len(client.requested) == 2
+
+def test_batched_writes():
+    """Writes are buffered until the batch fills, but reads see them straight away"""
+    print("Testing batched writes...")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "relatedness.sqlite3")
+        store = RelatednessStore(path, flush_size=3, flush_interval=60)
+        other = RelatednessStore(path)
+
+        store.put("cat", "dog", 0.5)
+        store.put("cat", "mouse", 0.3)
+        assert store.get("cat", "mouse") == (True, 0.3)
+        assert other.get("cat", "mouse") == (False, None)
+
+        store.put("cat", "bird", 0.2)
+        assert other.get("cat", "mouse") == (True, 0.3)
+        assert len(other.get_many([("cat", "dog"), ("bird", "cat"), ("cat", "fish")])) == 2
+
+if __name__ == "__main__":
+    test_shared_between_stores()
+    test_failures_retry_after_expiry()
+    test_batched_writes()
+    print("\n✅ All tests passed!")
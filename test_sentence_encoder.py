@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+import threading
+import time
+import numpy as np
+from sentence_encoder import BatchEncoder
+
+class FakeModel:
+    """Stands in for SentenceTransformer: a fixed cost per forward pass, recording batch sizes"""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def encode(self, texts):
+        self.batch_sizes.append(len(texts))
+        time.sleep(0.02)
+        return np.array([[len(text), ord(text[0])] for text in texts], dtype=np.float32)
+
+def test_concurrent_requests_are_batched():
+    """Words from many threads share forward passes and each caller gets its own row"""
+    print("Testing micro-batching...")
+    model = FakeModel()
+    encoder = BatchEncoder(model, max_batch_size=16, max_wait=0.01)
+    words = [f"word{i}" for i in range(40)]
+    results = {}
+
+    def worker(word):
+        results[word] = encoder.encode(word)
+
+    threads = [threading.Thread(target=worker, args=(word,)) for word in words]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    for word in words:
+        assert list(results[word]) == [len(word), ord(word[0])]
+    assert max(model.batch_sizes) <= 16
+    assert len(model.batch_sizes) < len(words) / 2
+    print(f"   {len(words)} requests in {len(model.batch_sizes)} forward passes: {model.batch_sizes}")
+
+def test_encode_many_keeps_order():
+    """encode_many returns rows in the order asked, including repeated words"""
+    print("Testing encode_many...")
+    encoder = BatchEncoder(FakeModel(), max_wait=0.001)
+    embeddings = encoder.encode_many(["ocean", "sea", "ocean"])
+    assert embeddings.shape == (3, 2)
+    assert list(embeddings[:, 0]) == [5, 3, 5]
+
+def test_errors_reach_callers():
+    """A failed forward pass fails every request in the batch, and later ones still work"""
+    print("Testing errors...")
+
+    class FlakyModel(FakeModel):
+        def encode(self, texts):
+            if "boom" in texts:
+                raise RuntimeError("out of memory")
+            return super().encode(texts)
+
+    encoder = BatchEncoder(FlakyModel(), max_wait=0.001)
+    try:
+        encoder.encode("boom")
+        assert False, "expected the model error"
+    except RuntimeError:
+        pass
+    assert encoder.encode("fine")[0] == 4
+
+if __name__ == "__main__":
+    test_concurrent_requests_are_batched()
+    test_encode_many_keeps_order()
+    test_errors_reach_callers()
+    print("\n✅ All tests passed!")
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+import multiprocessing
+import numpy as np
+from fixtures import random_keyed_vectors
+from shared_vectors import attach, build_key_index, publish, SharedKeyIndex, SharedWordList
+
+WORDS = ["cat", "dog", "café", "ice_cream", "umami", "king", "queen"]
+
+def make_model():
+    return random_keyed_vectors(WORDS, dimensions=8)
+
+def test_key_index():
+    """The shared key index behaves like key_to_index / index_to_key"""
+    print("Testing compact key index...")
+    key_index = SharedKeyIndex(*build_key_index(WORDS))
+    words = SharedWordList(key_index)
+
+    assert len(key_index) == len(WORDS)
+    assert all(key_index[word] == i for i, word in enumerate(WORDS))
+    assert key_index.get("unicorn", -1) == -1
+    assert "café" in key_index and "cafe" not in key_index
+    assert list(words) == WORDS and words[-1] == "queen" and words[1:3] == ["dog", "café"]
+
+def check_attached(name, results):
+    """Runs in a forked worker"""
+    model = attach(name)
+    results.put((
+        float(model.similarity("cat", "dog")),
+        model.most_similar("king", topn=2),
+        "unicorn" in model,
+        model.vectors.flags.writeable
+    ))
+
+def test_workers_attach():
+    """A forked worker sees the published vectors without loading anything"""
+    print("Testing shared memory across processes...")
+    model = make_model()
+    segments = publish("test-shared-vectors", model)
+    try:
+        context = multiprocessing.get_context("fork")
+        results = context.Queue()
+        worker = context.Process(target=check_attached, args=("test-shared-vectors", results))
+        worker.start()
+        similarity, most_similar, has_unicorn, writeable = results.get(timeout=30)
+        worker.join()
+
+        assert abs(similarity - model.similarity("cat", "dog")) < 1e-6
+        assert [word for word, _ in most_similar] == [word for word, _ in model.most_similar("king", topn=2)]
+        assert not has_unicorn
+        assert not writeable
+
+        # The worker exiting must not have removed the segments
+        assert attach("test-shared-vectors") is not None
+        assert attach("models/test-shared-vectors.compact").vectors.shape == (len(WORDS), 8)
+    finally:
+        for segment in segments:
+            segment.close()
+            segment.unlink()
+
+    assert attach("test-shared-vectors") is None
+
+if __name__ == "__main__":
+    test_key_index()
+    test_workers_attach()
+    print("\n✅ All tests passed!")
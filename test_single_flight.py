@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+import threading
+import time
+from single_flight import SingleFlight
+
+def test_concurrent_callers_share_one_call():
+    """Simultaneous callers for one key run the function once and all get its result"""
+    print("Testing single-flight deduplication...")
+    flight = SingleFlight()
+    calls = []
+    results = []
+
+    def slow_encode(word):
+        calls.append(word)
+        time.sleep(0.2)
+        return word.upper()
+
+    def worker():
+        results.append(flight.do(('encode', 'ocean'), slow_encode, 'ocean'))
+
+    threads = [threading.Thread(target=worker) for _ in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert calls == ['ocean']
+    assert results == ['OCEAN'] * 10
+    print(f"   10 callers, {len(calls)} computation, {flight.deduplicated} deduplicated")
+
+def test_unrelated_keys_run_in_parallel():
+    """Different keys don't wait on each other"""
+    print("Testing unrelated keys...")
+    flight = SingleFlight()
+
+    def slow(word):
+        time.sleep(0.2)
+        return word
+
+    threads = [threading.Thread(target=flight.do, args=(word, slow, word))
+               for word in ['cat', 'dog', 'bird', 'fish']]
+    start = time.time()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert time.time() - start < 0.6
+
+def test_errors_reach_every_waiter():
+    """A failure is raised to all waiters and the key can be retried afterwards"""
+    print("Testing errors...")
+    flight = SingleFlight()
+    errors = []
+
+    def failing():
+        time.sleep(0.1)
+        raise ValueError("ConceptNet unavailable")
+
+    def worker():
+        try:
+            flight.do('pair', failing)
+        except ValueError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(errors) == 3
+    assert flight.do('pair', lambda: 42) == 42
+
+if __name__ == "__main__":
+    test_concurrent_callers_share_one_call()
+    test_unrelated_keys_run_in_parallel()
+    test_errors_reach_every_waiter()
+    print("\n✅ All tests passed!")
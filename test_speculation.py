@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+import threading
+import time
+from speculation import Speculator
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+def burn_cpu(seconds):
+    start = time.thread_time()
+    while time.thread_time() - start < seconds:
+        pass
+
+def test_waits_for_foreground():
+    """Speculation only starts once no foreground request is running"""
+    print("Testing foreground priority...")
+    speculator = Speculator(threads=1, cpu_share=1, window=1)
+    ran = threading.Event()
+
+    speculator.begin_foreground()
+    speculator.submit("game", ran.set)
+    assert not ran.wait(0.2)
+
+    speculator.end_foreground()
+    assert ran.wait(5)
+
+def test_latest_submission_wins():
+    """Queued work for a key is replaced, not repeated"""
+    print("Testing replacement of queued tasks...")
+    speculator = Speculator(threads=1, cpu_share=1, window=1)
+    runs = []
+
+    speculator.begin_foreground()
+    for words in (["cat"], ["cat", "dog"], ["cat", "dog", "kitten"]):
+        speculator.submit(("game", "glove"), runs.append, words)
+    speculator.end_foreground()
+
+    assert wait_until(lambda: speculator.completed == 1)
+    time.sleep(0.1)
+    assert runs == [["cat", "dog", "kitten"]]
+    assert speculator.stats()['replaced'] == 2
+
+def test_cpu_budget():
+    """Once the budget is spent, new tasks wait for it to leave the window"""
+    print("Testing CPU budget...")
+    speculator = Speculator(threads=1, cpu_share=0.1, window=0.5)
+    finished = []
+
+    speculator.submit("first", lambda: (burn_cpu(0.1), finished.append(time.monotonic())))
+    assert wait_until(lambda: len(finished) == 1)
+    assert speculator.cpu_spent() >= 0.1
+
+    speculator.submit("second", lambda: finished.append(time.monotonic()))
+    assert wait_until(lambda: len(finished) == 2)
+    assert finished[1] - finished[0] >= 0.4
+
+def test_queue_is_bounded():
+    """While foreground traffic never stops, the oldest keys make way for new ones"""
+    print("Testing the queue bound...")
+    speculator = Speculator(threads=1, cpu_share=1, window=1, max_queued=3)
+    runs = []
+
+    speculator.begin_foreground()
+    for game in range(10):
+        speculator.submit(game, runs.append, game)
+    assert speculator.stats()['queued'] == 3
+    assert speculator.stats()['dropped'] == 7
+    speculator.end_foreground()
+
+    assert wait_until(lambda: speculator.completed == 3)
+    time.sleep(0.1)
+    assert runs == [7, 8, 9]
+
+def test_stale_tasks_expire():
+    """A task queued longer than the TTL is dropped, not run"""
+    print("Testing queued task expiry...")
+    speculator = Speculator(threads=1, cpu_share=1, window=1, ttl=0.2)
+    runs = []
+
+    speculator.begin_foreground()
+    speculator.submit("old", runs.append, "old")
+    time.sleep(0.3)
+    speculator.submit("new", runs.append, "new")
+    speculator.end_foreground()
+
+    assert wait_until(lambda: speculator.completed == 1)
+    time.sleep(0.1)
+    assert runs == ["new"]
+    assert speculator.stats()['expired'] == 1
+    assert speculator.stats()['queued'] == 0
+
+def test_disabled():
+    """No threads means speculation is off"""
+    print("Testing disabled speculation...")
+    speculator = Speculator(threads=0)
+    speculator.submit("game", lambda: 1 / 0)
+    assert speculator.stats()['queued'] == 0
+
+if __name__ == "__main__":
+    test_waits_for_foreground()
+    test_latest_submission_wins()
+    test_cpu_budget()
+    test_queue_is_bounded()
+    test_stale_tasks_expire()
+    test_disabled()
+    print("\n✅ All tests passed!")
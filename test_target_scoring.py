@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+import numpy as np
+from fixtures import FakeEmbeddingStore as FakeStore
+from target_scoring import TargetScorer
+
+def pairwise_score(store, target, guess):
+    """What calculate_similarity gives for one pair"""
+    if target.lower() == guess.lower():
+        return 100
+    return round(max(0, float(np.dot(store.vector(target), store.vector(guess)))) * 100)
+
+def test_scores_match_pairwise():
+    """One matrix product gives the same scores as scoring each pair"""
+    print("Testing stacked scores...")
+    store = FakeStore()
+    scorer = TargetScorer(store)
+    targets = [f"secret{i}" for i in range(10)]
+
+    for guess in ["cat", "dog", "Secret3", "secret7"]:
+        scores = scorer.scores(targets, guess)
+        assert scores == [pairwise_score(store, target, guess) for target in targets]
+    assert scorer.scores(targets, "secret7")[7] == 100
+
+def test_targets_stacked_once():
+    """The targets are looked up once; each guess is one more lookup"""
+    print("Testing cached target matrix...")
+    store = FakeStore()
+    scorer = TargetScorer(store)
+    targets = ["ocean", "desert", "forest"]
+
+    scorer.matrix(targets)
+    store.looked_up.clear()
+    for guess in ["sea", "sand", "tree"]:
+        scorer.scores(targets, guess)
+    assert store.looked_up == [["sea"], ["sand"], ["tree"]]
+
+    # Evicted matrices are rebuilt from the words in one batch
+    scorer.matrices.clear()
+    store.looked_up.clear()
+    scorer.scores(targets, "sea")
+    assert store.looked_up == [targets, ["sea"]]
+
+if __name__ == "__main__":
+    test_scores_match_pairwise()
+    test_targets_stacked_once()
+    print("\n✅ All tests passed!")
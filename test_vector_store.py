@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+import os
+import tempfile
+import time
+import numpy as np
+from fixtures import random_keyed_vectors
+from vector_store import load_keyed_vectors, load_norms, prefetch_rows
+
+def save_model(tmp, size=500, seed=0):
+    """Save a random model as the apps' models/*.bin files are saved, with separate .npy arrays"""
+    model_path = os.path.join(tmp, "model.bin")
+    random_keyed_vectors(size=size, seed=seed).save(model_path, sep_limit=0)
+    return model_path
+
+def test_memory_mapped_load():
+    """Vectors are memory-mapped read-only, and their norms are saved for the next load"""
+    print("Testing memory-mapped loading...")
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = save_model(tmp)
+        model = load_keyed_vectors(model_path, prefetch=100)
+        assert isinstance(model.vectors, np.memmap)
+        assert not model.vectors.flags.writeable
+        assert os.path.exists(model_path + '.norms.npy')
+
+        expected = random_keyed_vectors()
+        assert np.allclose(model.norms, np.linalg.norm(expected.vectors, axis=1))
+        assert model.most_similar("word3", topn=5) == expected.most_similar("word3", topn=5)
+
+        # The second load maps the saved norms instead of recomputing them
+        again = load_keyed_vectors(model_path)
+        assert isinstance(again.norms, np.memmap)
+
+def test_stale_norms_are_recomputed():
+    """Norms saved for an older or differently sized model aren't reused"""
+    print("Testing stale norms...")
+    with tempfile.TemporaryDirectory() as tmp:
+        norms_path = save_model(tmp) + '.norms.npy'
+        load_keyed_vectors(os.path.join(tmp, "model.bin"))
+
+        # Rebuilt with another size: wrong length
+        model_path = save_model(tmp, size=400)
+        model = load_keyed_vectors(model_path)
+        assert len(model.norms) == 400
+        assert len(np.load(norms_path)) == 400
+
+        # Rebuilt with the same size but newer than the norms
+        old = time.time() - 60
+        os.utime(norms_path, (old, old))
+        model_path = save_model(tmp, size=400, seed=1)
+        model = load_keyed_vectors(model_path)
+        expected = random_keyed_vectors(size=400, seed=1)
+        assert np.allclose(model.norms, np.linalg.norm(expected.vectors, axis=1))
+
+        # Up to date norms are loaded as they are
+        model.norms = None
+        load_norms(model, model_path)
+        assert isinstance(model.norms, np.memmap)
+
+def test_prefetch_rows():
+    """Only memory-mapped arrays can be prefetched"""
+    print("Testing prefetch...")
+    with tempfile.TemporaryDirectory() as tmp:
+        model = load_keyed_vectors(save_model(tmp))
+        assert prefetch_rows(model.vectors, 10)
+        assert prefetch_rows(model.vectors, 10 ** 9)  # clamped to the file
+    assert not prefetch_rows(np.zeros((10, 4), dtype=np.float32), 10)
+
+if __name__ == "__main__":
+    test_memory_mapped_load()
+    test_stale_norms_are_recomputed()
+    test_prefetch_rows()
+    print("\n✅ All tests passed!")
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+import os
+import tempfile
+import numpy as np
+import vocabulary_coverage
+from embedding_store import EmbeddingStore
+from fixtures import FakeEmbeddingStore
+from vocabulary_coverage import CoverageTracker
+
+def FakeStore():
+    """A float16 vocabulary, as build_sbert_vocab.py can write"""
+    return FakeEmbeddingStore(dtype=np.float16)
+
+def expected_covered(store, guesses, threshold):
+    similarities = store.vectors.astype(np.float32) @ store.get_many(guesses).T
+    return int(np.count_nonzero(similarities.max(axis=1) >= threshold))
+
+def test_incremental_matches_full_recompute():
+    """Each guess is multiplied in once, and the count matches a full recompute"""
+    print("Testing incremental coverage...")
+    store = FakeStore()
+    tracker = CoverageTracker(store, threshold=0.5)
+    guesses = []
+    previous = 0
+
+    for word in store.words[:10]:
+        guesses.append(word)
+        store.looked_up.clear()
+        coverage = tracker.update("game", guesses)
+        assert store.looked_up == [[word]]
+
+        covered = expected_covered(store, guesses, 0.5)
+        assert abs(coverage.covered - covered) <= 2  # float16 rounding at the threshold
+        assert coverage.covered >= previous
+        assert coverage.fraction == coverage.covered / len(store.words)
+        previous = coverage.covered
+
+    # Nothing new, nothing multiplied
+    store.looked_up.clear()
+    assert tracker.update("game", guesses).guesses == 10
+    assert store.looked_up == []
+
+def test_rebuilds_evicted_games():
+    """A game missing from the cache is rebuilt from its guesses in one batch"""
+    print("Testing rebuild from guesses...")
+    store = FakeStore()
+    vocabulary_coverage.CHUNK_ROWS = 128  # exercise the chunked product
+    try:
+        tracker = CoverageTracker(store, threshold=0.5)
+        first = tracker.update("game", store.words[:5]).covered
+
+        tracker.games.clear()
+        store.looked_up.clear()
+        rebuilt = tracker.update("game", store.words[:5])
+        assert store.looked_up == [store.words[:5]]
+        assert rebuilt.covered == first
+    finally:
+        vocabulary_coverage.CHUNK_ROWS = 65536
+
+    # Games are independent
+    assert tracker.update("other", store.words[5:6]).guesses == 1
+
+def test_no_vocabulary():
+    """Without build_sbert_vocab.py's matrix there is no coverage to report"""
+    print("Testing missing vocabulary...")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = EmbeddingStore(os.path.join(tmp, "missing"))
+        tracker = CoverageTracker(store)
+        assert not tracker.available
+        assert tracker.update("game", ["ocean"]) is None
+
+if __name__ == "__main__":
+    test_incremental_matches_full_recompute()
+    test_rebuilds_evicted_games()
+    test_no_vocabulary()
+    print("\n✅ All tests passed!")
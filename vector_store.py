@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Load word vectors as read-only memory maps that worker processes can share
+
+KeyedVectors.save() writes large arrays as separate .npy files next to the
+model, so loading with mmap='r' maps them straight from the page cache
+instead of copying ~3.6GB into each worker. Every gunicorn worker (with or
+without --preload) then shares one copy of the vectors in RAM, and a
+restart doesn't re-read the whole file from disk.
+
+Compact serving artifacts written by build_model_artifact.py
+(<prefix>.vectors.npy + <prefix>.vocab.txt) are preferred over the full
+gensim model whenever they exist. float16 artifacts are converted to
+float32 in RAM when loaded: float16 matrix products get no BLAS path and
+are an order of magnitude slower, and the rank tables need the precision.
+
+Under gunicorn.conf.py the master publishes models to shared memory
+before forking, and workers attach to those instead of loading their own.
+
+Environment variables:
+    WORD2VEC_MMAP            mmap mode for the vector arrays ('r', or '' to load into RAM)
+    WORD2VEC_PREFETCH_ROWS   ask the kernel to read ahead the first N (most frequent) rows
+    SHARED_VECTORS           models published in shared memory (set by gunicorn.conf.py)
+"""
+import mmap
+import os
+import zlib
+import numpy as np
+from shared_vectors import attach, shared_name
+
+MODEL_DIR = "models"
+
+WORD2VEC_MMAP = os.environ.get('WORD2VEC_MMAP', 'r') or None
+WORD2VEC_PREFETCH_ROWS = int(os.environ.get('WORD2VEC_PREFETCH_ROWS', 0))
+
+# Rows sampled for model_fingerprint
+FINGERPRINT_ROWS = 64
+
+def model_fingerprint(model):
+    """Cheap checksum of a model's words and vectors at evenly spaced rows
+
+    Files built offline from a model (ANN index, neighbour table) store it,
+    so they can be ignored once the model is rebuilt or replaced.
+    """
+    n = len(model.index_to_key)
+    rows = np.unique(np.linspace(0, n - 1, num=min(n, FINGERPRINT_ROWS)).astype(np.int64))
+    checksum = zlib.crc32('\n'.join(model.index_to_key[i] for i in rows).encode('utf-8'))
+    return zlib.crc32(np.ascontiguousarray(model.vectors[rows], dtype=np.float32).tobytes(), checksum)
+
+def prefetch_rows(vectors, rows):
+    """madvise(WILLNEED) the first rows of a memory-mapped array"""
+    mm = getattr(vectors, '_mmap', None)
+    if mm is None or not hasattr(mmap, 'MADV_WILLNEED'):
+        return False
+
+    # np.memmap maps from the offset rounded down to the allocation granularity
+    header = vectors.offset % mmap.ALLOCATIONGRANULARITY
+    length = min(len(mm), header + rows * vectors.strides[0])
+    mm.madvise(mmap.MADV_WILLNEED, 0, length)
+    return True
+
+def load_norms(model, model_path):
+    """Reuse the vector norms saved next to the model, computing them once if missing or stale"""
+    norms_path = model_path + '.norms.npy'
+    if os.path.exists(norms_path):
+        # A model saved again since (its .bin or its .vectors.npy) makes the norms stale
+        model_files = [path for path in (model_path, model_path + '.vectors.npy') if os.path.exists(path)]
+        newest_model = max((os.path.getmtime(path) for path in model_files), default=0)
+        norms = np.load(norms_path, mmap_mode='r')
+        if len(norms) == len(model.vectors) and os.path.getmtime(norms_path) >= newest_model:
+            model.norms = norms
+            return
+        print(f"Recomputing stale vector norms in {norms_path}")
+
+    # Computing norms touches every row, so do it once and keep the result
+    model.fill_norms()
+    try:
+        tmp_path = f"{norms_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.save(f, model.norms)
+        os.replace(tmp_path, norms_path)
+    except OSError as e:
+        print(f"Could not save vector norms to {norms_path}: {e}")
+
+def artifact_prefix(name):
+    """Path prefix of the compact serving artifact for a model name or path"""
+    name = os.path.basename(name)
+    if name.endswith('.bin'):
+        name = name[:-len('.bin')]
+    return os.path.join(MODEL_DIR, name + '.compact')
+
+def artifact_exists(prefix):
+    """Whether a compact artifact has been built at prefix"""
+    return os.path.exists(prefix + '.vectors.npy') and os.path.exists(prefix + '.vocab.txt')
+
+def resolve_model_path(model_path):
+    """Use the compact artifact for a model if one has been built"""
+    prefix = artifact_prefix(model_path)
+    if artifact_exists(prefix):
+        return prefix
+    return model_path
+
+def load_artifact(prefix, mmap_mode=WORD2VEC_MMAP):
+    """Load a compact artifact of pre-normalised vectors as KeyedVectors"""
+    from gensim.models import KeyedVectors
+
+    vectors = np.load(prefix + '.vectors.npy', mmap_mode=mmap_mode)
+    with open(prefix + '.vocab.txt', encoding='utf-8') as f:
+        words = f.read().splitlines()
+    if len(words) != vectors.shape[0]:
+        raise ValueError(f"{prefix}: {len(words)} words but {vectors.shape[0]} vectors; rebuild the artifact")
+
+    # Smaller on disk only; scoring needs float32 (see above)
+    if vectors.dtype != np.float32:
+        vectors = vectors.astype(np.float32)
+
+    model = KeyedVectors(vectors.shape[1], dtype=vectors.dtype)
+    model.index_to_key = words
+    model.key_to_index = {word: i for i, word in enumerate(words)}
+    model.vectors = vectors
+    # Vectors are already unit length
+    model.norms = np.ones(len(words), dtype=np.float32)
+    return model
+
+def load_shared(name):
+    """Attach to a model the gunicorn master published in shared memory, if it did"""
+    name = shared_name(name)
+    if name not in os.environ.get('SHARED_VECTORS', '').split(','):
+        return None
+
+    model = attach(name)
+    if model is not None:
+        print(f"Attached to shared {name} vectors")
+    return model
+
+def load_keyed_vectors(model_path, mmap_mode=WORD2VEC_MMAP, prefetch=WORD2VEC_PREFETCH_ROWS):
+    """Load a saved KeyedVectors model or compact artifact, memory-mapping its arrays read-only"""
+    from gensim.models import KeyedVectors
+
+    shared = load_shared(model_path)
+    if shared is not None:
+        return shared
+
+    if artifact_exists(model_path):
+        model = load_artifact(model_path, mmap_mode)
+    else:
+        model = KeyedVectors.load(model_path, mmap=mmap_mode)
+        if mmap_mode:
+            load_norms(model, model_path)
+
+    if mmap_mode and prefetch and prefetch_rows(model.vectors, prefetch):
+        print(f"Prefetching the {prefetch} most frequent vectors")
+
+    return model
+
+def load_pretrained(name):
+    """Load a named gensim model: shared memory, compact artifact, local copy, then download"""
+    shared = load_shared(name)
+    if shared is not None:
+        return shared
+
+    prefix = artifact_prefix(name)
+    if artifact_exists(prefix):
+        print(f"Loading compact {name} artifact from {prefix}...")
+        return load_artifact(prefix)
+
+    local_path = os.path.join(MODEL_DIR, name + '.bin')
+    if os.path.exists(local_path):
+        return load_keyed_vectors(local_path)
+
+    import gensim.downloader as api
+    return api.load(name)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""How much of the vocabulary a game's guesses have ruled out
+
+A vocabulary word counts as covered once it is within COVERAGE_THRESHOLD
+cosine similarity of at least one guess. Each game keeps a vocabulary-length
+vector of every word's best similarity to any guess so far, so a guess
+costs one matrix-vector product against the precomputed Sentence-BERT
+vocabulary (see embedding_store.py) and an elementwise maximum, never a
+recompute over the whole history.
+
+The vectors are a few hundred KB per game, too big for the cookie session,
+so they live in a bounded in-process cache keyed by game id. They are
+derived data: a game evicted from the cache, or continued on another
+worker, is rebuilt from its guesses with one matrix product.
+
+Environment variables:
+    COVERAGE_THRESHOLD   cosine similarity at which a word counts as covered
+    COVERAGE_CACHE_MB    memory for the per-game vectors in each process
+"""
+import os
+import numpy as np
+from bounded_cache import BoundedCache
+from embedding_store import normalise
+
+COVERAGE_THRESHOLD = float(os.environ.get('COVERAGE_THRESHOLD', 0.5))
+COVERAGE_CACHE_MB = int(os.environ.get('COVERAGE_CACHE_MB', 64))
+
+# Rows converted to float32 at a time, bounding the temporary memory for
+# float16 vocabularies
+CHUNK_ROWS = 65536
+
+def vocabulary_similarities(vectors, embeddings):
+    """Cosine similarity of every vocabulary row to each embedding, as a (vocabulary, len(embeddings)) array"""
+    embeddings = normalise(np.atleast_2d(embeddings)).T
+    similarities = np.empty((len(vectors), embeddings.shape[1]), dtype=np.float32)
+    for start in range(0, len(vectors), CHUNK_ROWS):
+        chunk = np.asarray(vectors[start:start + CHUNK_ROWS], dtype=np.float32)
+        np.dot(chunk, embeddings, out=similarities[start:start + CHUNK_ROWS])
+    return similarities
+
+class GameCoverage:
+    """One game's best similarity to any guess for every vocabulary word"""
+
+    def __init__(self, vocabulary_size, threshold=COVERAGE_THRESHOLD):
+        self.threshold = threshold
+        self.max_similarity = np.full(vocabulary_size, -1, dtype=np.float16)
+        self.guesses = 0
+        self.covered = 0
+
+    @property
+    def nbytes(self):
+        return self.max_similarity.nbytes
+
+    def add(self, similarities):
+        """Fold in the similarity column(s) of one or more new guesses"""
+        similarities = np.asarray(similarities).reshape(len(self.max_similarity), -1)
+        np.maximum(self.max_similarity, similarities.max(axis=1), out=self.max_similarity, casting='unsafe')
+        self.guesses += similarities.shape[1]
+        self.covered = int(np.count_nonzero(self.max_similarity >= self.threshold))
+
+    @property
+    def fraction(self):
+        return self.covered / len(self.max_similarity) if len(self.max_similarity) else 0.0
+
+class CoverageTracker:
+    """Per-game coverage over an EmbeddingStore's vocabulary matrix"""
+
+    def __init__(self, embeddings, threshold=COVERAGE_THRESHOLD, max_bytes=COVERAGE_CACHE_MB * 1024 * 1024):
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.games = BoundedCache(max_bytes)
+
+    @property
+    def available(self):
+        """Coverage needs the precomputed vocabulary (build_sbert_vocab.py)"""
+        return self.embeddings.vectors is not None
+
+    def update(self, game_id, guesses):
+        """Coverage after guesses (the game's whole history, oldest first), or None without a vocabulary
+
+        Only guesses the cached vector hasn't seen yet are multiplied in.
+        """
+        if not self.available:
+            return None
+
+        coverage = self.games.get(game_id)
+        if coverage is None or coverage.guesses > len(guesses):
+            coverage = GameCoverage(len(self.embeddings.vectors), self.threshold)
+
+        new_guesses = guesses[coverage.guesses:]
+        if new_guesses:
+            embeddings = self.embeddings.get_many(new_guesses)
+            coverage.add(vocabulary_similarities(self.embeddings.vectors, embeddings))
+            self.games[game_id] = coverage
+        return coverage